@@ -3,6 +3,7 @@ from prompter.base import ConfigAuthentication
 from contrib.utilities.helpers import load_config_auth
 from feature_analyzer.analyzer_service import AnalyzerService
 from common.app_config import app_config_instance
+from generativeai.llm_response_cache import LLMCacheMode, llm_response_cache_instance
 
 
 def validate_comma_separated_list(ctx, param, value):
@@ -14,6 +15,31 @@ def validate_comma_separated_list(ctx, param, value):
     return []
 
 
+def validate_methods_per_file(ctx, param, value):
+    """
+    Validates the methods per file, given as `File.java:method1,method2;Other.js:method3`, and
+    returns them as a dictionary of file name to method names.
+    """
+    methods_per_file = {}
+    if not value:
+        return methods_per_file
+
+    for entry in value.split(";"):
+        if not entry.strip():
+            continue
+        file_name, separator, method_names = entry.partition(":")
+        if not separator or not file_name.strip():
+            raise click.BadParameter(
+                f"Expected <file name>:<method>,<method>, got: {entry.strip()}"
+            )
+        methods_per_file[file_name.strip()] = [
+            method_name.strip()
+            for method_name in method_names.split(",")
+            if method_name.strip()
+        ]
+    return methods_per_file
+
+
 @click.command()
 @click.option(
     "--config-auth",
@@ -52,12 +78,50 @@ def validate_comma_separated_list(ctx, param, value):
     help="Comma-separated list of application file names to consider.",
     callback=validate_comma_separated_list,
 )
+@click.option(
+    "--application-files-methods",
+    required=False,
+    type=str,
+    default=None,
+    help="Methods to focus on per application file, as File.java:method1,method2;Other.js:method3. Each file is reduced to these methods and the fields and helper methods they use. Files not listed are analyzed entirely.",
+    callback=validate_methods_per_file,
+)
 @click.option(
     "--output-file-path",
     required=True,
     type=str,
     help="Path to the output file for analysis results.",
 )
+@click.option(
+    "--llm-cache-mode",
+    required=False,
+    type=click.Choice([mode.value for mode in LLMCacheMode]),
+    default=app_config_instance.llm_cache_mode,
+    show_default=True,
+    help="How the persistent LLM response cache is used: read-write, read-only (never stores new responses), refresh (ignores cached responses and stores new ones) or disabled.",
+)
+@click.option(
+    "--llm-cache-path",
+    required=False,
+    type=str,
+    default=app_config_instance.llm_cache_path,
+    show_default=True,
+    help="Path to the SQLite file of the LLM response cache.",
+)
+@click.option(
+    "--llm-cache-import-file",
+    required=False,
+    type=str,
+    default=None,
+    help="Path to a cache export file to load into the LLM response cache before the analysis.",
+)
+@click.option(
+    "--llm-cache-export-file",
+    required=False,
+    type=str,
+    default=None,
+    help="Path to write the LLM response cache entries to after the analysis.",
+)
 def main(
     config_auth: str,
     database_tables_file_path: str,
@@ -65,7 +129,12 @@ def main(
     procedures_dir_path: str,
     application_files_dir_path: str,
     application_files_names_to_consider: list[str],
+    application_files_methods: dict[str, list[str]],
     output_file_path: str,
+    llm_cache_mode: str,
+    llm_cache_path: str,
+    llm_cache_import_file: str,
+    llm_cache_export_file: str,
 ) -> None:
     """
     Main function to analyze database features based on provided configurations and files.
@@ -75,9 +144,16 @@ def main(
         database_tables_file_path: Path to the database tables file.
         procedure_entry_point_file_name: File name for the procedure entry point.
         procedures_dir_path: Directory path containing procedure files.
+        application_files_methods: Methods to focus on, per application file name.
         output_file_path: Path to the output file.
+        llm_cache_mode: Usage mode of the LLM response cache.
+        llm_cache_path: Path to the LLM response cache database.
+        llm_cache_import_file: Cache export file to import before the analysis.
+        llm_cache_export_file: File to export the cache to after the analysis.
     """
     app_config_instance.configure_logging()
+    app_config_instance.llm_cache_mode = llm_cache_mode
+    app_config_instance.llm_cache_path = llm_cache_path
 
     config = load_config_auth(config=config_auth)
     configuration = ConfigAuthentication(**config)
@@ -85,6 +161,9 @@ def main(
     # Initialize the AnalyzerService with the authentication configuration
     analyzer_service = AnalyzerService(config_auth=configuration)
 
+    if llm_cache_import_file:
+        llm_response_cache_instance.import_from_file(llm_cache_import_file)
+
     # Analyze the feature using the provided file paths and configurations
     analyzer_service.analyze_feature(
         database_tables_file_path=database_tables_file_path,
@@ -93,8 +172,12 @@ def main(
         application_files_dir_path=application_files_dir_path,
         application_files_names_to_consider=application_files_names_to_consider,
         output_file_path=output_file_path,
+        application_files_methods=application_files_methods,
     )
 
+    if llm_cache_export_file:
+        llm_response_cache_instance.export_to_file(llm_cache_export_file)
+
 
 if __name__ == "__main__":
     main()
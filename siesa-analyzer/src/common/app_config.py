@@ -1,7 +1,9 @@
 import logging
+import os
 import sys
 from prompter.base import ConfigAuthentication
 from generativeai.prompter_factory import LLMModelNames
+from generativeai.flow_gemini_chat_model import FLOW_GEMINI_API_URL
 from phoenix.otel import register
 from openinference.instrumentation import OITracer
 from openinference.instrumentation.langchain import LangChainInstrumentor
@@ -22,9 +24,99 @@ class AppConfig:
     use_case_analysis_llm_model: str = LLMModelNames.GEMINI_FLASH_MODEL.value
     backend_entities_llm_model: str = LLMModelNames.OPENAI_MODEL.value
     backend_business_llm_model: str = LLMModelNames.GEMINI_FLASH_MODEL.value
+    procedure_summaries_llm_model: str = LLMModelNames.GEMINI_FLASH_MODEL.value
 
     # General Configurations
     max_procedure_analysis_dependency_depth: int = -1
+    # Procedures summarized bottom-up along the call graph, the summaries of the callees are added to the procedure prompts
+    procedure_callee_summaries_enabled: bool = False
+    # Tables added to the procedure prompts with only the columns the procedure reads or writes, plus their keys
+    procedure_tables_column_pruning_enabled: bool = True
+    # Procedures minified after sanitization (comments, whitespace and GO separators removed), string literals kept as is
+    procedure_minification_enabled: bool = False
+
+    # Entities Code Generation Configurations (documentation comments enriched by the LLM, in batches of tables)
+    backend_entities_llm_documentation_enabled: bool = False
+    backend_entities_documentation_batch_size: int = 20
+    backend_entities_max_cluster_size: int = 15
+
+    # Business Code Generation Configurations (callees generated from the call graph along with their parent, parent class reduced to the members its dependencies need)
+    backend_business_speculative_generation_enabled: bool = False
+    backend_business_parent_context_compaction_enabled: bool = True
+
+    # DbContext Code Generation Configurations (relationships not resolved from the diagram are configured by the LLM)
+    backend_dbcontext_class_name: str = "FeatureServiceContext"
+    backend_dbcontext_namespace: str = "Siesa.Modernization.Access.Context"
+    backend_dbcontext_llm_relationships_enabled: bool = True
+
+    # LLM Response Cache Configurations
+    llm_cache_mode: str = "read-write"
+    llm_cache_path: str = os.path.join(
+        os.path.expanduser("~"), ".siesa-analyzer", "llm_response_cache.sqlite"
+    )
+    llm_cache_max_size_mb: int = 1024
+    llm_cache_max_age_days: int = 30
+
+    # LLM HTTP Transport Configurations (connections per endpoint sized from the governor max concurrency)
+    llm_http_max_async_connections: int = 100
+    llm_http_keepalive_expiry_seconds: float = 120.0
+    llm_http2_enabled: bool = True
+
+    # LLM Retry Configurations (policies per error class: rate_limit, server_error, timeout, connection)
+    llm_retry_policies: dict[str, dict[str, float]] = {
+        "rate_limit": {"max_attempts": 6, "base_delay_seconds": 5.0},
+        "server_error": {"max_attempts": 4, "base_delay_seconds": 2.0},
+        "timeout": {"max_attempts": 2, "base_delay_seconds": 2.0},
+        "connection": {"max_attempts": 4, "base_delay_seconds": 2.0},
+    }
+    llm_retry_deadline_seconds: float = 3600.0
+    llm_circuit_breaker_failure_threshold: int = 5
+    llm_circuit_breaker_reset_timeout_seconds: float = 60.0
+
+    # LLM Token Budget Configurations (context window per model)
+    llm_context_windows: dict[str, int] = {
+        LLMModelNames.OPENAI_MODEL.value: 1_047_576,
+        LLMModelNames.OPENAI_GTP5_MODEL.value: 272_000,
+        LLMModelNames.OPENAI_GTP5_MINI_MODEL.value: 272_000,
+        LLMModelNames.GEMINI_FLASH_MODEL.value: 1_048_576,
+        LLMModelNames.GEMINI_PRO_MODEL.value: 1_048_576,
+    }
+    llm_default_context_window: int = 128_000
+    llm_output_token_reserve: int = 32_768
+    llm_context_window_safety_ratio: float = 0.9
+
+    # Consolidation Configurations (results merged by a single reduce call and reduce calls in parallel)
+    consolidation_max_fan_in: int = 8
+    consolidation_max_workers: int = 5
+
+    # Batching Configurations (small tables and procedures packed into multi-item prompts, one item per prompt when disabled)
+    batch_prompt_enabled: bool = True
+    batch_prompt_max_tokens: int = 8_000
+    batch_prompt_max_items: int = 10
+
+    # LLM Concurrency Governor Configurations (limits per model, unlisted models use the default)
+    llm_governor_enabled: bool = True
+    llm_governor_default_limits: dict[str, int] = {
+        "requests_per_minute": 300,
+        "tokens_per_minute": 1_000_000,
+        "initial_concurrency": 10,
+        "min_concurrency": 1,
+        "max_concurrency": 40,
+    }
+    llm_governor_model_limits: dict[str, dict[str, int]] = {
+        LLMModelNames.OPENAI_MODEL.value: {
+            "requests_per_minute": 500,
+            "tokens_per_minute": 2_000_000,
+        },
+        LLMModelNames.GEMINI_PRO_MODEL.value: {
+            "requests_per_minute": 150,
+            "tokens_per_minute": 2_000_000,
+        },
+        LLMModelNames.GEMINI_FLASH_MODEL.value: {
+            "requests_per_minute": 1000,
+            "tokens_per_minute": 4_000_000,
+        },
+    }
 
     def __new__(cls):
         if cls._instance is None:
@@ -39,6 +131,23 @@ class AppConfig:
     def get_config_auth(self) -> ConfigAuthentication:
         return self._config_auth
 
+    def get_llm_endpoints(self) -> list[str]:
+        """Returns the endpoints of the LLM providers used by the configured models."""
+        models = [
+            self.database_diagrams_llm_model,
+            self.use_case_analysis_llm_model,
+            self.backend_entities_llm_model,
+            self.backend_business_llm_model,
+            self.procedure_summaries_llm_model,
+        ]
+        endpoints = []
+        if any(model.startswith("gemini") for model in models):
+            endpoints.append(FLOW_GEMINI_API_URL)
+        if any(model.startswith(("gpt", "o3")) for model in models):
+            endpoints.append(self._config_auth.openai_base_url)
+
+        return [endpoint for endpoint in endpoints if endpoint]
+
     def configure_logging(self) -> None:
         logging.basicConfig(
             level=logging.INFO, 
@@ -10,6 +10,12 @@ from feature_analyzer.documentation.documentation_phase_service import (
 )
 from common.app_config import app_config_instance
 from generativeai.prompter_agent_tools import initialize_data_wrapper
+from generativeai.prompter_registry import prompter_registry_instance
+from generativeai.llm_response_cache import LLMCacheMode, llm_response_cache_instance
+from generativeai.http_transport import http_transport_pool_instance
+from generativeai.llm_concurrency_governor import llm_concurrency_governor_instance
+from generativeai.llm_retry_policy import llm_retry_executor_instance
+from generativeai.llm_token_budget import llm_token_budget_instance
 from feature_analyzer.common.phase_execution_interface import PhaseExecutionInterface
 from feature_analyzer.preparation.prepation_phase_service import PreparationPhaseService
 
@@ -20,7 +26,13 @@ class AnalyzerService:
     def __init__(self, config_auth: ConfigAuthentication):
         """Initializes the AnalyzerService with the given configuration."""
         app_config_instance.set_config_auth(config_auth)
+        prompter_registry_instance.set_config_auth(config_auth)
         self.logger = logging.getLogger(__name__)
+        self.__configure_llm_cache()
+        self.__configure_llm_concurrency_governor()
+        self.__configure_http_transport()
+        self.__configure_llm_retry_policy()
+        self.__configure_llm_token_budget()
 
     def analyze_feature(
         self,
@@ -30,6 +42,7 @@ class AnalyzerService:
         application_files_dir_path: str,
         application_files_names_to_consider: list[str],
         output_file_path: str,
+        application_files_methods: dict[str, list[str]] = None,
     ) -> None:
         """Analyzes a database feature given the specified file paths and generates code."""
         self.logger.info(f"Starting analysis for feature...")
@@ -41,6 +54,7 @@ class AnalyzerService:
             application_files_dir_path=application_files_dir_path,
             application_files_names_to_consider=application_files_names_to_consider,
             output_file_path=output_file_path,
+            application_files_methods=application_files_methods,
         )
 
         self.logger.info(f"Initializing DataWrapperModel...")
@@ -58,7 +72,55 @@ class AnalyzerService:
                 phase.execute(data_wrapper)
 
             self.logger.info(phase.get_finished_log_message())
+            self.logger.info(
+                f"LLM concurrency limits: {llm_concurrency_governor_instance.get_current_limits()}"
+            )
 
         self.logger.info(
             f"Analysis and code generation completed successfully. Output written to {data_wrapper.output_timestamped_dir}."
         )
+
+    def __configure_llm_cache(self) -> None:
+        """Configures the persistent LLM response cache from the application settings."""
+        llm_response_cache_instance.configure(
+            cache_path=app_config_instance.llm_cache_path,
+            mode=LLMCacheMode(app_config_instance.llm_cache_mode),
+            max_size_mb=app_config_instance.llm_cache_max_size_mb,
+            max_age_days=app_config_instance.llm_cache_max_age_days,
+        )
+
+    def __configure_http_transport(self) -> None:
+        """Configures the pooled HTTP transport shared by the prompters."""
+        # Every call the governor lets through gets its own connection
+        http_transport_pool_instance.configure(
+            max_connections=llm_concurrency_governor_instance.get_max_concurrency(),
+            max_async_connections=app_config_instance.llm_http_max_async_connections,
+            keepalive_expiry_seconds=app_config_instance.llm_http_keepalive_expiry_seconds,
+            http2_enabled=app_config_instance.llm_http2_enabled,
+        )
+
+    def __configure_llm_concurrency_governor(self) -> None:
+        """Configures the rate limits and concurrency shared by every LLM call."""
+        llm_concurrency_governor_instance.configure(
+            model_settings=app_config_instance.llm_governor_model_limits,
+            default_settings=app_config_instance.llm_governor_default_limits,
+            enabled=app_config_instance.llm_governor_enabled,
+        )
+
+    def __configure_llm_retry_policy(self) -> None:
+        """Configures the retries, deadline and circuit breakers of the LLM calls."""
+        llm_retry_executor_instance.configure(
+            policies=app_config_instance.llm_retry_policies,
+            deadline_seconds=app_config_instance.llm_retry_deadline_seconds,
+            failure_threshold=app_config_instance.llm_circuit_breaker_failure_threshold,
+            reset_timeout_seconds=app_config_instance.llm_circuit_breaker_reset_timeout_seconds,
+        )
+
+    def __configure_llm_token_budget(self) -> None:
+        """Configures the context windows used by the pre-flight token budget check."""
+        llm_token_budget_instance.configure(
+            context_windows=app_config_instance.llm_context_windows,
+            default_context_window=app_config_instance.llm_default_context_window,
+            output_token_reserve=app_config_instance.llm_output_token_reserve,
+            safety_ratio=app_config_instance.llm_context_window_safety_ratio,
+        )
@@ -16,9 +16,12 @@ from feature_analyzer.codegenerator.business.business_code_generator_from_proced
 from feature_analyzer.codegenerator.business.procedure_dependency_processor import (
     ProcedureDependencyProcessor,
 )
+from feature_analyzer.codegenerator.business.speculative_callee_generator import (
+    SpeculativeCalleeGenerator,
+)
 from feature_analyzer.models.code_result_model import CodeResultModel
 from common.feature_toggle import feature_toggle_instance
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_registry import prompter_registry_instance
 from common.app_config import app_config_instance
 from feature_analyzer.common.step_execution_interface import StepExecutionInterface
 
@@ -41,19 +44,13 @@ class BusinessCodeGenerationStepService(StepExecutionInterface):
             model (str): The name of the language model to use.
             max_dependency_depth (int, optional): The maximum depth to process dependencies. Defaults to 1.
         """
-        prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
-            model=app_config_instance.backend_business_llm_model,
-            use_agent=True,
-        )
-
-        prompter.bind_model(structured_output_class=CodeResultModel)
-        self.code_generator_from_procedure = BusinessCodeGeneratorFromProcedure(
-            prompter
-        )
-        self.dependency_processor = ProcedureDependencyProcessor(
-            self.code_generator_from_procedure, max_dependency_depth
-        )
+        self.max_dependency_depth = max_dependency_depth
+        # Created when the step executes, so a disabled step never builds its prompter
+        self.code_generator_from_procedure: Optional[
+            BusinessCodeGeneratorFromProcedure
+        ] = None
+        self.dependency_processor: Optional[ProcedureDependencyProcessor] = None
+        self.speculative_generator: Optional[SpeculativeCalleeGenerator] = None
         self.all_class_implementations: list[ClassImplementation] = []
 
         self.logger = logging.getLogger(__name__)
@@ -77,6 +74,8 @@ class BusinessCodeGenerationStepService(StepExecutionInterface):
 
             self.logger.info("Starting code generation from procedures process...")
 
+            if self.code_generator_from_procedure is None:
+                self.__create_generators()
             self.all_class_implementations = []
             entry_point_procedure: Optional[ProcedureAnalysisResultModel] = (
                 self._get_entry_point_procedure(data_wrapper)
@@ -87,6 +86,16 @@ class BusinessCodeGenerationStepService(StepExecutionInterface):
                 self.logger.error(error_message)
                 raise ValueError(error_message)
 
+            # The callees are known from the call graph, so they can be generated along with the entry point
+            speculative_generator = None
+            if app_config_instance.backend_business_speculative_generation_enabled:
+                speculative_generator = self.speculative_generator
+                speculative_generator.start(
+                    entry_point_procedure.procedure_name,
+                    data_wrapper.output_procedures_mapping,
+                    data_wrapper.output_procedure_analysis_result,
+                )
+
             self.logger.info(
                 f"Generating code for entry point procedure: {entry_point_procedure.procedure_name}"
             )
@@ -108,6 +117,7 @@ class BusinessCodeGenerationStepService(StepExecutionInterface):
                 data_wrapper,
                 self.all_class_implementations,
                 current_depth=1,
+                speculative_generator=speculative_generator,
             )
 
             # Combine all generated code into a single string
@@ -123,9 +133,30 @@ class BusinessCodeGenerationStepService(StepExecutionInterface):
             self.logger.error(
                 f"Error on generating the backend business classes: {error}."
             )
+        finally:
+            if self.speculative_generator is not None:
+                self.speculative_generator.finish()
 
         return data_wrapper
 
+    def __create_generators(self) -> None:
+        prompter = prompter_registry_instance.get_prompter(
+            model=app_config_instance.backend_business_llm_model,
+            use_agent=True,
+            structured_output_class=CodeResultModel,
+        )
+        self.code_generator_from_procedure = BusinessCodeGeneratorFromProcedure(
+            prompter
+        )
+        self.dependency_processor = ProcedureDependencyProcessor(
+            self.code_generator_from_procedure,
+            self.max_dependency_depth,
+            compact_parent_context=app_config_instance.backend_business_parent_context_compaction_enabled,
+        )
+        self.speculative_generator = SpeculativeCalleeGenerator(
+            self.code_generator_from_procedure, self.max_dependency_depth
+        )
+
     def _get_entry_point_procedure(
         self, data_wrapper: DataWrapperModel
     ) -> Optional[ProcedureAnalysisResultModel]:
@@ -15,7 +15,7 @@ from feature_analyzer.feature_toggle import feature_toggle_instance
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_registry import prompter_registry_instance
 from feature_analyzer.app_config import app_config_instance
 
 
@@ -28,21 +28,11 @@ class BusinessFullAICodeGeneratorFromProcedure(CodeGeneratorServiceInterface):
     def __init__(self):
         """
         Initializes the GenerateCodeFromProcedureService with configurations and dependencies.
-
-        Args:
-            config_auth (ConfigAuthentication): The authentication configuration for the language model.
-            model (str): The name of the language model to use.
-            max_dependency_depth (int, optional): The maximum depth to process dependencies. Defaults to 1.
         """
-        prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
-            model=app_config_instance.backend_business_llm_model,
-            use_agent=True,
-        )
-
-        self.code_generator_from_procedure = BusinessCodeGeneratorFromProcedure(
-            prompter
-        )
+        # Created when the service generates, so a disabled service never builds its prompter
+        self.code_generator_from_procedure: Optional[
+            BusinessCodeGeneratorFromProcedure
+        ] = None
         self.logger = logging.getLogger(__name__)
 
     def generate(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
@@ -67,6 +57,13 @@ class BusinessFullAICodeGeneratorFromProcedure(CodeGeneratorServiceInterface):
 
             self.logger.info("Starting code generation from procedures process...")
 
+            if self.code_generator_from_procedure is None:
+                self.code_generator_from_procedure = BusinessCodeGeneratorFromProcedure(
+                    prompter_registry_instance.get_prompter(
+                        model=app_config_instance.backend_business_llm_model,
+                        use_agent=True,
+                    )
+                )
             entry_point_procedure: Optional[ProcedureAnalysisResultModel] = (
                 self._get_entry_point_procedure(data_wrapper)
             )
@@ -21,7 +21,7 @@ from feature_analyzer.codegenerator.business.procedure_dependency_processor impo
 )
 from feature_analyzer.models.code_result_model import CodeResultModel
 from feature_analyzer.feature_toggle import feature_toggle_instance
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_registry import prompter_registry_instance
 from feature_analyzer.app_config import app_config_instance
 
 logging.basicConfig(
@@ -43,23 +43,14 @@ class BusinessRegularCodeGeneratorFromProcedure(CodeGeneratorServiceInterface):
         Initializes the GenerateCodeFromProcedureService with configurations and dependencies.
 
         Args:
-            config_auth (ConfigAuthentication): The authentication configuration for the language model.
-            model (str): The name of the language model to use.
             max_dependency_depth (int, optional): The maximum depth to process dependencies. Defaults to 1.
         """
-        prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
-            model=app_config_instance.backend_business_llm_model,
-            use_agent=True,
-        )
-
-        prompter.bind_model(structured_output_class=CodeResultModel)
-        self.code_generator_from_procedure = BusinessCodeGeneratorFromProcedure(
-            prompter
-        )
-        self.dependency_processor = ProcedureDependencyProcessor(
-            self.code_generator_from_procedure, max_dependency_depth
-        )
+        self.max_dependency_depth = max_dependency_depth
+        # Created when the service generates, so a disabled service never builds its prompter
+        self.code_generator_from_procedure: Optional[
+            BusinessCodeGeneratorFromProcedure
+        ] = None
+        self.dependency_processor: Optional[ProcedureDependencyProcessor] = None
         self.all_class_implementations: list[ClassImplementation] = []
 
         self.logger = logging.getLogger(__name__)
@@ -85,6 +76,8 @@ class BusinessRegularCodeGeneratorFromProcedure(CodeGeneratorServiceInterface):
 
             self.logger.info("Starting code generation from procedures process...")
 
+            if self.code_generator_from_procedure is None:
+                self.__create_generators()
             self.all_class_implementations = []
             entry_point_procedure: Optional[ProcedureAnalysisResultModel] = (
                 self._get_entry_point_procedure(data_wrapper)
@@ -134,6 +127,19 @@ class BusinessRegularCodeGeneratorFromProcedure(CodeGeneratorServiceInterface):
 
         return data_wrapper
 
+    def __create_generators(self) -> None:
+        prompter = prompter_registry_instance.get_prompter(
+            model=app_config_instance.backend_business_llm_model,
+            use_agent=True,
+            structured_output_class=CodeResultModel,
+        )
+        self.code_generator_from_procedure = BusinessCodeGeneratorFromProcedure(
+            prompter
+        )
+        self.dependency_processor = ProcedureDependencyProcessor(
+            self.code_generator_from_procedure, self.max_dependency_depth
+        )
+
     def _get_entry_point_procedure(
         self, data_wrapper: DataWrapperModel
     ) -> Optional[ProcedureAnalysisResultModel]:
@@ -0,0 +1,300 @@
+import re
+from typing import Optional
+
+
+class CSharpCodeNode:
+    """
+    Represents a node of C# code split by its braces: a statement (ending with `;`) or a
+    block (a header followed by `{ ... }`, e.g. a class, a method or an `if`).
+    """
+
+    text: str
+    children: Optional[list["CSharpCodeNode"]]
+
+    def __init__(self, text: str, children: list["CSharpCodeNode"] = None) -> None:
+        self.text = text
+        self.children = children
+
+    @property
+    def is_block(self) -> bool:
+        return self.children is not None
+
+
+class CSharpParentContextExtractor:
+    """
+    Reduces the C# code of a parent class to the members a dependency (the placeholder class
+    it calls) needs to be implemented: the placeholder class or interface itself, the
+    fields and properties of its type, the constructor signatures, and the signatures of
+    the methods calling it, with only their calling statements.
+
+    The code is split with a lightweight brace scanner (string literals and comments are
+    skipped), not a full C# parser. When the code cannot be split, it is returned as is.
+    """
+
+    _type_declaration_pattern = re.compile(
+        r"\b(?:class|interface|record|struct|enum)\s+(?P<name>\w+)"
+    )
+    _member_name_pattern = re.compile(r"(?P<name>\w+)\s*(?:<[^()]*>)?\s*\($")
+    _variable_name_pattern = re.compile(r"(?P<name>\w+)\s*(?:=[^;]*)?;?$")
+    _indent = "    "
+
+    def extract(self, content: str, class_name: str) -> str:
+        """
+        Extracts the context of the placeholder class from the parent class code.
+
+        Args:
+            content (str): The parent class code (one or more C# types).
+            class_name (str): The name of the placeholder class called by the parent.
+
+        Returns:
+            str: The compact parent context, or the original content if it could not be parsed.
+        """
+        if not content or not class_name:
+            return content
+
+        nodes = self.parse(content)
+        if nodes is None:
+            return content
+
+        names = {class_name, f"I{class_name}"}
+        context = "\n".join(self.__render_nodes(nodes, names, 0))
+        # Without any reference to the placeholder there is nothing to reduce the parent to
+        return context if self.__mentions(context, names) else content
+
+    def parse(self, content: str) -> Optional[list[CSharpCodeNode]]:
+        """Splits the code into nodes, or returns None when its braces are unbalanced."""
+        stack: list[list[CSharpCodeNode]] = [[]]
+        headers: list[str] = []
+        buffer: list[str] = []
+        index = 0
+        length = len(content)
+
+        while index < length:
+            char = content[index]
+            next_char = content[index + 1] if index + 1 < length else ""
+
+            if char == "/" and next_char == "/":
+                end = content.find("\n", index)
+                index = length if end == -1 else end
+                continue
+            if char == "/" and next_char == "*":
+                end = content.find("*/", index + 2)
+                index = length if end == -1 else end + 2
+                continue
+            if char in "\"'" or (char in "@$" and next_char in "\"@$"):
+                end = self.__find_literal_end(content, index)
+                buffer.append(content[index:end])
+                index = end
+                continue
+
+            if char == ";":
+                stack[-1].append(CSharpCodeNode(self.__normalize("".join(buffer)) + ";"))
+                buffer = []
+            elif char == "{":
+                headers.append(self.__normalize("".join(buffer)))
+                stack.append([])
+                buffer = []
+            elif char == "}":
+                if len(stack) == 1:
+                    return None
+                trailing = self.__normalize("".join(buffer))
+                children = stack.pop()
+                if trailing:
+                    children.append(CSharpCodeNode(trailing))
+                stack[-1].append(CSharpCodeNode(headers.pop(), children))
+                buffer = []
+            else:
+                buffer.append(char)
+            index += 1
+
+        if len(stack) != 1:
+            return None
+        return stack[0]
+
+    def __render_nodes(
+        self, nodes: list[CSharpCodeNode], names: set[str], depth: int
+    ) -> list[str]:
+        lines = []
+        for node in nodes:
+            if not node.is_block:
+                # Namespaces and usings outside the types are kept
+                if node.text.startswith(("namespace ", "using ")):
+                    lines.append(self.__indent(node.text, depth))
+                continue
+
+            if node.text.startswith("namespace "):
+                children = self.__render_nodes(node.children, names, depth + 1)
+                if children:
+                    lines.extend(
+                        [
+                            self.__indent(node.text, depth),
+                            self.__indent("{", depth),
+                            *children,
+                            self.__indent("}", depth),
+                        ]
+                    )
+                continue
+
+            declaration = self._type_declaration_pattern.search(node.text)
+            if declaration is None:
+                continue
+
+            if declaration.group("name") in names:
+                # The placeholder class (or its interface) is kept entirely
+                lines.extend(self.__render_block(node, depth))
+            else:
+                lines.extend(self.__render_type(node, names, depth))
+        return lines
+
+    def __render_type(
+        self, node: CSharpCodeNode, names: set[str], depth: int
+    ) -> list[str]:
+        type_name = self._type_declaration_pattern.search(node.text).group("name")
+        references = set(names)
+
+        # Fields and properties of the placeholder type are how the methods reach it
+        for child in node.children:
+            if not self.__is_method(child) and self.__mentions(child.text, names):
+                variable_name = self.__get_variable_name(child)
+                if variable_name:
+                    references.add(variable_name)
+
+        members = []
+        has_references = self.__mentions(node.text, names)
+        for child in node.children:
+            if self.__is_method(child):
+                member_name = self.__get_member_name(child.text)
+                if member_name == type_name:
+                    members.append(self.__indent(f"{child.text} {{ ... }}", depth + 1))
+                    continue
+                has_references = has_references or self.__mentions(
+                    child.text, references
+                )
+
+                if not child.is_block:
+                    # Expression-bodied methods are kept when they call the placeholder
+                    if self.__mentions(child.text, references):
+                        members.append(self.__indent(child.text, depth + 1))
+                    continue
+
+                calls = self.__find_statements(child.children, references)
+                has_references = has_references or bool(calls)
+                if calls or self.__mentions(child.text, references):
+                    members.extend(
+                        [
+                            self.__indent(child.text, depth + 1),
+                            self.__indent("{", depth + 1),
+                            *[
+                                self.__indent(line, depth + 2)
+                                for call in calls
+                                for line in ("// ...", call)
+                            ],
+                            self.__indent("// ...", depth + 2),
+                            self.__indent("}", depth + 1),
+                        ]
+                    )
+            elif self.__is_type(child):
+                nested_type = self.__render_nodes([child], names, depth + 1)
+                has_references = has_references or bool(nested_type)
+                members.extend(nested_type)
+            elif self.__mentions(child.text, names):
+                has_references = True
+                members.extend(self.__render_block(child, depth + 1))
+
+        if not has_references:
+            # Types unrelated to the placeholder are left out
+            return []
+
+        return [
+            self.__indent(node.text, depth),
+            self.__indent("{", depth),
+            *members,
+            self.__indent("}", depth),
+        ]
+
+    def __render_block(self, node: CSharpCodeNode, depth: int) -> list[str]:
+        if not node.is_block:
+            return [self.__indent(node.text, depth)]
+
+        if all(not child.is_block for child in node.children) and len(node.children) <= 4:
+            # Short blocks, such as property accessors, are kept on a single line
+            children = " ".join(child.text for child in node.children)
+            return [self.__indent(f"{node.text} {{ {children} }}".replace("{  }", "{ }"), depth)]
+
+        lines = [self.__indent(node.text, depth), self.__indent("{", depth)]
+        for child in node.children:
+            lines.extend(self.__render_block(child, depth + 1))
+        lines.append(self.__indent("}", depth))
+        return lines
+
+    def __find_statements(
+        self, nodes: list[CSharpCodeNode], references: set[str]
+    ) -> list[str]:
+        """Returns the statements, at any depth, that mention one of the references."""
+        statements = []
+        for node in nodes:
+            if node.is_block:
+                if self.__mentions(node.text, references):
+                    statements.append(f"{node.text} {{ ... }}")
+                else:
+                    statements.extend(self.__find_statements(node.children, references))
+            elif self.__mentions(node.text, references):
+                statements.append(node.text)
+        return statements
+
+    def __is_method(self, node: CSharpCodeNode) -> bool:
+        if self.__is_type(node):
+            return False
+        signature = self.__strip_attributes(node.text.split("=>")[0])
+        # Fields initialized with a call, e.g. `_list = new List<int>()`, are not methods
+        return "(" in signature and "=" not in signature.split("(")[0]
+
+    def __is_type(self, node: CSharpCodeNode) -> bool:
+        return node.is_block and self._type_declaration_pattern.search(node.text) is not None
+
+    def __get_member_name(self, header: str) -> Optional[str]:
+        signature = self.__strip_attributes(header.split("=>")[0])
+        match = self._member_name_pattern.search(signature[: signature.find("(") + 1])
+        return match.group("name") if match else None
+
+    def __get_variable_name(self, node: CSharpCodeNode) -> Optional[str]:
+        text = node.text if not node.is_block else node.text + ";"
+        match = self._variable_name_pattern.search(text.split("=>")[0].strip())
+        return match.group("name") if match else None
+
+    def __strip_attributes(self, text: str) -> str:
+        # Attributes, e.g. [HttpGet("route")], are not part of the signature
+        return re.sub(r"^\s*(\[[^\]]*\]\s*)+", "", text)
+
+    def __mentions(self, text: str, names: set[str]) -> bool:
+        return any(re.search(rf"\b{re.escape(name)}\b", text) for name in names)
+
+    def __find_literal_end(self, content: str, start: int) -> int:
+        """Returns the index after the string or char literal starting at `start`."""
+        index = start
+        is_verbatim = False
+        while content[index] in "@$":
+            is_verbatim = is_verbatim or content[index] == "@"
+            index += 1
+        quote = content[index]
+        index += 1
+        while index < len(content):
+            char = content[index]
+            if char == "\\" and not is_verbatim:
+                index += 2
+                continue
+            if char == quote:
+                if is_verbatim and content[index + 1 : index + 2] == quote:
+                    index += 2
+                    continue
+                return index + 1
+            if char == "\n" and not is_verbatim:
+                return index
+            index += 1
+        return index
+
+    def __normalize(self, text: str) -> str:
+        return " ".join(text.split())
+
+    def __indent(self, text: str, depth: int) -> str:
+        return f"{self._indent * depth}{text}"
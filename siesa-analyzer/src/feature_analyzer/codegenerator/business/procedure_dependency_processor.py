@@ -1,8 +1,14 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from feature_analyzer.codegenerator.business.business_code_generator_from_procedure import (
     BusinessCodeGeneratorFromProcedure,
 )
-from feature_analyzer.models.code_result_model import ClassImplementation
+from feature_analyzer.codegenerator.business.csharp_parent_context_extractor import (
+    CSharpParentContextExtractor,
+)
+from feature_analyzer.codegenerator.business.speculative_callee_generator import (
+    SpeculativeCalleeGenerator,
+)
 from typing import Optional
 from feature_analyzer.models.data_wrapper_model import DataWrapperModel
 from feature_analyzer.models.procedure_analysis_result_model import (
@@ -17,13 +23,20 @@ from feature_analyzer.models.code_result_model import (
 class ProcedureDependencyProcessor:
     """
     Handles the processing of dependencies for class implementations.
-    This class is responsible for recursively processing dependencies to a specified depth.
+    The dependencies are processed breadth-first up to a specified depth: the dependencies of
+    a depth level are generated in parallel, and a dependency referenced by several parents
+    (same procedure and class to be implemented) is generated only once.
+
+    Instead of the full parent class, each dependency receives the parent members it needs:
+    the placeholder class, the constructor signatures and the methods calling it.
     """
 
     def __init__(
         self,
         code_generator: BusinessCodeGeneratorFromProcedure,
         max_dependency_depth: int,
+        max_workers: int = 5,
+        compact_parent_context: bool = True,
     ):
         """
         Initializes the DependencyProcessor with a CodeGenerator and the maximum dependency depth.
@@ -31,9 +44,16 @@ class ProcedureDependencyProcessor:
         Args:
             code_generator (CodeGenerator): The CodeGenerator instance to use for generating code for dependencies.
             max_dependency_depth (int): The maximum depth to process dependencies.
+            max_workers (int, optional): The number of dependencies of a depth level generated in parallel. Defaults to 5.
+            compact_parent_context (bool, optional): Whether to send the compact parent context instead of
+                the full parent class. Defaults to True.
         """
         self.code_generator = code_generator
         self.max_dependency_depth = max_dependency_depth
+        self.max_workers = max_workers
+        self.compact_parent_context = compact_parent_context
+        self.parent_context_extractor = CSharpParentContextExtractor()
+        self.parent_context_tokens = {"full": 0, "compact": 0}
         self.logger = logging.getLogger(__name__)
 
     def process_dependencies(
@@ -42,77 +62,203 @@ class ProcedureDependencyProcessor:
         data_wrapper: DataWrapperModel,
         all_class_implementations: list[ClassImplementation],
         current_depth: int,
+        speculative_generator: Optional[SpeculativeCalleeGenerator] = None,
     ):
         """
-        Recursively processes dependencies of class implementations to a specified depth.
+        Processes the dependencies of class implementations, level by level, to a specified depth.
 
         Args:
             class_implementations (List[ClassImplementation]): The list of class implementations to process dependencies for.
             data_wrapper (DataWrapperModel): The data wrapper containing necessary context and information.
-            all_class_implementations (List[ClassImplementation]): The list to store all generated class implementations.
-            current_depth (int): The current depth of dependency processing.
+            all_class_implementations (List[ClassImplementation]): The list to store all generated class implementations,
+                in a deterministic order (by depth level, then by parent and dependency order).
+            current_depth (int): The depth of the dependencies of the given class implementations.
+            speculative_generator (SpeculativeCalleeGenerator, optional): The generator of the callees started
+                speculatively, whose code is reused instead of generating it again.
         """
-        if current_depth > self.max_dependency_depth:
-            log_message = (
-                f"Dependency depth exceeded. Stopping at depth {current_depth}."
+        procedures_by_name = self._index_procedures(data_wrapper)
+        self.parent_context_tokens = {"full": 0, "compact": 0}
+        generated_dependencies: set[tuple[str, str]] = set()
+        level_implementations = class_implementations
+
+        while level_implementations:
+            if current_depth > self.max_dependency_depth:
+                log_message = (
+                    f"Dependency depth exceeded. Stopping at depth {current_depth}."
+                )
+                self.logger.info(log_message)
+                break
+
+            pending_dependencies = self._get_pending_dependencies(
+                level_implementations, procedures_by_name, generated_dependencies
+            )
+            if not pending_dependencies:
+                break
+
+            self.logger.info(
+                f"Generating code for {len(pending_dependencies)} dependencies at depth {current_depth}"
             )
-            self.logger.info(log_message)
-            return  # Stop recursion
+            level_results = self._generate_level(
+                pending_dependencies, speculative_generator
+            )
+
+            # The results are collected in the order of the dependencies, not of completion
+            level_implementations = []
+            for dependency_key in pending_dependencies:
+                generated_dependencies.add(dependency_key)
+                dependency_implementations = level_results.get(dependency_key, [])
+                all_class_implementations.extend(dependency_implementations)
+                level_implementations.extend(dependency_implementations)
 
+            current_depth += 1
+
+        self.__log_parent_context_tokens_saved()
+
+    def _get_pending_dependencies(
+        self,
+        class_implementations: list[ClassImplementation],
+        procedures_by_name: dict[str, ProcedureAnalysisResultModel],
+        generated_dependencies: set[tuple[str, str]],
+    ) -> dict[tuple[str, str], tuple[ProcedureAnalysisResultModel, str, str]]:
+        """
+        Collects the dependencies of the class implementations that were not generated yet,
+        keyed by (procedure name, class to be implemented), along with the procedure, the
+        class to be implemented and the content of the (first) parent class.
+        """
+        pending_dependencies = {}
         for class_implementation in class_implementations:
             for dependency in class_implementation.next_implementation:
-                # Find the ProcedureAnalysisResultModel for the dependency
-                dependency_procedure = self._find_dependency_procedure(
-                    data_wrapper, dependency.procedure_name
+                dependency_key = (
+                    dependency.procedure_name,
+                    dependency.class_to_be_implemented,
                 )
+                if (
+                    dependency_key in generated_dependencies
+                    or dependency_key in pending_dependencies
+                ):
+                    self.logger.info(
+                        f"Reusing the code generated for dependency: {dependency.procedure_name} ({dependency.class_to_be_implemented})"
+                    )
+                    continue
 
+                # Find the ProcedureAnalysisResultModel for the dependency
+                dependency_procedure = procedures_by_name.get(dependency.procedure_name)
                 if not dependency_procedure:
                     log_message = f"⚠️ Warning: Procedure {dependency.procedure_name} not found in analysis results."
                     self.logger.warning(log_message)
                     continue  # Skip if the dependency procedure is not found
 
-                self.logger.info(
-                    f"Generating code for dependency: {dependency.procedure_name} at depth {current_depth}"
+                pending_dependencies[dependency_key] = (
+                    dependency_procedure,
+                    dependency.class_to_be_implemented,
+                    self._get_parent_context(
+                        class_implementation.content, dependency.class_to_be_implemented
+                    ),
                 )
 
-                # Generate code for the dependency, passing the parent class content
-                dependency_code_result_model: CodeResultModel = (
-                    self.code_generator.generate_code_for_procedure_with_agent_as_structured(
-                        dependency_procedure,
-                        class_to_be_implemented=dependency.class_to_be_implemented,
-                        parent_class_content=class_implementation.content,  # Parent content
+        return pending_dependencies
+
+    def _get_parent_context(self, parent_content: str, class_to_be_implemented: str) -> str:
+        """Returns the parent content sent to the dependency, compacted when enabled."""
+        if not self.compact_parent_context:
+            return parent_content
+
+        parent_context = self.parent_context_extractor.extract(
+            parent_content, class_to_be_implemented
+        )
+        self.parent_context_tokens["full"] += self.code_generator.prompter.count_tokens(
+            parent_content or ""
+        )
+        self.parent_context_tokens["compact"] += (
+            self.code_generator.prompter.count_tokens(parent_context or "")
+        )
+        return parent_context
+
+    def _generate_level(
+        self,
+        pending_dependencies: dict[
+            tuple[str, str], tuple[ProcedureAnalysisResultModel, str, str]
+        ],
+        speculative_generator: Optional[SpeculativeCalleeGenerator],
+    ) -> dict[tuple[str, str], list[ClassImplementation]]:
+        """Generates the code of the dependencies of a depth level in parallel."""
+        level_results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._generate_dependency,
+                    dependency_procedure,
+                    class_to_be_implemented,
+                    parent_class_content,
+                    speculative_generator,
+                ): dependency_key
+                for dependency_key, (
+                    dependency_procedure,
+                    class_to_be_implemented,
+                    parent_class_content,
+                ) in pending_dependencies.items()
+            }
+
+            for future in as_completed(futures):
+                dependency_key = futures[future]
+                try:
+                    level_results[dependency_key] = future.result()
+                except Exception as e:
+                    self.logger.error(
+                        f"❌ Error generating code for dependency {dependency_key[0]}: {e}"
                     )
-                )
-                all_class_implementations.extend(
-                    dependency_code_result_model.class_implementations
-                )
 
-                # Recursively process the dependencies of the dependency, incrementing the depth
-                self.process_dependencies(
-                    dependency_code_result_model.class_implementations,
-                    data_wrapper,
-                    all_class_implementations,
-                    current_depth=current_depth + 1,
-                )
+        return level_results
 
-    def _find_dependency_procedure(
-        self, data_wrapper: DataWrapperModel, procedure_name: str
-    ) -> Optional[ProcedureAnalysisResultModel]:
+    def _generate_dependency(
+        self,
+        dependency_procedure: ProcedureAnalysisResultModel,
+        class_to_be_implemented: str,
+        parent_class_content: str,
+        speculative_generator: Optional[SpeculativeCalleeGenerator],
+    ) -> list[ClassImplementation]:
+        if speculative_generator is not None:
+            speculative_implementations = speculative_generator.claim(
+                dependency_procedure.procedure_name, class_to_be_implemented
+            )
+            if speculative_implementations is not None:
+                return speculative_implementations
+
+        # Generate code for the dependency, passing the parent class content
+        dependency_code_result_model: CodeResultModel = (
+            self.code_generator.generate_code_for_procedure_with_agent_as_structured(
+                dependency_procedure,
+                class_to_be_implemented=class_to_be_implemented,
+                parent_class_content=parent_class_content,
+            )
+        )
+        return dependency_code_result_model.class_implementations
+
+    def _index_procedures(
+        self, data_wrapper: DataWrapperModel
+    ) -> dict[str, ProcedureAnalysisResultModel]:
         """
-        Helper method to find a dependency procedure in the data wrapper by its name.
+        Helper method to index the procedures of the data wrapper by their name.
 
         Args:
             data_wrapper (DataWrapperModel): The data wrapper containing the procedure analysis results.
-            procedure_name (str): The name of the procedure to find.
 
         Returns:
-            Optional[ProcedureAnalysisResultModel]: The found procedure analysis result model, or None if not found.
+            dict[str, ProcedureAnalysisResultModel]: The procedure analysis results by name (the first one wins).
         """
-        return next(
-            (
-                proc
-                for proc in data_wrapper.output_procedure_analysis_result
-                if proc.procedure_name == procedure_name
-            ),
-            None,
+        procedures_by_name = {}
+        for procedure in data_wrapper.output_procedure_analysis_result:
+            procedures_by_name.setdefault(procedure.procedure_name, procedure)
+        return procedures_by_name
+
+    def __log_parent_context_tokens_saved(self) -> None:
+        full_tokens = self.parent_context_tokens["full"]
+        compact_tokens = self.parent_context_tokens["compact"]
+        if full_tokens == 0:
+            return
+
+        saved_tokens = full_tokens - compact_tokens
+        self.logger.info(
+            f"Parent context compaction sent {compact_tokens} instead of {full_tokens} parent tokens "
+            f"({saved_tokens} tokens saved, {saved_tokens / full_tokens:.0%})."
         )
@@ -0,0 +1,212 @@
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from feature_analyzer.codegenerator.business.business_code_generator_from_procedure import (
+    BusinessCodeGeneratorFromProcedure,
+)
+from feature_analyzer.models.procedure_model import ProcedureModel
+from feature_analyzer.models.procedure_analysis_result_model import (
+    ProcedureAnalysisResultModel,
+)
+from feature_analyzer.models.code_result_model import (
+    CodeResultModel,
+    ClassImplementation,
+)
+
+
+class SpeculativeCalleeGenerator:
+    """
+    Generates the callees of a procedure speculatively, in parallel with the procedure itself.
+
+    The callees are known statically from the call graph (`ProcedureModel.calls`), so their
+    code can be requested before the parent `CodeResultModel` says which dependencies to
+    implement. Each callee is generated with a provisional class name, which is renamed to
+    the `class_to_be_implemented` of the parent once it arrives. The speculations never
+    claimed by a parent are reported as wasted.
+    """
+
+    def __init__(
+        self,
+        code_generator: BusinessCodeGeneratorFromProcedure,
+        max_dependency_depth: int,
+        max_workers: int = 5,
+    ):
+        """
+        Initializes the generator.
+
+        Args:
+            code_generator (BusinessCodeGeneratorFromProcedure): Generates the code of a procedure.
+            max_dependency_depth (int): The maximum depth of the callees generated speculatively.
+            max_workers (int, optional): The number of callees generated in parallel. Defaults to 5.
+        """
+        self.code_generator = code_generator
+        self.max_dependency_depth = max_dependency_depth
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.speculations: dict[str, Future] = {}
+        self.provisional_class_names: dict[str, str] = {}
+        self.claimed_procedures: set[str] = set()
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def start(
+        self,
+        entry_point_name: str,
+        procedures_mapping: list[ProcedureModel],
+        procedures_analysis_result: list[ProcedureAnalysisResultModel],
+    ) -> None:
+        """
+        Starts generating, in background, the callees of the entry point up to the maximum depth.
+
+        Args:
+            entry_point_name (str): The name of the entry point procedure (not generated here).
+            procedures_mapping (list[ProcedureModel]): The procedures with their static calls.
+            procedures_analysis_result (list[ProcedureAnalysisResultModel]): The procedures to generate the code from.
+        """
+        self.finish()
+
+        calls_by_procedure = {}
+        for procedure in procedures_mapping:
+            calls_by_procedure.setdefault(procedure.procedure_name, procedure.calls)
+        analysis_by_procedure = {}
+        for procedure in procedures_analysis_result:
+            analysis_by_procedure.setdefault(procedure.procedure_name, procedure)
+
+        callees = self.__get_callees(entry_point_name, calls_by_procedure)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        for callee in callees:
+            procedure = analysis_by_procedure.get(callee)
+            if procedure is None:
+                continue
+
+            provisional_class_name = self.__get_provisional_class_name(callee)
+            self.provisional_class_names[callee] = provisional_class_name
+            self.speculations[callee] = self.executor.submit(
+                self.code_generator.generate_code_for_procedure_with_agent_as_structured,
+                procedure,
+                class_to_be_implemented=provisional_class_name,
+                parent_class_content="",
+            )
+
+        self.logger.info(
+            f"Generating {len(self.speculations)} callees of {entry_point_name} speculatively..."
+        )
+
+    def claim(
+        self, procedure_name: str, class_to_be_implemented: str
+    ) -> Optional[list[ClassImplementation]]:
+        """
+        Returns the speculative code of a callee, renamed to the class expected by its parent.
+        Waits for the speculation to complete if it is still running.
+
+        Args:
+            procedure_name (str): The name of the callee procedure.
+            class_to_be_implemented (str): The class name expected by the parent.
+
+        Returns:
+            Optional[list[ClassImplementation]]: The class implementations, or None when the callee was not
+                speculated or its speculation failed.
+        """
+        speculation = self.speculations.get(procedure_name)
+        if speculation is None:
+            return None
+
+        try:
+            code_result_model: CodeResultModel = speculation.result()
+        except Exception as e:
+            self.logger.warning(
+                f"⚠️ Speculative generation of {procedure_name} failed, generating it again: {e}"
+            )
+            return None
+
+        with self.lock:
+            self.claimed_procedures.add(procedure_name)
+
+        return self.__rename_class(
+            code_result_model.class_implementations,
+            self.provisional_class_names[procedure_name],
+            class_to_be_implemented,
+        )
+
+    def finish(self) -> None:
+        """
+        Cancels the pending speculations, waits for the running ones so that no request
+        outlives the generation (their results are discarded) and reports the wasted ones.
+        """
+        if self.executor is None:
+            return
+
+        wasted_procedures = sorted(
+            procedure_name
+            for procedure_name in self.speculations
+            if procedure_name not in self.claimed_procedures
+        )
+        cancelled_count = sum(
+            1
+            for procedure_name in wasted_procedures
+            if self.speculations[procedure_name].cancel()
+        )
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+        self.logger.info(
+            f"Speculative generation: {len(self.claimed_procedures)} of {len(self.speculations)} callees used, "
+            f"{len(wasted_procedures) - cancelled_count} wasted and {cancelled_count} cancelled."
+        )
+        if wasted_procedures:
+            self.logger.info(f"Callees not used by their parent: {wasted_procedures}")
+
+        self.executor = None
+        self.speculations = {}
+        self.provisional_class_names = {}
+        self.claimed_procedures = set()
+
+    def __get_callees(
+        self, entry_point_name: str, calls_by_procedure: dict[str, list[str]]
+    ) -> list[str]:
+        """Returns the callees of the entry point, breadth-first, up to the maximum depth."""
+        callees = []
+        visited = {entry_point_name}
+        level = [entry_point_name]
+        depth = 1
+        while level and depth <= self.max_dependency_depth:
+            next_level = []
+            for procedure_name in level:
+                for callee in calls_by_procedure.get(procedure_name, []):
+                    if callee not in visited:
+                        visited.add(callee)
+                        next_level.append(callee)
+            callees.extend(next_level)
+            level = next_level
+            depth += 1
+        return callees
+
+    def __get_provisional_class_name(self, procedure_name: str) -> str:
+        name_parts = re.split(r"[_\W]+", procedure_name.split(".")[-1])
+        return "".join(part[:1].upper() + part[1:] for part in name_parts) + "Service"
+
+    def __rename_class(
+        self,
+        class_implementations: list[ClassImplementation],
+        provisional_class_name: str,
+        class_name: str,
+    ) -> list[ClassImplementation]:
+        if not class_name or class_name == provisional_class_name:
+            return class_implementations
+
+        # Also renames the interface (I<name>)
+        pattern = re.compile(rf"\b(I?){re.escape(provisional_class_name)}\b")
+
+        def rename(text: str) -> str:
+            return pattern.sub(lambda match: match.group(1) + class_name, text)
+
+        return [
+            class_implementation.model_copy(
+                update={
+                    "name": rename(class_implementation.name),
+                    "content": rename(class_implementation.content),
+                }
+            )
+            for class_implementation in class_implementations
+        ]
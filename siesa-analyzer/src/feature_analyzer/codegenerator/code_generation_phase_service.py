@@ -22,9 +22,14 @@ class CodeGenerationPhaseService(PhaseExecutionInterface):
 
     def execute(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         self.logger.info("➡️ Starting code generation process...")
+        # Entities are generated from the tables definition when it was provided
+        entities_code_generator: StepExecutionInterface = (
+            EntitiesCodeGenerationStepService()
+            if any(table.columns for table in data_wrapper.output_tables_mapping)
+            else EntitiesCodeGenerationFromDiagramStepService()
+        )
         code_generators: list[StepExecutionInterface] = [
-            # EntitiesCodeGenerationStepService(),
-            EntitiesCodeGenerationFromDiagramStepService(),
+            entities_code_generator,
             DbContextCodeGenerationStepService(),
             BusinessCodeGenerationStepService(max_dependency_depth=0),
         ]
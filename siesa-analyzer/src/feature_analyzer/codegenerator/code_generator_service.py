@@ -7,7 +7,6 @@ from prompter.base import ConfigAuthentication
 from feature_analyzer.codegenerator.business.business_regular_code_generator_from_procedure import (
     BusinessRegularCodeGeneratorFromProcedure,
 )
-from generativeai.prompter_factory import PrompterFactory
 from generativeai.prompter_interface import PrompterInterface
 from feature_analyzer.codegenerator.entities.entities_code_generator_from_tables_content import (
     EntitiesCodeGeneratorFromTablesContent,
@@ -1,28 +1,53 @@
 import logging
 from feature_analyzer.models.data_wrapper_model import DataWrapperModel
 from common.feature_toggle import feature_toggle_instance
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_interface import PrompterInterface
+from generativeai.prompter_registry import prompter_registry_instance
 from common.app_config import app_config_instance
 from feature_analyzer.common.step_execution_interface import StepExecutionInterface
+from feature_analyzer.models.database_table_model import DatabaseTableModel
 from feature_analyzer.models.llm_entity_class_result_model import (
     LLMEntityClassResultModel,
 )
-from feature_analyzer.codegenerator.entities.prompts.generate_db_context_prompt import (
-    GenerateDbContextPrompt,
+from feature_analyzer.codegenerator.entities.prompts.generate_db_context_relationships_prompt import (
+    GenerateDbContextRelationshipsPrompt,
+)
+from feature_analyzer.codegenerator.entities.db_context_template_generator import (
+    DbContextTemplateGenerator,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_parser import (
+    MermaidErParser,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErRelationshipModel,
 )
 from opentelemetry.trace import Status, StatusCode
 
 
 class DbContextCodeGenerationStepService(StepExecutionInterface):
+    """
+    Generates the DbContext class from the entities and the consolidated ER diagram. The
+    DbSets and the simple relationships are generated from a template; the LLM only
+    configures the relationships that could not be resolved, when enabled.
+    """
+
     def __init__(self):
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
-            model=app_config_instance.backend_entities_llm_model,
-            use_agent=True,
+        self.db_context_template_generator = DbContextTemplateGenerator(
+            context_name=app_config_instance.backend_dbcontext_class_name,
+            namespace=app_config_instance.backend_dbcontext_namespace,
         )
+        self.mermaid_parser = MermaidErParser()
         self.logger = logging.getLogger(__name__)
         self.max_workers = 10
 
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the step executes."""
+        return prompter_registry_instance.get_prompter(
+            model=app_config_instance.backend_entities_llm_model,
+            use_agent=True,
+        )
+
     def execute(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
             if not feature_toggle_instance.is_backend_dbcontext_code_enabled():
@@ -31,9 +56,10 @@ class DbContextCodeGenerationStepService(StepExecutionInterface):
                 )
                 return data_wrapper
 
-            entities_signature = self.__get_entities_signatures(data_wrapper)
             dbcontext_full_content = self.__generate_dbcontext(
-                entities_signature, data_wrapper.output_database_model_full_content
+                data_wrapper.output_entities_analysis_result,
+                data_wrapper.output_database_model_full_content,
+                data_wrapper.output_tables_mapping,
             )
 
             data_wrapper.output_dbcontext_code_full_content = dbcontext_full_content
@@ -43,7 +69,10 @@ class DbContextCodeGenerationStepService(StepExecutionInterface):
         return data_wrapper
 
     def __generate_dbcontext(
-        self, entities_signature: str, database_model_diagram: str
+        self,
+        entities: list[LLMEntityClassResultModel],
+        database_model_diagram: str,
+        tables: list[DatabaseTableModel],
     ) -> str:
         with app_config_instance.tracer.start_as_current_span(
             "DbContextCodeGeneration",
@@ -52,22 +81,41 @@ class DbContextCodeGenerationStepService(StepExecutionInterface):
             try:
                 span.set_input(
                     value={
-                        "entities_signature": entities_signature,
+                        "entities_signature": self.__get_entities_signatures(entities),
                         "database_model_diagram": database_model_diagram,
                     }
                 )
 
-                prompt = GenerateDbContextPrompt(
-                    entities_signatures=entities_signature,
-                    database_model_diagram=database_model_diagram,
+                diagram = self.mermaid_parser.parse(database_model_diagram or "")
+                configurations, unresolved_relationships = (
+                    self.db_context_template_generator.get_relationship_configurations(
+                        entities, diagram
+                    )
                 )
+                self.logger.info(
+                    f"{len(configurations)} relationships configured from the diagram, {len(unresolved_relationships)} unresolved."
+                )
+
+                if (
+                    unresolved_relationships
+                    and app_config_instance.backend_dbcontext_llm_relationships_enabled
+                ):
+                    configurations.append(
+                        self.__configure_relationships_with_llm(
+                            entities, unresolved_relationships
+                        )
+                    )
 
-                dbcontext_full_content = (
-                    self.prompter.get_content_from_invoke_llm_with_messages(
-                        prompt.get_messages()
+                configurations.extend(
+                    self.db_context_template_generator.get_inherited_column_configurations(
+                        entities, tables or []
                     )
                 )
 
+                dbcontext_full_content = self.db_context_template_generator.generate(
+                    entities, configurations
+                )
+
                 span.set_output(dbcontext_full_content)
                 span.set_status(Status(StatusCode.OK))
 
@@ -76,8 +124,41 @@ class DbContextCodeGenerationStepService(StepExecutionInterface):
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 return None
 
-    def __get_entities_signatures(self, data_wrapper: DataWrapperModel) -> str:
-        entities: list[LLMEntityClassResultModel] = (
-            data_wrapper.output_entities_analysis_result
+    def __configure_relationships_with_llm(
+        self,
+        entities: list[LLMEntityClassResultModel],
+        relationships: list[MermaidErRelationshipModel],
+    ) -> str:
+        """Requests the configuration of the relationships, with only the entities involved."""
+        tables = {
+            table.lower()
+            for relationship in relationships
+            for table in (relationship.first_entity, relationship.second_entity)
+        }
+        involved_entities = [
+            entity
+            for entity in entities
+            if entity.name.lower() in tables
+            or (entity.reference_table or "").lower() in tables
+        ]
+
+        prompt = GenerateDbContextRelationshipsPrompt(
+            entities_content="\n\n".join(entity.content for entity in involved_entities),
+            relationships="\n".join(
+                f"{relationship.first_entity} {relationship.get_notation()} {relationship.second_entity}"
+                for relationship in relationships
+            ),
+        )
+        configuration = self.prompter.get_content_from_invoke_llm_with_messages(
+            prompt.get_messages()
         )
+
+        # The statements may come wrapped in a code block
+        return "\n".join(
+            line
+            for line in configuration.strip().splitlines()
+            if not line.strip().startswith("```")
+        )
+
+    def __get_entities_signatures(self, entities: list[LLMEntityClassResultModel]) -> str:
         return "\n".join([entity.signature for entity in entities])
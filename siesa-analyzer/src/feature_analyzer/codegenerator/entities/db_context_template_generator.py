@@ -0,0 +1,314 @@
+import re
+from typing import Optional
+from feature_analyzer.models.database_table_model import DatabaseTableModel
+from feature_analyzer.models.llm_entity_class_result_model import (
+    LLMEntityClassResultModel,
+)
+from feature_analyzer.codegenerator.entities.entity_class_template_generator import (
+    EntityClassTemplateGenerator,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErDiagramModel,
+    MermaidErEntityModel,
+    MermaidErRelationshipModel,
+)
+
+
+class DbContextTemplateGenerator:
+    """
+    Generates the DbContext class from the entity classes and the relationships of the
+    consolidated ER diagram, without any LLM call.
+
+    One-to-many relationships whose foreign key can be resolved are configured here; the
+    other ones (one-to-one, many-to-many, composite or unresolved keys) are returned as
+    unresolved, to be configured by the LLM when enabled.
+    """
+
+    _column_property_pattern = re.compile(
+        r'\[Column\("(?P<column>[^"]+)"[^\]]*\]\s*(?:\[[^\]]*\]\s*)*'
+        r"public\s+(?:required\s+)?[\w<>\[\],.?]+\s+(?P<property>\w+)\s*\{"
+    )
+    _property_pattern = re.compile(
+        r"public\s+(?:virtual\s+)?(?:required\s+)?[\w<>\[\],.?]+\s+(?P<property>\w+)\s*\{\s*get;"
+    )
+    _navigation_pattern = re.compile(
+        r"\[ForeignKey\(nameof\((?P<foreign_key>\w+)\)\)\]\s*"
+        r"public\s+virtual\s+[\w<>.?]+\s+(?P<navigation>\w+)\s*\{"
+    )
+
+    def __init__(self, context_name: str, namespace: str) -> None:
+        """
+        Initializes the generator.
+
+        Args:
+            context_name (str): Name of the generated DbContext class.
+            namespace (str): Namespace of the generated DbContext class.
+        """
+        self.context_name = context_name
+        self.namespace = namespace
+        self.entity_class_template_generator = EntityClassTemplateGenerator()
+
+    def get_relationship_configurations(
+        self,
+        entities: list[LLMEntityClassResultModel],
+        diagram: MermaidErDiagramModel,
+    ) -> tuple[list[str], list[MermaidErRelationshipModel]]:
+        """
+        Builds the `OnModelCreating` configuration of the relationships between entities.
+
+        Args:
+            entities (list[LLMEntityClassResultModel]): The generated entity classes.
+            diagram (MermaidErDiagramModel): The consolidated ER diagram.
+
+        Returns:
+            tuple[list[str], list[MermaidErRelationshipModel]]: The configuration statements, and the
+                relationships between generated entities that could not be configured deterministically.
+        """
+        entities_by_table = self.__get_entities_by_table(entities)
+        configurations = []
+        unresolved_relationships = []
+
+        for relationship in self.__get_distinct_relationships(diagram):
+            first_entity = entities_by_table.get(relationship.first_entity.lower())
+            second_entity = entities_by_table.get(relationship.second_entity.lower())
+            if first_entity is None or second_entity is None:
+                # Relationships are only mapped between generated entities
+                continue
+
+            configuration = self.__get_one_to_many_configuration(
+                relationship, diagram, first_entity, second_entity
+            )
+            if configuration is None:
+                unresolved_relationships.append(relationship)
+            else:
+                configurations.append(configuration)
+
+        return configurations, unresolved_relationships
+
+    def get_inherited_column_configurations(
+        self,
+        entities: list[LLMEntityClassResultModel],
+        tables: list[DatabaseTableModel],
+    ) -> list[str]:
+        """
+        Builds the `OnModelCreating` configuration of the columns mapped to properties of the
+        entity base class (f0550_id -> Id), whose column names the entity classes cannot set.
+
+        Args:
+            entities (list[LLMEntityClassResultModel]): The generated entity classes.
+            tables (list[DatabaseTableModel]): The tables, with their parsed columns.
+
+        Returns:
+            list[str]: The configuration statements.
+        """
+        tables_by_name = {table.name.lower(): table for table in tables if table.columns}
+        configurations = []
+
+        for entity in entities:
+            table = tables_by_name.get((entity.reference_table or "").lower())
+            if table is None:
+                continue
+
+            mapped_columns = self.__get_column_properties(entity)
+            property_columns = [
+                (property_name, column_name)
+                for property_name, column_name in self.entity_class_template_generator.get_inherited_property_columns(
+                    table
+                ).items()
+                if column_name.lower() not in mapped_columns
+                and column_name.lower() != property_name.lower()
+            ]
+            if not property_columns:
+                continue
+
+            statements = [f"modelBuilder.Entity<{entity.name}>(entity =>", "{"]
+            statements.extend(
+                f'    entity.Property(property => property.{property_name}).HasColumnName("{column_name}");'
+                for property_name, column_name in property_columns
+            )
+            statements.append("});")
+            configurations.append("\n".join(statements))
+
+        return configurations
+
+    def generate(
+        self,
+        entities: list[LLMEntityClassResultModel],
+        model_configurations: list[str],
+    ) -> str:
+        """
+        Generates the DbContext class.
+
+        Args:
+            entities (list[LLMEntityClassResultModel]): The generated entity classes, one DbSet each.
+            model_configurations (list[str]): The statements of the `OnModelCreating` method.
+
+        Returns:
+            str: The DbContext class code.
+        """
+        db_sets = [
+            f"        public DbSet<{entity.name}> {entity.name} {{ get; set; }}"
+            for entity in sorted(entities, key=lambda entity: entity.name)
+        ]
+        configurations = [
+            self.__indent(configuration, "            ")
+            for configuration in model_configurations
+        ]
+
+        lines = [
+            "using Microsoft.EntityFrameworkCore;",
+            "using Siesa.SDK.Backend.Access;",
+            "",
+            f"namespace {self.namespace}",
+            "{",
+            f"    public class {self.context_name} : SDKContext",
+            "    {",
+            f"        public {self.context_name}(DbContextOptions options) : base(options)",
+            "        {",
+            "        }",
+            "",
+            *db_sets,
+            "",
+            "        protected override void OnModelCreating(ModelBuilder modelBuilder)",
+            "        {",
+            "            base.OnModelCreating(modelBuilder);",
+        ]
+        for configuration in configurations:
+            lines.extend(["", configuration])
+        lines.extend(["        }", "    }", "}"])
+
+        return "\n".join(lines)
+
+    def __get_one_to_many_configuration(
+        self,
+        relationship: MermaidErRelationshipModel,
+        diagram: MermaidErDiagramModel,
+        first_entity: LLMEntityClassResultModel,
+        second_entity: LLMEntityClassResultModel,
+    ) -> Optional[str]:
+        if relationship.is_first_entity_many == relationship.is_second_entity_many:
+            # One-to-one and many-to-many need a decision on the principal/join entity
+            return None
+
+        if relationship.is_second_entity_many:
+            principal, dependent = first_entity, second_entity
+            principal_table, dependent_table = (
+                relationship.first_entity,
+                relationship.second_entity,
+            )
+        else:
+            principal, dependent = second_entity, first_entity
+            principal_table, dependent_table = (
+                relationship.second_entity,
+                relationship.first_entity,
+            )
+
+        foreign_key_column = self.__find_foreign_key_column(
+            diagram.entities.get(principal_table), diagram.entities.get(dependent_table)
+        )
+        if foreign_key_column is None:
+            return None
+
+        foreign_key_property = self.__get_column_properties(dependent).get(
+            foreign_key_column.lower()
+        )
+        if foreign_key_property is None:
+            return None
+
+        # The navigation declared for the key, if any, is reused to configure a single relationship
+        navigation = next(
+            (
+                match.group("navigation")
+                for match in self._navigation_pattern.finditer(dependent.content)
+                if match.group("foreign_key") == foreign_key_property
+            ),
+            None,
+        )
+        has_one = (
+            f".HasOne(entity => entity.{navigation})"
+            if navigation
+            else f".HasOne<{principal.name}>()"
+        )
+        return (
+            f"modelBuilder.Entity<{dependent.name}>()\n"
+            f"    {has_one}\n"
+            f"    .WithMany()\n"
+            f"    .HasForeignKey(entity => entity.{foreign_key_property});"
+        )
+
+    def __find_foreign_key_column(
+        self,
+        principal: Optional[MermaidErEntityModel],
+        dependent: Optional[MermaidErEntityModel],
+    ) -> Optional[str]:
+        """
+        Returns the dependent column referencing the principal single-column key. The columns
+        marked FK come first: the one named as the key or, failing that, the only FK column.
+        Otherwise a column named as the key is used, unless it is the dependent's own key.
+        """
+        if principal is None or dependent is None:
+            return None
+
+        primary_keys = [
+            attribute.name
+            for attribute in principal.attributes.values()
+            if "PK" in attribute.keys
+        ]
+        if len(primary_keys) != 1:
+            return None
+        primary_key = primary_keys[0].lower()
+
+        foreign_keys = [
+            attribute.name
+            for attribute in dependent.attributes.values()
+            if "FK" in attribute.keys
+        ]
+        for foreign_key in foreign_keys:
+            if foreign_key.lower() == primary_key:
+                return foreign_key
+        if len(foreign_keys) == 1:
+            return foreign_keys[0]
+        if foreign_keys:
+            return None
+
+        for attribute in dependent.attributes.values():
+            if attribute.name.lower() == primary_key and "PK" not in attribute.keys:
+                return attribute.name
+        return None
+
+    def __get_column_properties(self, entity: LLMEntityClassResultModel) -> dict[str, str]:
+        """Maps the column names (lowercase) of the entity to its property names."""
+        properties = {
+            match.group("property").lower(): match.group("property")
+            for match in self._property_pattern.finditer(entity.content)
+        }
+        properties.update(
+            {
+                match.group("column").lower(): match.group("property")
+                for match in self._column_property_pattern.finditer(entity.content)
+            }
+        )
+        return properties
+
+    def __get_entities_by_table(
+        self, entities: list[LLMEntityClassResultModel]
+    ) -> dict[str, LLMEntityClassResultModel]:
+        # The diagram may use the original table names or the new name convention
+        entities_by_table = {}
+        for entity in entities:
+            entities_by_table[entity.name.lower()] = entity
+            if entity.reference_table:
+                entities_by_table[entity.reference_table.lower()] = entity
+        return entities_by_table
+
+    def __get_distinct_relationships(
+        self, diagram: MermaidErDiagramModel
+    ) -> list[MermaidErRelationshipModel]:
+        relationships = {}
+        for relationship in diagram.relationships:
+            pair = tuple(sorted([relationship.first_entity, relationship.second_entity]))
+            relationships.setdefault(pair, relationship)
+        return list(relationships.values())
+
+    def __indent(self, text: str, prefix: str) -> str:
+        return "\n".join(f"{prefix}{line}" if line.strip() else "" for line in text.splitlines())
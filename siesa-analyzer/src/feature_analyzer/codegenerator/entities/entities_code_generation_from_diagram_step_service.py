@@ -1,23 +1,67 @@
 import logging
-from feature_analyzer.models.data_wrapper_model import DataWrapperModel
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from feature_analyzer.models.data_wrapper_model import (
+    DataWrapperModel,
+    StreamedOutputSection,
+)
+from feature_analyzer.models.llm_entity_class_result_model import (
+    LLMEntityClassResultModel,
+)
 from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
 from common.feature_toggle import feature_toggle_instance
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_interface import PrompterInterface
+from generativeai.prompter_registry import prompter_registry_instance
 from common.app_config import app_config_instance
 from opentelemetry.trace import Status, StatusCode
 from feature_analyzer.common.step_execution_interface import StepExecutionInterface
 from feature_analyzer.codegenerator.entities.prompts.entities_from_diagram_content_prompt import (
     EntitiesFromDiagramContentPrompt,
 )
+from feature_analyzer.codegenerator.entities.er_diagram_partitioner import (
+    ErDiagramPartitioner,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErDiagramModel,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_parser import (
+    MermaidErParser,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_merger import (
+    MermaidErMerger,
+)
+
 
 class EntitiesCodeGenerationFromDiagramStepService(StepExecutionInterface):
+    """
+    Generates the entity classes from the consolidated ER diagram. The diagram is
+    partitioned into clusters of related entities, each generated by its own parallel
+    request with only its neighboring entities as context, and the entities missing from
+    a response are requested again on their own. The entities of each cluster are streamed
+    to the output file as soon as the cluster is generated.
+    """
+
+    _entity_file_pattern = re.compile(
+        r"// START_ENTITY_FILE: (.*?\.cs)\s*(.*?)\s*// END_ENTITY_FILE", re.DOTALL
+    )
+    _class_declaration_pattern = re.compile(r"public\s+class\s+(\w+)\s*:\s*([^\n{]+)")
+    _entity_code_pattern = re.compile(r"^[eE]\d{5}$")
+
     def __init__(self):
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
+        self.mermaid_parser = MermaidErParser()
+        self.partitioner = ErDiagramPartitioner(
+            max_cluster_size=app_config_instance.backend_entities_max_cluster_size
+        )
+        self.max_workers = 10
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the step executes."""
+        return prompter_registry_instance.get_prompter(
             model=app_config_instance.backend_entities_llm_model,
             use_agent=False,
         )
-        self.logger = logging.getLogger(__name__)
 
     def execute(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
@@ -30,17 +74,26 @@ class EntitiesCodeGenerationFromDiagramStepService(StepExecutionInterface):
             if data_wrapper.output_database_model_full_content is None:
                 raise ValueError("Database model diagram is missing.")
 
-            entities_full_content = self._generate_entities(
-                database_model_diagram=data_wrapper.output_database_model_full_content
+            entity_files = self._generate_entities(
+                database_model_diagram=data_wrapper.output_database_model_full_content,
+                output_section=data_wrapper.stream_output_section("entities_code.md"),
             )
 
-            data_wrapper.output_entities_code_full_content = entities_full_content
+            data_wrapper.output_entities_analysis_result = entity_files
+            data_wrapper.write_entity_files(
+                {f"{entity.name}.cs": entity.content for entity in entity_files}
+            )
+            data_wrapper.output_entities_code_full_content = (
+                self.__stitch_entity_files(entity_files)
+            )
         except Exception as error:
             self.logger.error(f"❌ Error on generating the entities classes: {error}.")
 
         return data_wrapper
 
-    def _generate_entities(self, database_model_diagram: str) -> str:
+    def _generate_entities(
+        self, database_model_diagram: str, output_section: StreamedOutputSection
+    ) -> list[LLMEntityClassResultModel]:
         with app_config_instance.tracer.start_as_current_span(
             "EntitiesCodeGeneration",
             openinference_span_kind="chain",
@@ -48,46 +101,152 @@ class EntitiesCodeGenerationFromDiagramStepService(StepExecutionInterface):
             try:
                 span.set_input(value=database_model_diagram)
 
-                self.logger.info(f"Generating entities code from diagram...")
+                diagram = self.mermaid_parser.parse(database_model_diagram)
+                if not diagram.entities:
+                    raise ValueError("No entities could be parsed from the diagram.")
 
-                prompt: AnalyzerPrompt = EntitiesFromDiagramContentPrompt(
-                    database_model_diagram=database_model_diagram,
+                clusters = self.partitioner.partition(diagram)
+                class_names = self.__get_class_names(diagram)
+                self.logger.info(
+                    f"Generating entities code from diagram in {len(clusters)} clusters..."
                 )
 
-                entity_code_result: str = (
-                    self.prompter.get_content_from_invoke_llm_with_messages(
-                        prompt.get_messages()
-                    )
-                )
+                entities: dict[str, LLMEntityClassResultModel] = {}
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = {
+                        executor.submit(
+                            self._process_cluster, diagram, cluster, class_names
+                        ): cluster
+                        for cluster in clusters
+                    }
+
+                    for future in as_completed(futures):
+                        try:
+                            cluster_entities = future.result()
+                            entities.update(cluster_entities)
+                            # Clusters run in parallel, so each one is streamed once complete
+                            output_section.append(
+                                "".join(
+                                    f"{self.__get_entity_block(cluster_entities[table_name])}\n\n"
+                                    for table_name in sorted(cluster_entities)
+                                )
+                            )
+                        except Exception as e:
+                            self.logger.error(
+                                f"❌ Error generating the entities of cluster {futures[future]}: {e}"
+                            )
 
-                self.logger.info(f"✅ Entities code generated.")
+                self.logger.info(
+                    f"✅ {len(entities)} of {len(diagram.entities)} entities code generated."
+                )
 
-                span.set_output(entity_code_result)
+                span.set_output("\n".join(sorted(entities)))
                 span.set_status(Status(StatusCode.OK))
 
-                return entity_code_result
+                return [entities[table_name] for table_name in sorted(entities)]
             except Exception as e:
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 raise
 
-    # def split_entities(llm_output: str) -> dict[str, str]:
-    #     print("Splitting entities from LLM output...")
-        
-    #     # Regex to find the filename and the code for each entity.
-    #     # re.DOTALL is crucial for the `.` to match newline characters.
-    #     pattern = re.compile(r"// START_ENTITY_FILE: (.*?\.cs)\s*(.*?)\s*// END_ENTITY_FILE", re.DOTALL)
-        
-    #     matches = pattern.finditer(llm_output)
-        
-    #     entities = {}
-    #     for match in matches:
-    #         filename = match.group(1).strip()
-    #         csharp_code = match.group(2).strip()
-    #         entities[filename] = csharp_code
-            
-    #     if not entities:
-    #         print("Warning: No entities were found in the LLM output. Please check the delimiters.")
-    #     else:
-    #         print(f"Found {len(entities)} entities to be processed.")
-            
-    #     return entities
\ No newline at end of file
+    def _process_cluster(
+        self,
+        diagram: MermaidErDiagramModel,
+        cluster: list[str],
+        class_names: dict[str, str],
+    ) -> dict[str, LLMEntityClassResultModel]:
+        """Generates the entities of the cluster, retrying once the ones missing from the response."""
+        entities = self.__generate_cluster_entities(diagram, cluster, class_names)
+
+        missing_tables = [table for table in cluster if table not in entities]
+        if missing_tables:
+            self.logger.warning(
+                f"⚠️ Entities missing from the response, requesting them again: {missing_tables}"
+            )
+            entities.update(
+                self.__generate_cluster_entities(diagram, missing_tables, class_names)
+            )
+
+        return entities
+
+    def __generate_cluster_entities(
+        self,
+        diagram: MermaidErDiagramModel,
+        cluster: list[str],
+        class_names: dict[str, str],
+    ) -> dict[str, LLMEntityClassResultModel]:
+        cluster_diagram, context_entities = self.partitioner.get_cluster_diagram(
+            diagram, cluster
+        )
+        diagram_merger = MermaidErMerger()
+        diagram_merger.add(cluster_diagram)
+
+        prompt: AnalyzerPrompt = EntitiesFromDiagramContentPrompt(
+            database_model_diagram=diagram_merger.render(),
+            entities_class_names={
+                table: class_names.get(table, table)
+                for table in [*cluster, *context_entities]
+            },
+            context_entities=context_entities,
+        )
+        entities_content = self.prompter.get_content_from_invoke_llm_with_messages(
+            prompt.get_messages()
+        )
+
+        tables_by_class_name = {class_names.get(table, table): table for table in cluster}
+        entities = {}
+        for entity in self.__split_entities(entities_content):
+            table = tables_by_class_name.get(entity.name)
+            if table is not None:
+                entity.reference_table = table
+                entities[table] = entity
+
+        return entities
+
+    def __split_entities(self, llm_output: str) -> list[LLMEntityClassResultModel]:
+        """Splits the response into one entity per `START_ENTITY_FILE` block."""
+        entities = []
+        for match in self._entity_file_pattern.finditer(llm_output):
+            content = match.group(2).strip()
+            declaration = self._class_declaration_pattern.search(content)
+            name = (
+                declaration.group(1)
+                if declaration
+                else match.group(1).strip().removesuffix(".cs")
+            )
+            base_type = declaration.group(2).strip() if declaration else ""
+            entities.append(
+                LLMEntityClassResultModel(
+                    name=name,
+                    content=content,
+                    signature=f"public {name} : {base_type}",
+                    reference_table="",
+                )
+            )
+        return entities
+
+    def __get_class_names(self, diagram: MermaidErDiagramModel) -> dict[str, str]:
+        """
+        Assigns the class names up front (the same placeholders the prompt describes), so
+        clusters generated in parallel never collide and agree on their navigation types.
+        """
+        class_names = {}
+        for index, table in enumerate(sorted(diagram.entities), start=1):
+            code, _, description = table.partition("_")
+            description = "".join(
+                part[:1].upper() + part[1:] for part in re.split(r"[_\W]+", description)
+            )
+            if self._entity_code_pattern.match(code) and description:
+                # Tables already renamed with the new name convention keep their code
+                class_names[table] = f"E{code[1:]}_{description}"
+            else:
+                name_parts = re.split(r"[_\W]+", table)
+                description = "".join(part[:1].upper() + part[1:] for part in name_parts)
+                class_names[table] = f"EXX{index:03d}_{description}"
+        return class_names
+
+    def __stitch_entity_files(self, entities: list[LLMEntityClassResultModel]) -> str:
+        blocks = [self.__get_entity_block(entity) for entity in entities]
+        return "```csharp\n" + "\n\n".join(blocks) + "\n```"
+
+    def __get_entity_block(self, entity: LLMEntityClassResultModel) -> str:
+        return f"// START_ENTITY_FILE: {entity.name}.cs\n{entity.content}\n// END_ENTITY_FILE"
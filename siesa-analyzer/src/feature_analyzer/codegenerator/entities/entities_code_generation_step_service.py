@@ -1,4 +1,5 @@
 import logging
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from feature_analyzer.models.data_wrapper_model import DataWrapperModel
 from feature_analyzer.models.database_table_model import DatabaseTableModel
@@ -7,26 +8,79 @@ from feature_analyzer.codegenerator.entities.prompts.entities_from_table_content
     EntitiesFromTableContentPrompt,
 )
 from common.feature_toggle import feature_toggle_instance
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_interface import PrompterInterface
+from generativeai.prompter_registry import prompter_registry_instance
 from common.app_config import app_config_instance
 from opentelemetry.trace import Status, StatusCode
 from feature_analyzer.models.llm_entity_class_result_model import (
     LLMEntityClassResultModel,
 )
+from feature_analyzer.models.llm_entities_documentation_result_model import (
+    LLMEntitiesDocumentationResultModel,
+    LLMEntityDocumentationModel,
+)
+from feature_analyzer.codegenerator.entities.prompts.entities_documentation_prompt import (
+    EntitiesDocumentationPrompt,
+)
+from feature_analyzer.codegenerator.entities.entity_class_template_generator import (
+    EntityClassTemplateGenerator,
+)
+from feature_analyzer.codegenerator.entities.prompts.entities_from_tables_content_prompt import (
+    EntitiesFromTablesContentPrompt,
+)
+from feature_analyzer.models.llm_entity_classes_result_model import (
+    LLMEntityClassesResultModel,
+)
+from feature_analyzer.common.token_budget_packer import TokenBudgetPacker
+from feature_analyzer.codegenerator.entities.er_diagram_neighborhood_slicer import (
+    ErDiagramNeighborhoodSlicer,
+)
 from feature_analyzer.common.step_execution_interface import StepExecutionInterface
 
 
 class EntitiesCodeGenerationStepService(StepExecutionInterface):
+    """
+    Generates the entity classes of the tables. Tables whose CREATE TABLE statement could be
+    parsed are generated locally from a template; the LLM is only used for the remaining
+    ones and, optionally, to document the generated classes in batches.
+
+    Each LLM request only carries the neighborhood of its table in the database model
+    diagram (the table and the tables one relationship away), not the whole diagram. Small
+    tables are packed into multi-table requests up to a token budget; the tables missing
+    from a batched response are requested again on their own.
+    """
+
     def __init__(self):
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
+        self.entity_class_template_generator = EntityClassTemplateGenerator()
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = 10
+        self._sliced_diagram_tokens_lock = threading.Lock()
+        self._sliced_diagram_tokens = 0
+
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the step executes."""
+        return prompter_registry_instance.get_prompter(
             model=app_config_instance.backend_entities_llm_model,
             use_agent=True,
+            structured_output_class=LLMEntityClassResultModel,
         )
-        self.logger = logging.getLogger(__name__)
-        self.max_workers = 10
 
-        self.prompter.bind_model(LLMEntityClassResultModel)
+    @property
+    def batch_prompter(self) -> PrompterInterface:
+        return prompter_registry_instance.get_prompter(
+            model=app_config_instance.backend_entities_llm_model,
+            use_agent=False,
+            structured_output_class=LLMEntityClassesResultModel,
+        )
+
+    @property
+    def documentation_prompter(self) -> PrompterInterface:
+        return prompter_registry_instance.get_prompter(
+            model=app_config_instance.backend_entities_llm_model,
+            use_agent=False,
+            structured_output_class=LLMEntitiesDocumentationResultModel,
+        )
 
     def execute(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
@@ -40,6 +94,9 @@ class EntitiesCodeGenerationStepService(StepExecutionInterface):
                 data_wrapper.output_tables_mapping, data_wrapper
             )
             data_wrapper.output_entities_analysis_result = result_list
+            data_wrapper.write_entity_files(
+                {f"{entity.name}.cs": entity.content for entity in result_list}
+            )
 
             entities_full_content = "\n".join(
                 entity_result.content for entity_result in result_list
@@ -54,28 +111,181 @@ class EntitiesCodeGenerationStepService(StepExecutionInterface):
     def _process_tables_content_in_parallel(
         self, tables_mapping: list[DatabaseTableModel], data_wrapper: DataWrapperModel
     ) -> list[LLMEntityClassResultModel]:
-        result_list: list[LLMEntityClassResultModel] = []
+        parsed_tables = [table for table in tables_mapping if table.columns]
+        unparsed_tables = [table for table in tables_mapping if not table.columns]
+
+        documentation = (
+            self._document_tables_in_batches(parsed_tables)
+            if app_config_instance.backend_entities_llm_documentation_enabled
+            else {}
+        )
+        parsed_tables_by_name = {table.name.lower(): table for table in parsed_tables}
+        result_list: list[LLMEntityClassResultModel] = [
+            self.entity_class_template_generator.generate(
+                table, documentation.get(table.name.lower()), parsed_tables_by_name
+            )
+            for table in parsed_tables
+        ]
+        self.logger.info(
+            f"✅ {len(result_list)} entities generated from the tables definition."
+        )
+
+        if not unparsed_tables:
+            return result_list
+
+        diagram_slicer = ErDiagramNeighborhoodSlicer.from_content(
+            data_wrapper.output_database_model_full_content
+        )
+        self._sliced_diagram_tokens = 0
+
+        if app_config_instance.batch_prompt_enabled:
+            packer = TokenBudgetPacker(
+                self.prompter.count_tokens,
+                max_tokens=app_config_instance.batch_prompt_max_tokens,
+                max_items=app_config_instance.batch_prompt_max_items,
+            )
+            batches = packer.pack(unparsed_tables, lambda table: table.content)
+        else:
+            batches = [[table] for table in unparsed_tables]
+        self.logger.info(
+            f"Generating {len(unparsed_tables)} entities with the LLM in {len(batches)} requests..."
+        )
 
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
-                executor.submit(self._process_single_table, table, data_wrapper): table
-                for table in tables_mapping
+                executor.submit(
+                    self._process_tables_batch, batch, data_wrapper, diagram_slicer
+                ): batch
+                for batch in batches
             }
 
             for future in as_completed(futures):
                 try:
-                    result = future.result()
-                    if result:
-                        result_list.append(result)
+                    result_list.extend(future.result())
                 except Exception as e:
                     self.logger.error(
                         f"Error generating entities code from tables content: {e}"
                     )
 
+        self.__log_diagram_tokens_saved(
+            data_wrapper.output_database_model_full_content, len(unparsed_tables)
+        )
+
         return result_list
 
+    def _document_tables_in_batches(
+        self, tables: list[DatabaseTableModel]
+    ) -> dict[str, LLMEntityDocumentationModel]:
+        """Requests the documentation of the tables in parallel batches, keyed by lowercase table name."""
+        batch_size = app_config_instance.backend_entities_documentation_batch_size
+        batches = [
+            tables[index : index + batch_size]
+            for index in range(0, len(tables), batch_size)
+        ]
+        documentation: dict[str, LLMEntityDocumentationModel] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._document_tables_batch, batch): batch
+                for batch in batches
+            }
+
+            for future in as_completed(futures):
+                try:
+                    for entity_documentation in future.result().entities:
+                        documentation[entity_documentation.reference_table.lower()] = (
+                            entity_documentation
+                        )
+                except Exception as e:
+                    # The entities of the batch are generated with the default comments
+                    self.logger.error(f"Error documenting entities: {e}")
+
+        return documentation
+
+    def _document_tables_batch(
+        self, tables: list[DatabaseTableModel]
+    ) -> LLMEntitiesDocumentationResultModel:
+        prompt: AnalyzerPrompt = EntitiesDocumentationPrompt(
+            tables_content="\n\n".join(table.content for table in tables)
+        )
+        return self.documentation_prompter.get_structured_output_from_llm(
+            prompt.get_messages()
+        )
+
+    def _process_tables_batch(
+        self,
+        tables: list[DatabaseTableModel],
+        data_wrapper: DataWrapperModel,
+        diagram_slicer: ErDiagramNeighborhoodSlicer,
+    ) -> list[LLMEntityClassResultModel]:
+        """
+        Generates the entities of a batch of tables with a single request. The tables whose
+        entity is missing from the response, or the whole batch if the request fails, fall
+        back to single-table requests.
+        """
+        results: list[LLMEntityClassResultModel] = []
+        pending_tables = tables
+
+        if len(tables) > 1:
+            with app_config_instance.tracer.start_as_current_span(
+                "EntitiesCodeGenerationBatch",
+                openinference_span_kind="chain",
+            ) as span:
+                try:
+                    span.set_input(value=[table.name for table in tables])
+
+                    prompt: AnalyzerPrompt = EntitiesFromTablesContentPrompt(
+                        tables=tables,
+                        database_model_diagram=self.__get_tables_diagram(
+                            tables,
+                            data_wrapper.output_database_model_full_content,
+                            diagram_slicer,
+                        ),
+                    )
+                    batch_result: LLMEntityClassesResultModel = (
+                        self.batch_prompter.get_structured_output_from_llm(
+                            prompt.get_messages()
+                        )
+                    )
+
+                    entities_by_table = {
+                        (entity.reference_table or "").lower(): entity
+                        for entity in batch_result.entities
+                    }
+                    pending_tables = []
+                    for table in tables:
+                        entity = entities_by_table.get(table.name.lower())
+                        if entity is None or not entity.content:
+                            pending_tables.append(table)
+                        else:
+                            entity.reference_table = table.name
+                            results.append(entity)
+
+                    span.set_output("\n".join(entity.name for entity in results))
+                    span.set_status(Status(StatusCode.OK))
+                except Exception as e:
+                    span.set_status(Status(StatusCode.ERROR, str(e)))
+                    self.logger.warning(
+                        f"⚠️ Error generating the entities of tables {[table.name for table in tables]} in a batch, generating them one by one: {e}"
+                    )
+
+            if pending_tables and len(pending_tables) < len(tables):
+                self.logger.warning(
+                    f"⚠️ Entities missing from the batched response, generating them one by one: {[table.name for table in pending_tables]}"
+                )
+
+        for table in pending_tables:
+            result = self._process_single_table(table, data_wrapper, diagram_slicer)
+            if result:
+                results.append(result)
+
+        return results
+
     def _process_single_table(
-        self, table: DatabaseTableModel, data_wrapper: DataWrapperModel
+        self,
+        table: DatabaseTableModel,
+        data_wrapper: DataWrapperModel,
+        diagram_slicer: ErDiagramNeighborhoodSlicer,
     ) -> LLMEntityClassResultModel:
         with app_config_instance.tracer.start_as_current_span(
             "EntitiesCodeGeneration",
@@ -91,11 +301,14 @@ class EntitiesCodeGenerationStepService(StepExecutionInterface):
 
                 self.logger.info(f"Generating entity code for table: {table.name}")
 
+                database_model_diagram = self.__get_tables_diagram(
+                    [table], data_wrapper.output_database_model_full_content, diagram_slicer
+                )
                 prompt: AnalyzerPrompt = EntitiesFromTableContentPrompt(
                     table_name=table.name,
                     table_content=table.content,
                     table_new_name_convention=table.new_name_convention,
-                    database_model_diagram=data_wrapper.output_database_model_full_content,
+                    database_model_diagram=database_model_diagram,
                 )
 
                 entity_code_result: LLMEntityClassResultModel = (
@@ -111,3 +324,39 @@ class EntitiesCodeGenerationStepService(StepExecutionInterface):
             except Exception as e:
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 return None
+
+    def __get_tables_diagram(
+        self,
+        tables: list[DatabaseTableModel],
+        database_model_diagram: str,
+        diagram_slicer: ErDiagramNeighborhoodSlicer,
+    ) -> str:
+        """Returns the neighborhood of the tables in the diagram, or the whole diagram if none of them is in it."""
+        table_diagram = diagram_slicer.slice(
+            [name for table in tables for name in (table.name, table.new_name_convention)]
+        )
+        if table_diagram is None:
+            self.logger.warning(
+                f"⚠️ Tables {[table.name for table in tables]} not found in the database model diagram, sending the whole diagram."
+            )
+            table_diagram = database_model_diagram or ""
+
+        sliced_tokens = self.prompter.count_tokens(table_diagram)
+        with self._sliced_diagram_tokens_lock:
+            self._sliced_diagram_tokens += sliced_tokens
+
+        return table_diagram
+
+    def __log_diagram_tokens_saved(
+        self, database_model_diagram: str, tables_count: int
+    ) -> None:
+        full_tokens = self.prompter.count_tokens(database_model_diagram or "") * tables_count
+        sliced_tokens = self._sliced_diagram_tokens
+        if full_tokens == 0:
+            return
+
+        saved_tokens = full_tokens - sliced_tokens
+        self.logger.info(
+            f"Diagram slicing sent {sliced_tokens} instead of {full_tokens} diagram tokens "
+            f"for {tables_count} tables ({saved_tokens} tokens saved, {saved_tokens / full_tokens:.0%})."
+        )
@@ -11,7 +11,7 @@ from feature_analyzer.codegenerator.prompts.entities_from_table_content_prompt i
     EntitiesFromTableContentPrompt,
 )
 from feature_analyzer.feature_toggle import feature_toggle_instance
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_registry import prompter_registry_instance
 from feature_analyzer.app_config import app_config_instance
 
 logging.basicConfig(
@@ -21,13 +21,16 @@ logging.basicConfig(
 
 class EntitiesCodeGeneratorFromTablesContent(CodeGeneratorServiceInterface):
     def __init__(self):
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
-            model=app_config_instance.database_diagrams_llm_model,
-        )
         self.logger = logging.getLogger(__name__)
         self.max_workers = 20
 
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the service generates."""
+        return prompter_registry_instance.get_prompter(
+            model=app_config_instance.database_diagrams_llm_model,
+        )
+
     def generate(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
             if (
@@ -0,0 +1,339 @@
+import re
+from typing import Optional
+from feature_analyzer.models.database_table_model import (
+    DatabaseColumnModel,
+    DatabaseTableModel,
+)
+from feature_analyzer.models.llm_entity_class_result_model import (
+    LLMEntityClassResultModel,
+)
+from feature_analyzer.models.llm_entities_documentation_result_model import (
+    LLMEntityDocumentationModel,
+)
+
+
+class EntityClassTemplateGenerator:
+    """
+    Generates the EF Core entity class of a table from its parsed CREATE TABLE statement,
+    following the same coding guidelines given to the LLM (BaseMaster base class, SDK
+    annotations, `required` non-nullable strings), without any LLM call.
+
+    Columns mapped to a property of the base class (f0550_id -> Id) are not redefined; their
+    column names are configured in the DbContext instead. The type of the base `Id` is taken
+    from its column, and an inherited primary key is declared with `[PrimaryKey]`.
+    """
+
+    _base_class = "BaseMaster"
+    _identifier_type = "string"
+    _clr_types = {
+        "BIGINT": "long",
+        "INT": "int",
+        "SMALLINT": "short",
+        "TINYINT": "byte",
+        "BIT": "bool",
+        "DECIMAL": "decimal",
+        "NUMERIC": "decimal",
+        "MONEY": "decimal",
+        "SMALLMONEY": "decimal",
+        "FLOAT": "double",
+        "REAL": "float",
+        "DATE": "DateTime",
+        "DATETIME": "DateTime",
+        "DATETIME2": "DateTime",
+        "SMALLDATETIME": "DateTime",
+        "DATETIMEOFFSET": "DateTimeOffset",
+        "TIME": "TimeSpan",
+        "UNIQUEIDENTIFIER": "Guid",
+        "BINARY": "byte[]",
+        "VARBINARY": "byte[]",
+        "IMAGE": "byte[]",
+        "TIMESTAMP": "byte[]",
+        "ROWVERSION": "byte[]",
+    }
+    # Properties already defined by the base classes, which must not be redefined
+    _base_class_properties = {
+        "Id",
+        "Name",
+        "Description",
+        "Status",
+        "IsPrivate",
+        "RowidAttachment",
+        "Attachment",
+        "CreationDate",
+        "LastUpdateDate",
+        "Source",
+        "RowidUserCreates",
+        "RowidUserLastUpdate",
+        "RowidSession",
+        "RowidUserOwner",
+    }
+    _column_prefix_pattern = re.compile(r"^[a-z]\d+_", re.IGNORECASE)
+
+    def generate(
+        self,
+        table: DatabaseTableModel,
+        documentation: Optional[LLMEntityDocumentationModel] = None,
+        referenced_tables: Optional[dict[str, DatabaseTableModel]] = None,
+    ) -> LLMEntityClassResultModel:
+        """
+        Generates the entity class of the table.
+
+        Args:
+            table (DatabaseTableModel): The table, with its parsed columns.
+            documentation (LLMEntityDocumentationModel, optional): Documentation comments for the class and its properties.
+            referenced_tables (dict[str, DatabaseTableModel], optional): The tables generated as entities, keyed by
+                lowercase name, to add the navigation properties of the foreign keys referencing them.
+
+        Returns:
+            LLMEntityClassResultModel: The entity class, with its signature and reference table.
+        """
+        class_name = self.get_class_name(table)
+        columns_summary = (
+            {
+                column.column_name.lower(): column.summary
+                for column in documentation.columns
+            }
+            if documentation
+            else {}
+        )
+
+        properties = self.__get_properties(table.columns, class_name)
+        navigations = self.__get_navigations(
+            table, class_name, properties, referenced_tables or {}
+        )
+        primary_keys = [
+            property_name
+            for column, property_name in properties
+            if column.is_primary_key
+        ]
+        key_type = next(
+            (
+                self.__get_clr_type(column)
+                for column, _ in properties
+                if column.is_primary_key
+            ),
+            "int",
+        )
+        identifier_type = next(
+            (
+                self.__get_clr_type(column)
+                for column, property_name in properties
+                if property_name == "Id"
+            ),
+            self._identifier_type,
+        )
+        base_class = f"{self._base_class}<{key_type}, {identifier_type}>"
+        signature = f"public {class_name} : {base_class}"
+
+        usings = [
+            "using System;",
+            "using System.ComponentModel.DataAnnotations;",
+            "using System.ComponentModel.DataAnnotations.Schema;",
+            "using Siesa.SDK.Entities;",
+            "using Siesa.SDK.Shared.DataAnnotations;",
+        ]
+        class_attributes = [f'[Table("{table.name}")]']
+        # An inherited key can't be annotated with [Key], it is declared on the class
+        has_class_key = len(primary_keys) > 1 or any(
+            key in self._base_class_properties for key in primary_keys
+        )
+        if has_class_key:
+            usings.insert(3, "using Microsoft.EntityFrameworkCore;")
+            class_attributes.append(
+                f"[PrimaryKey({', '.join(f'nameof({key})' for key in primary_keys)})]"
+            )
+
+        summary = (
+            documentation.summary
+            if documentation
+            else f"Represents the {table.name} table."
+        )
+        lines = [
+            *usings,
+            "",
+            "/// <summary>",
+            f"/// {summary}",
+            "/// </summary>",
+            *class_attributes,
+            f"public class {class_name} : {base_class}",
+            "{",
+        ]
+        declared_properties = [
+            (column, property_name)
+            for column, property_name in properties
+            if property_name not in self._base_class_properties
+        ]
+        for index, (column, property_name) in enumerate(declared_properties):
+            if index > 0:
+                lines.append("")
+            lines.extend(
+                self.__get_property_lines(
+                    column,
+                    property_name,
+                    is_single_key=column.is_primary_key and not has_class_key,
+                    summary=columns_summary.get(column.name.lower()),
+                )
+            )
+        for navigation_name, referenced_class_name, foreign_key_properties in navigations:
+            foreign_key = (
+                f"nameof({foreign_key_properties[0]})"
+                if len(foreign_key_properties) == 1
+                else f'"{",".join(foreign_key_properties)}"'
+            )
+            lines.extend(
+                [
+                    "",
+                    f"    [ForeignKey({foreign_key})]",
+                    f"    public virtual {referenced_class_name}? {navigation_name} {{ get; set; }}",
+                ]
+            )
+        lines.append("}")
+
+        return LLMEntityClassResultModel(
+            name=class_name,
+            content="\n".join(lines),
+            signature=signature,
+            reference_table=table.name,
+        )
+
+    def get_class_name(self, table: DatabaseTableModel) -> str:
+        """
+        Returns the entity class name, from the new name convention of the table when it has
+        one (e77540_empleados -> E77540_Empleados), or from the table name otherwise.
+        """
+        name = table.new_name_convention or table.name
+        code, _, description = name.partition("_")
+        if not description:
+            return self.__to_pascal_case(code)
+        return f"{code[:1].upper()}{code[1:]}_{self.__to_pascal_case(description)}"
+
+    def get_inherited_property_columns(self, table: DatabaseTableModel) -> dict[str, str]:
+        """
+        Returns the columns mapped to properties of the base class, which the entity class
+        does not redefine, keyed by property name.
+        """
+        return {
+            property_name: column.name
+            for column, property_name in self.__get_properties(
+                table.columns, self.get_class_name(table)
+            )
+            if property_name in self._base_class_properties
+        }
+
+    def __get_properties(
+        self, columns: list[DatabaseColumnModel], class_name: str
+    ) -> list[tuple[DatabaseColumnModel, str]]:
+        """
+        Returns the columns mapped as properties along with their property names, including
+        the first column mapped to each property of the base class.
+        """
+        properties = []
+        used_names = set()
+
+        for column in columns:
+            # f0550_id_cia -> IdCia
+            property_name = self.__to_pascal_case(
+                self._column_prefix_pattern.sub("", column.name)
+            )
+            if not property_name or not (
+                property_name[0].isalpha() or property_name[0] == "_"
+            ):
+                property_name = f"_{property_name}"
+            if property_name == class_name:
+                property_name = f"{property_name}Value"
+
+            unique_name = property_name
+            suffix = 2
+            while unique_name in used_names:
+                unique_name = f"{property_name}{suffix}"
+                suffix += 1
+
+            used_names.add(unique_name)
+            properties.append((column, unique_name))
+
+        return properties
+
+    def __get_navigations(
+        self,
+        table: DatabaseTableModel,
+        class_name: str,
+        properties: list[tuple[DatabaseColumnModel, str]],
+        referenced_tables: dict[str, DatabaseTableModel],
+    ) -> list[tuple[str, str, list[str]]]:
+        """
+        Returns the navigation properties of the foreign keys referencing generated entities:
+        their names, the referenced class names and the foreign key property names.
+        """
+        property_names = {column.name.lower(): name for column, name in properties}
+        used_names = {class_name, *self._base_class_properties, *property_names.values()}
+        referenced_counts: dict[str, int] = {}
+        for foreign_key in table.foreign_keys:
+            referenced_table = foreign_key.referenced_table.lower()
+            referenced_counts[referenced_table] = referenced_counts.get(referenced_table, 0) + 1
+
+        navigations = []
+        for foreign_key in table.foreign_keys:
+            referenced_table = referenced_tables.get(foreign_key.referenced_table.lower())
+            foreign_key_properties = [
+                property_names.get(column_name.lower())
+                for column_name in foreign_key.column_names
+            ]
+            if referenced_table is None or None in foreign_key_properties:
+                continue
+
+            referenced_class_name = self.get_class_name(referenced_table)
+            # Several foreign keys to the same table are told apart by their columns
+            navigation_name = (
+                referenced_class_name
+                if referenced_counts[foreign_key.referenced_table.lower()] == 1
+                else f"{referenced_class_name}{''.join(foreign_key_properties)}"
+            )
+            unique_name = navigation_name
+            suffix = 2
+            while unique_name in used_names:
+                unique_name = f"{navigation_name}{suffix}"
+                suffix += 1
+
+            used_names.add(unique_name)
+            navigations.append((unique_name, referenced_class_name, foreign_key_properties))
+
+        return navigations
+
+    def __get_property_lines(
+        self,
+        column: DatabaseColumnModel,
+        property_name: str,
+        is_single_key: bool,
+        summary: Optional[str],
+    ) -> list[str]:
+        clr_type = self.__get_clr_type(column)
+        is_string = clr_type == "string"
+        lines = []
+
+        if summary:
+            lines.extend(["    /// <summary>", f"    /// {summary}", "    /// </summary>"])
+        if is_single_key:
+            lines.append("    [Key]")
+        if not column.is_nullable:
+            lines.append("    [SDKRequired]")
+        if is_string and column.length is not None and column.length > 0:
+            lines.append(f"    [SDKStringLength({column.length})]")
+        if column.precision is not None and column.scale is not None:
+            type_name = f"{column.data_type.lower()}({column.precision},{column.scale})"
+            lines.append(f'    [Column("{column.name}", TypeName = "{type_name}")]')
+        else:
+            lines.append(f'    [Column("{column.name}")]')
+
+        modifier = "required " if is_string and not column.is_nullable else ""
+        nullable = "?" if column.is_nullable else ""
+        lines.append(
+            f"    public {modifier}{clr_type}{nullable} {property_name} {{ get; set; }}"
+        )
+        return lines
+
+    def __get_clr_type(self, column: DatabaseColumnModel) -> str:
+        # Character, text and xml types, as well as unknown ones, are mapped as strings
+        return self._clr_types.get(column.data_type, "string")
+
+    def __to_pascal_case(self, text: str) -> str:
+        return "".join(part[:1].upper() + part[1:] for part in re.split(r"[_\s]+", text))
@@ -0,0 +1,114 @@
+from typing import Optional
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErAttributeModel,
+    MermaidErDiagramModel,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_parser import (
+    MermaidErParser,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_merger import (
+    MermaidErMerger,
+)
+
+
+class ErDiagramNeighborhoodSlicer:
+    """
+    Extracts the neighborhood of some entities from an ER diagram: the entities themselves
+    with all their attributes, the entities one relationship away with only their keys, and
+    the relationships involving the entities. Requests about a few tables then carry only
+    the relevant part of the consolidated diagram instead of the whole schema.
+    """
+
+    def __init__(self, diagram: MermaidErDiagramModel = None) -> None:
+        """
+        Initializes the slicer.
+
+        Args:
+            diagram (MermaidErDiagramModel): The consolidated ER diagram, when it is sliced by table name.
+        """
+        self.diagram = diagram or MermaidErDiagramModel()
+        self.entity_names = {
+            self.__normalize_entity_name(name): name for name in self.diagram.entities
+        }
+
+    @classmethod
+    def from_content(cls, diagram_content: str) -> "ErDiagramNeighborhoodSlicer":
+        """Creates the slicer of a Mermaid ER diagram content."""
+        return cls(MermaidErParser().parse(diagram_content or ""))
+
+    def slice(self, table_names: list[str]) -> Optional[str]:
+        """
+        Renders the neighborhood of the tables, which may be referenced by their original
+        name or their new name convention.
+
+        Args:
+            table_names (list[str]): The names of the tables.
+
+        Returns:
+            Optional[str]: The Mermaid diagram of the neighborhood, or None if none of the tables is in the diagram.
+        """
+        entity_names = []
+        for table_name in table_names:
+            if not table_name:
+                continue
+            entity_name = self.entity_names.get(self.__normalize_entity_name(table_name))
+            if entity_name is not None and entity_name not in entity_names:
+                entity_names.append(entity_name)
+
+        if not entity_names:
+            return None
+
+        neighborhood, _ = self.get_neighborhood(self.diagram, entity_names)
+        diagram_merger = MermaidErMerger()
+        diagram_merger.add(neighborhood)
+        return diagram_merger.render()
+
+    def get_neighborhood(
+        self, diagram: MermaidErDiagramModel, entity_names: list[str]
+    ) -> tuple[MermaidErDiagramModel, list[str]]:
+        """
+        Builds the one-hop neighborhood of the entities.
+
+        Args:
+            diagram (MermaidErDiagramModel): The ER diagram.
+            entity_names (list[str]): The names of the entities, as they appear in the diagram.
+
+        Returns:
+            tuple[MermaidErDiagramModel, list[str]]: The neighborhood diagram and the neighboring entity names.
+        """
+        names = set(entity_names)
+        neighborhood = MermaidErDiagramModel()
+        neighbor_names: list[str] = []
+
+        for entity_name in entity_names:
+            neighborhood.entities[entity_name] = diagram.entities[entity_name]
+
+        for relationship in diagram.relationships:
+            relationship_names = {relationship.first_entity, relationship.second_entity}
+            if not relationship_names & names:
+                continue
+
+            neighborhood.relationships.append(relationship)
+            for name in sorted(relationship_names - names):
+                if name in neighborhood.entities:
+                    continue
+
+                neighbor_names.append(name)
+                neighbor = neighborhood.get_or_add_entity(name)
+                source_entity = diagram.entities.get(name)
+                if source_entity is None:
+                    continue
+                neighbor.attributes = {
+                    attribute.name: MermaidErAttributeModel(
+                        data_type=attribute.data_type,
+                        name=attribute.name,
+                        keys=attribute.keys,
+                    )
+                    for attribute in source_entity.attributes.values()
+                    if attribute.keys
+                }
+
+        return neighborhood, neighbor_names
+
+    def __normalize_entity_name(self, name: str) -> str:
+        return name.split(".")[-1].strip("[]").lower()
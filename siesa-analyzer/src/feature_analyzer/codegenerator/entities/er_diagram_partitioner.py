@@ -0,0 +1,121 @@
+from collections import deque
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErDiagramModel,
+)
+from feature_analyzer.codegenerator.entities.er_diagram_neighborhood_slicer import (
+    ErDiagramNeighborhoodSlicer,
+)
+
+
+class ErDiagramPartitioner:
+    """
+    Partitions an ER diagram into clusters of related entities, so each cluster can be
+    generated by its own (parallel) request.
+
+    Clusters are the connected components of the relationship graph. Components larger
+    than the maximum size are cut in breadth-first order, which keeps related entities
+    together, and small components are packed together to avoid tiny requests.
+    """
+
+    def __init__(self, max_cluster_size: int = 15) -> None:
+        """
+        Initializes the partitioner.
+
+        Args:
+            max_cluster_size (int): Maximum number of entities generated by a single request.
+        """
+        self.max_cluster_size = max(1, max_cluster_size)
+        self.neighborhood_slicer = ErDiagramNeighborhoodSlicer()
+
+    def partition(self, diagram: MermaidErDiagramModel) -> list[list[str]]:
+        """
+        Partitions the entities of the diagram.
+
+        Args:
+            diagram (MermaidErDiagramModel): The consolidated ER diagram.
+
+        Returns:
+            list[list[str]]: The entity names of each cluster, in a deterministic order.
+        """
+        neighbors = self.__get_neighbors(diagram)
+        clusters: list[list[str]] = []
+        small_components: list[list[str]] = []
+        visited: set[str] = set()
+
+        for entity_name in sorted(diagram.entities):
+            if entity_name in visited:
+                continue
+
+            component = self.__get_component(entity_name, neighbors, visited)
+            if len(component) >= self.max_cluster_size:
+                clusters.extend(
+                    component[index : index + self.max_cluster_size]
+                    for index in range(0, len(component), self.max_cluster_size)
+                )
+            else:
+                small_components.append(component)
+
+        # First-fit decreasing packing of the components that fit in a single cluster
+        packed_clusters: list[list[str]] = []
+        for component in sorted(small_components, key=len, reverse=True):
+            cluster = next(
+                (
+                    cluster
+                    for cluster in packed_clusters
+                    if len(cluster) + len(component) <= self.max_cluster_size
+                ),
+                None,
+            )
+            if cluster is None:
+                packed_clusters.append(list(component))
+            else:
+                cluster.extend(component)
+
+        return clusters + packed_clusters
+
+    def get_cluster_diagram(
+        self, diagram: MermaidErDiagramModel, cluster: list[str]
+    ) -> tuple[MermaidErDiagramModel, list[str]]:
+        """
+        Builds the diagram sent for a cluster: its entities with all their attributes, the
+        neighboring entities with only their keys (as context for the relationships), and
+        the relationships involving the cluster.
+
+        Args:
+            diagram (MermaidErDiagramModel): The consolidated ER diagram.
+            cluster (list[str]): The entity names of the cluster.
+
+        Returns:
+            tuple[MermaidErDiagramModel, list[str]]: The cluster diagram and the neighboring entity names.
+        """
+        return self.neighborhood_slicer.get_neighborhood(diagram, cluster)
+
+    def __get_neighbors(self, diagram: MermaidErDiagramModel) -> dict[str, set[str]]:
+        neighbors: dict[str, set[str]] = {name: set() for name in diagram.entities}
+        for relationship in diagram.relationships:
+            if (
+                relationship.first_entity in neighbors
+                and relationship.second_entity in neighbors
+                and relationship.first_entity != relationship.second_entity
+            ):
+                neighbors[relationship.first_entity].add(relationship.second_entity)
+                neighbors[relationship.second_entity].add(relationship.first_entity)
+        return neighbors
+
+    def __get_component(
+        self, start: str, neighbors: dict[str, set[str]], visited: set[str]
+    ) -> list[str]:
+        """Returns the connected component of the entity, in breadth-first order."""
+        component = []
+        queue = deque([start])
+        visited.add(start)
+
+        while queue:
+            entity_name = queue.popleft()
+            component.append(entity_name)
+            for neighbor in sorted(neighbors[entity_name]):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+
+        return component
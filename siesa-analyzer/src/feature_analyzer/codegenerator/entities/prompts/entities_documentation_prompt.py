@@ -0,0 +1,35 @@
+from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+
+
+class EntitiesDocumentationPrompt(AnalyzerPrompt):
+    def __init__(self, tables_content: str) -> None:
+        self.tables_content = tables_content
+
+    def get_system_message(self) -> str:
+        return """
+        You are a Database Architect with deep knowledge of ERP systems (payroll, accounting, inventory, human resources). Your objective is to document the business meaning of database tables and columns whose names are abbreviated, often in Spanish.
+
+        Important:
+        - Write the documentation in English, as short and precise sentences.
+        - Don't make assumptions that are not supported by the table and column names.
+        """
+
+    def get_user_message(self) -> str:
+        return f"""
+        We are generating the C# entity classes that map the following database tables. The code is generated automatically, we only need its documentation comments.
+
+        ```sql
+        {self.tables_content}
+        ```
+
+        For each table, provide:
+        - A summary of one or two sentences describing what the table represents.
+        - A one-line summary for the columns whose meaning is not obvious from their name. Skip the obvious ones (e.g. ids, names, dates of creation).
+        """
+
+    def get_messages(self) -> list[BaseMessage]:
+        return [
+            SystemMessage(content=self.get_system_message()),
+            HumanMessage(content=self.get_user_message()),
+        ]
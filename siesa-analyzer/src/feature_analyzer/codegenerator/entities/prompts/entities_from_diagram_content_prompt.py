@@ -10,8 +10,12 @@ class EntitiesFromDiagramContentPrompt(AnalyzerPrompt):
     def __init__(
         self,
         database_model_diagram: str,
+        entities_class_names: dict[str, str] = None,
+        context_entities: list[str] = None,
     ) -> None:
         self.database_model_diagram = database_model_diagram
+        self.entities_class_names = entities_class_names
+        self.context_entities = context_entities or []
 
     def get_system_message(self) -> str:
         return """
@@ -26,7 +30,7 @@ class EntitiesFromDiagramContentPrompt(AnalyzerPrompt):
         ```mermaid
         {self.database_model_diagram}
         ```
-
+        {self.__get_scope_instructions()}
         ## OUTPUT FORMAT
         Your output **must** be a single block of C# code. You **must** wrap each entity class (including its `using` statements) within unique start and end delimiters. This is critical for automated file splitting.
         Use the following format for each entity:
@@ -77,6 +81,27 @@ class EntitiesFromDiagramContentPrompt(AnalyzerPrompt):
             HumanMessage(content=self.get_user_message()),
         ]
 
+    def __get_scope_instructions(self) -> str:
+        if not self.entities_class_names:
+            return ""
+
+        context_entities = set(self.context_entities)
+        class_names = "\n".join(
+            f"        | {table_name} | {class_name} |"
+            for table_name, class_name in self.entities_class_names.items()
+        )
+        return f"""
+        ## SCOPE
+        The diagram is a part of a larger model. Generate entity classes **only** for the tables below, using exactly the given class names (they replace the naming convention placeholders):
+        {", ".join(table for table in self.entities_class_names if table not in context_entities)}
+
+        The tables {", ".join(self.context_entities) or "(none)"} are included only as context for the relationships: **do not** generate them, but use their class names for the navigation properties.
+
+        | Table | Class name |
+        |-------|------------|
+{class_names}
+        """
+
     def __get_base_classes_definitions(self) -> str:
         # No changes needed here, the original was good.
         return """
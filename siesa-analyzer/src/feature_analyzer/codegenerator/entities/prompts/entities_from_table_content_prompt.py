@@ -42,7 +42,7 @@ class EntitiesFromTableContentPrompt(AnalyzerPrompt):
         }
 
         Strictly follow the example below:
-        {self.__get_entity_example()}
+        {self._get_entity_example()}
 
         Coding Guidelines:
         - The entity should inherit from the BaseMaster base class.
@@ -55,7 +55,7 @@ class EntitiesFromTableContentPrompt(AnalyzerPrompt):
         -- ForeignKey: To define foreign key relationships when applicable.
 
         Here you have the base classes definitions:
-        {self.__get_base_classes_definitions()}
+        {self._get_base_classes_definitions()}
 
         The relationship between the entities should be clearly defined, including any foreign key relationships defined in the database model diagram:
         ```mermaid
@@ -78,7 +78,7 @@ class EntitiesFromTableContentPrompt(AnalyzerPrompt):
             HumanMessage(content=self.get_user_message()),
         ]
 
-    def __get_base_classes_definitions(self) -> str:
+    def _get_base_classes_definitions(self) -> str:
         return """
         ```csharp
         using System;
@@ -191,7 +191,7 @@ class EntitiesFromTableContentPrompt(AnalyzerPrompt):
         ```
         """
 
-    def __get_entity_example(self) -> str:
+    def _get_entity_example(self) -> str:
         return """
         ```csharp
         using System.ComponentModel.DataAnnotations;
@@ -0,0 +1,73 @@
+from feature_analyzer.models.database_table_model import DatabaseTableModel
+from feature_analyzer.codegenerator.entities.prompts.entities_from_table_content_prompt import (
+    EntitiesFromTableContentPrompt,
+)
+
+
+class EntitiesFromTablesContentPrompt(EntitiesFromTableContentPrompt):
+    """Batched variant of `EntitiesFromTableContentPrompt`: one entity per table of the batch."""
+
+    def __init__(
+        self,
+        tables: list[DatabaseTableModel],
+        database_model_diagram: str,
+    ) -> None:
+        super().__init__(
+            table_name=", ".join(table.name for table in tables),
+            table_content="\n\n".join(table.content for table in tables),
+            database_model_diagram=database_model_diagram,
+        )
+        self.tables = tables
+
+    def get_user_message(self) -> str:
+        return f"""
+        We are modernizing an legacy application from Java to .NET C#. For the new application, we need to generate the Entities. The Entities are responsible for representing the database tables in the new application using Entity Framework Core.
+
+        These are the database tables that need to be mapped as Entities, one Entity per table:
+        ```sql
+        {self.table_content}
+        ```
+
+        Provide the Entity implementation of each table, that represents and modernizes it.
+
+        {self.__get_tables_new_names()}
+
+        Strictly follow the example below:
+        {self._get_entity_example()}
+
+        Coding Guidelines:
+        - The entity should inherit from the BaseMaster base class.
+        - The names of the entities are defined with an initial letter that describes their role and a 5-digit code where the first two define the service code and the remaining ones a unique code (example: E30010_Client).
+        - Properties that are already defined in the base classes should not be redefined (ignore them), specially the audit properties (CreationDate, LastUpdateDate, CreationUser, LastUpdateUser, etc).
+        - Add the `required` modifier to string properties that are not nullable.
+        - Use the annotations:
+        -- SDKRequired: For database required fields.
+        -- SDKStringLength: To defined the max length of varchar columns.
+        -- ForeignKey: To define foreign key relationships when applicable.
+
+        Here you have the base classes definitions:
+        {self._get_base_classes_definitions()}
+
+        The relationship between the entities should be clearly defined, including any foreign key relationships defined in the database model diagram:
+        ```mermaid
+        {self.database_model_diagram}
+        ```
+
+        Provide a **complete entity class implementation** for every table, without summarizing or truncating the response.
+
+        Important:
+        - Return exactly one entity per table, with the original table name as its reference table.
+        - To provide the relationship between the entities, only include the relevant foreign keys of each entity.
+        - Don't make assumptions, provide the full entity implementation of the classes.
+        - Don't add any additional comments or explanations, just provide the code implementation.
+        """
+
+    def __get_tables_new_names(self) -> str:
+        new_names = "\n".join(
+            f"        - {table.name}: {table.new_name_convention}"
+            for table in self.tables
+            if table.new_name_convention is not None
+        )
+        if not new_names:
+            return ""
+        return f"The new names of the entities should be (follow the code guidelines):\n{new_names}"
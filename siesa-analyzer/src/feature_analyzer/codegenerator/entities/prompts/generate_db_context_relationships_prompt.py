@@ -0,0 +1,45 @@
+from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+
+
+class GenerateDbContextRelationshipsPrompt(AnalyzerPrompt):
+    def __init__(self, entities_content: str, relationships: str) -> None:
+        self.entities_content = entities_content
+        self.relationships = relationships
+
+    def get_system_message(self) -> str:
+        return """
+            You are a highly skilled C# developer with over many years of experience in software development. You are proficient in .NET framework, Entity Framework Core and its Fluent API, and have a deep understanding of relational database modeling.
+
+            Important:
+            - Don't make assumptions that are not supported by the entities and the relationships provided.
+            - Include only code, without explanations.
+            """
+
+    def get_user_message(self) -> str:
+        return f"""
+            We are generating the Entity Framework DbContext of an application. The DbSet properties and the simple one-to-many relationships are already generated, you only need to configure the relationships below, which could not be resolved automatically (one-to-one, many-to-many, composite or ambiguous foreign keys).
+
+            Relationships to configure (Mermaid ER syntax, using the table names):
+            ```
+            {self.relationships}
+            ```
+
+            Entities involved (the `Table` annotation gives the table of each entity and the `Column` annotations the column of each property):
+            ```csharp
+            {self.entities_content}
+            ```
+
+            Provide only the statements to add to the `OnModelCreating(ModelBuilder modelBuilder)` method, using the `modelBuilder` Fluent API (e.g. `modelBuilder.Entity<A>().HasOne<B>().WithOne().HasForeignKey<A>(a => a.RowidB);`).
+
+            Important:
+            - Don't include the method signature, the class or any using directives.
+            - Don't configure a relationship if the foreign key properties cannot be identified in the entities.
+            - Don't add any additional comments or explanations, just provide the code implementation.
+        """
+
+    def get_messages(self) -> list[BaseMessage]:
+        return [
+            SystemMessage(content=self.get_system_message()),
+            HumanMessage(content=self.get_user_message()),
+        ]
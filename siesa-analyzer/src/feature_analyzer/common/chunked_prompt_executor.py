@@ -0,0 +1,96 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
+from feature_analyzer.common.hierarchical_reduce_engine import (
+    HierarchicalReduceEngine,
+)
+from feature_analyzer.preparation.procedure_content_chunker import (
+    ProcedureContentChunker,
+)
+from generativeai.llm_token_budget import TokenBudgetExceededError
+from generativeai.prompter_interface import PrompterInterface
+
+
+class ChunkedPromptExecutor:
+    """
+    Runs a prompt built around a (procedure) content, checking the token budget of the model
+    first. When the prompt does not fit, the content is split at statement boundaries, the
+    chunks are processed in parallel (map) and the partial results are merged (reduce), so
+    no request that is guaranteed to fail is ever sent.
+    """
+
+    def __init__(
+        self, prompter: PrompterInterface, max_workers: int = 5, max_fan_in: int = 8
+    ):
+        self.prompter = prompter
+        self.chunker = ProcedureContentChunker(prompter.count_tokens)
+        self.reduce_engine = HierarchicalReduceEngine(
+            prompter, max_fan_in=max_fan_in, max_workers=max_workers, separator="\n\n"
+        )
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+
+    def execute(
+        self,
+        content: str,
+        create_prompt: Callable[[str], AnalyzerPrompt],
+        create_reduce_prompt: Optional[Callable[[str], AnalyzerPrompt]],
+        content_name: str,
+    ) -> str:
+        """
+        Executes the prompt for the content, using map-reduce when it is oversized.
+
+        Args:
+            content (str): The content the prompt is built around.
+            create_prompt (Callable[[str], AnalyzerPrompt]): Builds the prompt for a content (or a chunk of it).
+            create_reduce_prompt (Callable[[str], AnalyzerPrompt], optional): Builds the prompt merging the concatenated
+                partial results. When None, the partial results are just concatenated (e.g. lists of lines).
+            content_name (str): Name used in the logs (e.g. the procedure name).
+
+        Returns:
+            str: The result of the prompt, or the merged result of the chunks.
+        """
+        prompt_budget = self.prompter.get_prompt_token_budget()
+        prompt = create_prompt(content)
+
+        if self.prompter.estimate_tokens(prompt.get_messages()) <= prompt_budget:
+            return self.__invoke(prompt)
+
+        prompt_overhead = self.prompter.estimate_tokens(create_prompt("").get_messages())
+        # Leaves room for the part label added to each chunk
+        chunk_budget = prompt_budget - prompt_overhead - 50
+        if chunk_budget <= 0:
+            raise TokenBudgetExceededError(
+                f"The prompt template for {content_name} alone exceeds the budget of {prompt_budget} tokens."
+            )
+
+        chunks = self.chunker.split_content(content, chunk_budget)
+        self.logger.info(
+            f"Content of {content_name} exceeds the model budget, processing it in {len(chunks)} chunks..."
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            partial_results = list(
+                executor.map(
+                    lambda chunk: self.__invoke(create_prompt(chunk)),
+                    self.__label_chunks(chunks, content_name),
+                )
+            )
+
+        if create_reduce_prompt is None:
+            return "\n".join(partial_results)
+
+        return self.reduce_engine.reduce(partial_results, create_reduce_prompt)
+
+    def __label_chunks(self, chunks: list[str], content_name: str) -> list[str]:
+        # The model is told each chunk is only a part of the whole content
+        return [
+            f"-- Part {index} of {len(chunks)} of the content of {content_name} --\n{chunk}"
+            for index, chunk in enumerate(chunks, start=1)
+        ]
+
+    def __invoke(self, prompt: AnalyzerPrompt) -> str:
+        return self.prompter.get_content_from_invoke_llm_with_messages(
+            prompt.get_messages()
+        )
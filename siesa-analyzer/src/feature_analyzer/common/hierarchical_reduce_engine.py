@@ -0,0 +1,136 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
+from generativeai.prompter_interface import PrompterInterface
+
+
+class HierarchicalReduceEngine:
+    """
+    Merges many partial results (diagrams, use case documents...) with a parallel tree of
+    LLM reduce calls instead of one giant prompt.
+
+    On each level the items are packed, in order, into groups bounded by the prompt token
+    budget and by the fan-in; the groups are reduced concurrently and their results form
+    the next level, until a single group is left for the final reduce.
+    """
+
+    def __init__(
+        self,
+        prompter: PrompterInterface,
+        max_fan_in: int = 8,
+        max_workers: int = 5,
+        separator: str = "\n\n\n",
+    ):
+        """
+        Initializes the engine.
+
+        Args:
+            prompter (PrompterInterface): The prompter used for the reduce calls.
+            max_fan_in (int): Maximum number of items merged by a single reduce call.
+            max_workers (int): Number of reduce calls running concurrently.
+            separator (str): Separator used to concatenate the items of a group.
+        """
+        self.prompter = prompter
+        self.max_fan_in = max(2, max_fan_in)
+        self.max_workers = max_workers
+        self.separator = separator
+        self.logger = logging.getLogger(__name__)
+
+    def reduce(
+        self,
+        items: list[str],
+        create_reduce_prompt: Callable[[str], AnalyzerPrompt],
+        final_invoke: Optional[Callable[[AnalyzerPrompt], str]] = None,
+    ) -> str:
+        """
+        Reduces the items to a single result.
+
+        Args:
+            items (list[str]): The partial results to merge.
+            create_reduce_prompt (Callable[[str], AnalyzerPrompt]): Builds the reduce prompt for concatenated items.
+            final_invoke (Callable[[AnalyzerPrompt], str], optional): Runs the final reduce prompt, e.g. streaming it.
+                Defaults to a regular invocation.
+
+        Returns:
+            str: The merged result.
+        """
+        items = [item for item in items if item]
+        group_budget = self.__get_group_budget(create_reduce_prompt)
+        level = 1
+
+        while True:
+            groups = self.__pack_groups(items, group_budget)
+            if len(groups) == 1:
+                break
+
+            if all(len(group) == 1 for group in groups):
+                # Every item alone already fills the budget, so they cannot be merged further
+                self.logger.warning(
+                    f"⚠️ {len(items)} items are too large to be reduced together, concatenating them."
+                )
+                return self.separator.join(items)
+
+            self.logger.info(
+                f"Reduce level {level}: merging {len(items)} items in {len(groups)} groups..."
+            )
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                items = list(
+                    executor.map(
+                        lambda group: self.__reduce_group(group, create_reduce_prompt),
+                        groups,
+                    )
+                )
+            level += 1
+
+        final_prompt = create_reduce_prompt(self.separator.join(groups[0]) if groups else "")
+        if final_invoke is not None:
+            return final_invoke(final_prompt)
+
+        return self.__invoke(final_prompt)
+
+    def __reduce_group(
+        self, group: list[str], create_reduce_prompt: Callable[[str], AnalyzerPrompt]
+    ) -> str:
+        # A group with a single item has nothing to merge, it moves to the next level as is
+        if len(group) == 1:
+            return group[0]
+
+        return self.__invoke(create_reduce_prompt(self.separator.join(group)))
+
+    def __pack_groups(self, items: list[str], group_budget: int) -> list[list[str]]:
+        """Packs the items, in order, into groups bounded by the token budget and the fan-in."""
+        groups: list[list[str]] = []
+        current_group: list[str] = []
+        current_tokens = 0
+
+        for item in items:
+            item_tokens = self.prompter.count_tokens(item + self.separator)
+            if current_group and (
+                current_tokens + item_tokens > group_budget
+                or len(current_group) >= self.max_fan_in
+            ):
+                groups.append(current_group)
+                current_group = []
+                current_tokens = 0
+
+            current_group.append(item)
+            current_tokens += item_tokens
+
+        if current_group or not groups:
+            groups.append(current_group)
+
+        return groups
+
+    def __get_group_budget(
+        self, create_reduce_prompt: Callable[[str], AnalyzerPrompt]
+    ) -> int:
+        prompt_overhead = self.prompter.estimate_tokens(
+            create_reduce_prompt("").get_messages()
+        )
+        return self.prompter.get_prompt_token_budget() - prompt_overhead
+
+    def __invoke(self, prompt: AnalyzerPrompt) -> str:
+        return self.prompter.get_content_from_invoke_llm_with_messages(
+            prompt.get_messages()
+        )
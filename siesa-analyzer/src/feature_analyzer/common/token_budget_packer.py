@@ -0,0 +1,67 @@
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBudgetPacker(Generic[T]):
+    """
+    Packs small items (tables, procedures...) into batches bounded by a token budget and a
+    maximum number of items, so they can be sent together in a single multi-item prompt
+    instead of paying the fixed overhead of a request per item.
+
+    Items are packed first-fit decreasing: the largest ones are placed first, each in the
+    first batch with room left. Items larger than the budget end up alone in their batch.
+    """
+
+    def __init__(
+        self, count_tokens: Callable[[str], int], max_tokens: int, max_items: int = 10
+    ) -> None:
+        """
+        Initializes the packer.
+
+        Args:
+            count_tokens (Callable[[str], int]): Counts the tokens of a content for the target model.
+            max_tokens (int): Maximum tokens of the contents of a batch.
+            max_items (int): Maximum number of items of a batch.
+        """
+        self.count_tokens = count_tokens
+        self.max_tokens = max_tokens
+        self.max_items = max(1, max_items)
+
+    def pack(self, items: list[T], get_content: Callable[[T], str]) -> list[list[T]]:
+        """
+        Packs the items into batches.
+
+        Args:
+            items (list[T]): The items to pack.
+            get_content (Callable[[T], str]): Returns the content of an item sent in the prompt.
+
+        Returns:
+            list[list[T]]: The batches, each one keeping the original order of its items.
+        """
+        indexed_tokens = [
+            (index, self.count_tokens(get_content(item) or ""))
+            for index, item in enumerate(items)
+        ]
+        indexed_tokens.sort(key=lambda index_tokens: index_tokens[1], reverse=True)
+
+        batches: list[list[int]] = []
+        batches_tokens: list[int] = []
+        for index, tokens in indexed_tokens:
+            batch_index = next(
+                (
+                    batch_index
+                    for batch_index, batch in enumerate(batches)
+                    if len(batch) < self.max_items
+                    and batches_tokens[batch_index] + tokens <= self.max_tokens
+                ),
+                None,
+            )
+            if batch_index is None:
+                batches.append([index])
+                batches_tokens.append(tokens)
+            else:
+                batches[batch_index].append(index)
+                batches_tokens[batch_index] += tokens
+
+        return [[items[index] for index in sorted(batch)] for batch in batches]
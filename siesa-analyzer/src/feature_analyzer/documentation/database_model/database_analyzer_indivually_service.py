@@ -20,7 +20,8 @@ from feature_analyzer.feature_toggle import feature_toggle_instance
 from feature_analyzer.documentation.database_model.prompts.database_consolidate_diagrams_prompt import (
     DatabaseConsolidateDiagramsPrompt,
 )
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_interface import PrompterInterface
+from generativeai.prompter_registry import prompter_registry_instance
 from feature_analyzer.app_config import app_config_instance
 
 
@@ -40,22 +41,21 @@ class DatabaseAnalyzerIndivuallyService(AnalyzeServiceInterface):
     def __init__(self):
         """
         Initializes the DatabaseAnalyzerIndivuallyService.
-
-        Args:
-            config_auth (ConfigAuthentication): Authentication configuration for the Prompter.
-            model (str): The name of the language model to use for generating Mermaid representations.
         """
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
-            model=app_config_instance.database_diagrams_llm_model,
-            use_agent=True,
-        )
         self.max_workers = 20  # Number of threads for parallel processing
         self.logger = logging.getLogger(__name__)
         self.max_dependency_depth = (
             20  # Maximum recursion depth for procedure dependencies
         )
 
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the service analyzes."""
+        return prompter_registry_instance.get_prompter(
+            model=app_config_instance.database_diagrams_llm_model,
+            use_agent=True,
+        )
+
     def analyze(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         """
         Analyzes the database procedures starting from the entry point.
@@ -0,0 +1,154 @@
+from feature_analyzer.models.database_table_model import (
+    DatabaseColumnModel,
+    DatabaseTableModel,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErAttributeModel,
+    MermaidErDiagramModel,
+    MermaidErEntityModel,
+    MermaidErRelationshipModel,
+)
+
+
+class DatabaseErSkeletonGenerator:
+    """
+    Builds the Mermaid ER entity blocks of a procedure deterministically from the parsed
+    CREATE TABLE statements, so the LLM only has to infer the relationships between them.
+    Table names are matched case-insensitively, without schema or brackets.
+    """
+
+    def __init__(self, tables: list[DatabaseTableModel]) -> None:
+        """
+        Initializes the generator.
+
+        Args:
+            tables (list[DatabaseTableModel]): The tables parsed from the DDL, with their columns.
+        """
+        self.tables_by_name = {
+            MermaidErEntityModel.normalize_name(table.name): table
+            for table in tables
+            if table.columns
+        }
+
+    def find_tables(self, table_names: list[str]) -> list[DatabaseTableModel]:
+        """Returns the tables with a DDL definition among the given names, in order and without duplicates."""
+        tables = {}
+        for table_name in table_names:
+            table = self.tables_by_name.get(
+                MermaidErEntityModel.normalize_name(table_name)
+            )
+            if table is not None:
+                tables.setdefault(table.name, table)
+        return list(tables.values())
+
+    def find_missing_tables(self, table_names: list[str]) -> list[str]:
+        """Returns the given names without a DDL definition, in order and without duplicates."""
+        return list(
+            dict.fromkeys(
+                table_name
+                for table_name in table_names
+                if MermaidErEntityModel.normalize_name(table_name)
+                not in self.tables_by_name
+            )
+        )
+
+    def apply(
+        self, diagram: MermaidErDiagramModel, tables: list[DatabaseTableModel]
+    ) -> MermaidErDiagramModel:
+        """
+        Replaces the entities of the diagram defined by the tables with their DDL columns, and
+        renames them and their relationships after the tables. The other entities are kept.
+
+        Args:
+            diagram (MermaidErDiagramModel): The diagram generated for the procedure.
+            tables (list[DatabaseTableModel]): The tables of the procedure with a DDL definition.
+
+        Returns:
+            MermaidErDiagramModel: The diagram with the DDL entities.
+        """
+        skeleton = self.generate(tables)
+        table_names = {
+            MermaidErEntityModel.normalize_name(table_name): table_name
+            for table_name in skeleton.entities
+        }
+
+        def get_name(entity_name: str) -> str:
+            return table_names.get(
+                MermaidErEntityModel.normalize_name(entity_name), entity_name
+            )
+
+        for entity in diagram.entities.values():
+            if get_name(entity.name) not in skeleton.entities:
+                skeleton.entities.setdefault(entity.name, entity)
+        for relationship in diagram.relationships:
+            relationship.first_entity = get_name(relationship.first_entity)
+            relationship.second_entity = get_name(relationship.second_entity)
+            skeleton.relationships.append(relationship)
+        skeleton.errors = diagram.errors
+
+        return skeleton
+
+    def generate(self, tables: list[DatabaseTableModel]) -> MermaidErDiagramModel:
+        """
+        Generates the diagram with one entity per table and all of its columns, and the
+        relationships of the single-column foreign keys between the tables.
+
+        Args:
+            tables (list[DatabaseTableModel]): The tables referenced by the procedure.
+
+        Returns:
+            MermaidErDiagramModel: The diagram.
+        """
+        diagram = MermaidErDiagramModel()
+        table_names = {
+            MermaidErEntityModel.normalize_name(table.name): table.name for table in tables
+        }
+        for table in tables:
+            foreign_keys = {
+                foreign_key.column_names[0].lower(): foreign_key
+                for foreign_key in table.foreign_keys
+                if len(foreign_key.column_names) == 1
+            }
+            entity = diagram.get_or_add_entity(table.name)
+            for column in table.columns:
+                foreign_key = foreign_keys.get(column.name.lower())
+                keys = ["PK"] if column.is_primary_key else []
+                if foreign_key is not None:
+                    keys.append("FK")
+                entity.attributes[column.name] = MermaidErAttributeModel(
+                    data_type=self.__format_data_type(column),
+                    name=column.name,
+                    keys=keys,
+                )
+
+                referenced_table = (
+                    table_names.get(
+                        MermaidErEntityModel.normalize_name(foreign_key.referenced_table)
+                    )
+                    if foreign_key is not None
+                    else None
+                )
+                if referenced_table is not None:
+                    diagram.relationships.append(
+                        MermaidErRelationshipModel(
+                            first_entity=referenced_table,
+                            second_entity=table.name,
+                            left_cardinality="|o" if column.is_nullable else "||",
+                            right_cardinality="o{",
+                            label=column.name,
+                            foreign_key=column.name,
+                        )
+                    )
+        return diagram
+
+    def __format_data_type(self, column: DatabaseColumnModel) -> str:
+        # Same format the LLM is asked for: TYPE(PRECISION-SCALE), TYPE(LENGTH)
+        if column.precision is not None and column.scale is not None:
+            return f"{column.data_type}({column.precision}-{column.scale})"
+        if column.precision is not None:
+            return f"{column.data_type}({column.precision})"
+        if column.length == -1:
+            return f"{column.data_type}(MAX)"
+        if column.length is not None:
+            return f"{column.data_type}({column.length})"
+        return column.data_type
@@ -13,9 +13,40 @@ from common.feature_toggle import feature_toggle_instance
 from feature_analyzer.documentation.database_model.prompts.database_consolidate_diagrams_prompt import (
     DatabaseConsolidateDiagramsPrompt,
 )
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_interface import PrompterInterface
+from generativeai.prompter_registry import prompter_registry_instance
 from common.app_config import app_config_instance
 from feature_analyzer.common.step_execution_interface import StepExecutionInterface
+from feature_analyzer.common.chunked_prompt_executor import ChunkedPromptExecutor
+from feature_analyzer.documentation.database_model.prompts.database_fix_mermaid_prompt import (
+    DatabaseFixMermaidPrompt,
+)
+from feature_analyzer.documentation.database_model.prompts.database_generate_relationships_prompt import (
+    DatabaseGenerateRelationshipsPrompt,
+)
+from feature_analyzer.documentation.database_model.database_er_skeleton_generator import (
+    DatabaseErSkeletonGenerator,
+)
+from feature_analyzer.models.database_table_model import DatabaseTableModel
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErDiagramModel,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_parser import (
+    MermaidErParser,
+)
+from feature_analyzer.documentation.database_model.mermaid_er_merger import (
+    MermaidErMerger,
+)
+from feature_analyzer.documentation.database_model.prompts.database_generate_mermaid_batch_prompt import (
+    DatabaseGenerateMermaidBatchPrompt,
+)
+from feature_analyzer.documentation.database_model.prompts.database_generate_relationships_batch_prompt import (
+    DatabaseGenerateRelationshipsBatchPrompt,
+)
+from feature_analyzer.models.llm_procedure_diagrams_result_model import (
+    LLMProcedureDiagramsResultModel,
+)
+from feature_analyzer.common.token_budget_packer import TokenBudgetPacker
 from opentelemetry.trace import Status, StatusCode
 
 
@@ -24,13 +55,35 @@ class DatabaseModelStepService(StepExecutionInterface):
         """
         Initializes the DatabaseAnalyzerIndivuallyService.
         """
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
+        self.mermaid_parser = MermaidErParser()
+        self.er_skeleton_generator = DatabaseErSkeletonGenerator([])
+        self._chunked_prompt_executor = None
+        self.max_workers = 10  # Number of threads for parallel processing
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the step executes."""
+        return prompter_registry_instance.get_prompter(
             model=app_config_instance.database_diagrams_llm_model,
             use_agent=False,
         )
-        self.max_workers = 10  # Number of threads for parallel processing
-        self.logger = logging.getLogger(__name__)
+
+    @property
+    def batch_prompter(self) -> PrompterInterface:
+        return prompter_registry_instance.get_prompter(
+            model=app_config_instance.database_diagrams_llm_model,
+            use_agent=False,
+            structured_output_class=LLMProcedureDiagramsResultModel,
+        )
+
+    @property
+    def chunked_prompt_executor(self) -> ChunkedPromptExecutor:
+        if self._chunked_prompt_executor is None:
+            self._chunked_prompt_executor = ChunkedPromptExecutor(
+                self.prompter, max_fan_in=app_config_instance.consolidation_max_fan_in
+            )
+        return self._chunked_prompt_executor
 
     def execute(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
@@ -42,18 +95,20 @@ class DatabaseModelStepService(StepExecutionInterface):
                 procedure_content_mapping = (
                     data_wrapper.output_procedure_analysis_result
                 )
+                self.er_skeleton_generator = DatabaseErSkeletonGenerator(
+                    data_wrapper.output_tables_mapping
+                )
 
-                self.logger.info("Generating mermaid diagrams in parallel...")
-                self._process_procedure_content_in_parallel(procedure_content_mapping)
-                self.logger.info("Mermaid diagrams generated based on the procedures.")
-
+                # Each diagram is merged locally as soon as its procedure is processed
                 self.logger.info(
-                    "Consolidating all diagrams as single representation..."
+                    "Generating mermaid diagrams in parallel and consolidating them..."
                 )
-                consolidated_diagram = self._consolidate_diagram_representations(
-                    procedure_content_mapping
+                diagram_merger = MermaidErMerger()
+                self._process_procedure_content_in_parallel(
+                    procedure_content_mapping, diagram_merger
                 )
-                self.logger.info("Consolidation finished.")
+                consolidated_diagram = diagram_merger.render()
+                self.logger.info("Mermaid diagrams generated and consolidated.")
 
                 self.logger.info(
                     "Applying the new name convention to the consolidated diagram..."
@@ -91,44 +146,167 @@ class DatabaseModelStepService(StepExecutionInterface):
 
         return updated_diagram
 
-    def _consolidate_diagram_representations(
-        self, procedures_mapping: list[ProcedureAnalysisResultModel]
-    ) -> str:
-        concatenated_diagrams = (
-            "\n\n\n".join(
-                [
-                    f"{result.procedure_name}\n{result.llm_mermaid_representation}"
-                    for result in procedures_mapping
-                    if result.llm_mermaid_representation
-                ]
-            )
-            if procedures_mapping
-            else ""
-        )
-
-        prompt = DatabaseConsolidateDiagramsPrompt(concatenated_diagrams)
-        return self.prompter.get_content_from_invoke_llm_with_messages(
-            prompt.get_messages()
-        )
-
     def _process_procedure_content_in_parallel(
-        self, procedures_mapping: list[ProcedureAnalysisResultModel]
+        self,
+        procedures_mapping: list[ProcedureAnalysisResultModel],
+        diagram_merger: MermaidErMerger,
     ) -> None:
+        batches = self.__pack_procedures(procedures_mapping)
+        self.logger.info(
+            f"Generating the diagrams of {len(procedures_mapping)} procedures in {len(batches)} requests..."
+        )
+
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             futures = {
-                executor.submit(self._process_single_procedure, procedure): procedure
-                for procedure in procedures_mapping
+                executor.submit(self._process_procedures_batch, batch): batch
+                for batch in batches
             }
 
             for future in as_completed(futures):
                 try:
-                    future.result()
+                    for diagram in future.result():
+                        diagram_merger.add(diagram)
                 except Exception as e:
                     self.logger.error(f"❌ Error processing procedure: {e}")
 
+    def __pack_procedures(
+        self, procedures: list[ProcedureAnalysisResultModel]
+    ) -> list[list[ProcedureAnalysisResultModel]]:
+        """
+        Packs the small procedures into batches up to the token budget. Procedures whose
+        tables all have a DDL (only their relationships are requested) and the other ones are
+        packed apart, as they use different prompts.
+        """
+        if not app_config_instance.batch_prompt_enabled:
+            return [[procedure] for procedure in procedures]
+
+        packer = TokenBudgetPacker(
+            self.prompter.count_tokens,
+            max_tokens=app_config_instance.batch_prompt_max_tokens,
+            max_items=app_config_instance.batch_prompt_max_items,
+        )
+        skeleton_procedures = []
+        full_procedures = []
+        for procedure in procedures:
+            if self.__has_all_tables(procedure):
+                skeleton_procedures.append(procedure)
+            else:
+                full_procedures.append(procedure)
+
+        return [
+            *packer.pack(full_procedures, lambda procedure: procedure.procedure_orignal_content),
+            *packer.pack(
+                skeleton_procedures, lambda procedure: procedure.procedure_orignal_content
+            ),
+        ]
+
+    def _process_procedures_batch(
+        self, procedures: list[ProcedureAnalysisResultModel]
+    ) -> list[MermaidErDiagramModel]:
+        """
+        Generates the diagrams of a batch of procedures with a single request. The procedures
+        missing from the response, or the whole batch if the request fails, fall back to
+        single-procedure requests.
+        """
+        if len(procedures) == 1:
+            return [self._process_single_procedure(procedures[0])]
+
+        diagrams: list[MermaidErDiagramModel] = []
+        pending_procedures = procedures
+        tables_by_procedure = {
+            procedure.procedure_name: self.er_skeleton_generator.find_tables(
+                procedure.table_names
+            )
+            for procedure in procedures
+        }
+        is_skeleton_batch = all(
+            self.__has_all_tables(procedure) for procedure in procedures
+        )
+
+        with app_config_instance.tracer.start_as_current_span(
+            "DatabaseModelFromProceduresBatchGeneration",
+            openinference_span_kind="chain",
+        ) as span:
+            try:
+                span.set_input(
+                    value=[procedure.procedure_name for procedure in procedures]
+                )
+
+                if is_skeleton_batch:
+                    prompt = DatabaseGenerateRelationshipsBatchPrompt(
+                        procedures=procedures,
+                        table_names_by_procedure={
+                            name: [table.name for table in tables]
+                            for name, tables in tables_by_procedure.items()
+                        },
+                    )
+                else:
+                    prompt = DatabaseGenerateMermaidBatchPrompt(procedures=procedures)
+
+                batch_result: LLMProcedureDiagramsResultModel = (
+                    self.batch_prompter.get_structured_output_from_llm(
+                        prompt.get_messages()
+                    )
+                )
+                representations = {
+                    result.procedure_name.lower(): result.mermaid_representation
+                    for result in batch_result.diagrams
+                }
+
+                pending_procedures = []
+                for procedure in procedures:
+                    representation = representations.get(
+                        procedure.procedure_name.lower()
+                    )
+                    if representation is None or (
+                        not is_skeleton_batch and not representation.strip()
+                    ):
+                        pending_procedures.append(procedure)
+                        continue
+
+                    if is_skeleton_batch:
+                        mermaid_representation, diagram = self._build_from_skeleton(
+                            procedure,
+                            tables_by_procedure[procedure.procedure_name],
+                            representation,
+                        )
+                    else:
+                        mermaid_representation, diagram = self._build_full_diagram(
+                            procedure,
+                            representation,
+                            tables_by_procedure[procedure.procedure_name],
+                        )
+                    procedure.llm_mermaid_representation = mermaid_representation
+                    procedure.mermaid_syntax_errors = diagram.errors
+                    diagrams.append(diagram)
+
+                span.set_output(
+                    "\n".join(
+                        procedure.procedure_name
+                        for procedure in procedures
+                        if procedure not in pending_procedures
+                    )
+                )
+                span.set_status(Status(StatusCode.OK))
+            except Exception as e:
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+                self.logger.warning(
+                    f"⚠️ Error generating the diagrams of procedures {[procedure.procedure_name for procedure in procedures]} in a batch, generating them one by one: {e}"
+                )
+
+        for procedure in pending_procedures:
+            try:
+                diagrams.append(self._process_single_procedure(procedure))
+            except Exception as e:
+                self.logger.error(
+                    f"❌ Error processing procedure {procedure.procedure_name}: {e}"
+                )
+
+        return diagrams
+
     def _process_single_procedure(
         self, procedure_analysis_result: ProcedureAnalysisResultModel
-    ) -> None:
+    ) -> MermaidErDiagramModel:
         with app_config_instance.tracer.start_as_current_span(
             "DatabaseModelFromProcedureGeneration",
             openinference_span_kind="chain",
@@ -145,26 +323,165 @@ class DatabaseModelStepService(StepExecutionInterface):
                     f"Generating mermaid representation for procedure: {procedure_analysis_result.procedure_name}"
                 )
 
-                prompt = DatabaseGenerateMermaidPrompt(
-                    procedure_content=procedure_analysis_result.procedure_orignal_content
+                # With the DDL of all its tables, only the relationships are requested
+                tables = self.er_skeleton_generator.find_tables(
+                    procedure_analysis_result.table_names
                 )
-
-                mermaid_representation = (
-                    self.prompter.get_content_from_invoke_llm_with_messages(
-                        prompt.get_messages()
+                if self.__has_all_tables(procedure_analysis_result):
+                    mermaid_representation, diagram = self._generate_from_skeleton(
+                        procedure_analysis_result, tables
+                    )
+                else:
+                    mermaid_representation, diagram = self._generate_full_diagram(
+                        procedure_analysis_result, tables
                     )
-                )
 
                 procedure_analysis_result.llm_mermaid_representation = (
                     mermaid_representation
                 )
+                procedure_analysis_result.mermaid_syntax_errors = diagram.errors
                 self.logger.info(
                     f"✅ Mermaid representation generated for procedure: {procedure_analysis_result.procedure_name}"
                 )
 
                 span.set_output(mermaid_representation)
                 span.set_status(Status(StatusCode.OK))
+                return diagram
 
             except Exception as e:
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 raise
+
+    def _generate_full_diagram(
+        self,
+        procedure_analysis_result: ProcedureAnalysisResultModel,
+        tables: list[DatabaseTableModel],
+    ) -> tuple[str, MermaidErDiagramModel]:
+        # Oversized procedures are split and their partial diagrams consolidated
+        mermaid_representation = self.chunked_prompt_executor.execute(
+            content=procedure_analysis_result.procedure_orignal_content,
+            create_prompt=lambda content: DatabaseGenerateMermaidPrompt(
+                procedure_content=content,
+                callees_summary=procedure_analysis_result.callees_summary,
+            ),
+            create_reduce_prompt=DatabaseConsolidateDiagramsPrompt,
+            content_name=procedure_analysis_result.procedure_name,
+        )
+
+        return self._build_full_diagram(
+            procedure_analysis_result, mermaid_representation, tables
+        )
+
+    def _build_full_diagram(
+        self,
+        procedure_analysis_result: ProcedureAnalysisResultModel,
+        mermaid_representation: str,
+        tables: list[DatabaseTableModel],
+    ) -> tuple[str, MermaidErDiagramModel]:
+        diagram = self.mermaid_parser.parse(mermaid_representation)
+        if not diagram.is_valid:
+            mermaid_representation, diagram = self._fix_mermaid_representation(
+                procedure_analysis_result.procedure_name,
+                mermaid_representation,
+                diagram,
+            )
+        if not tables:
+            return mermaid_representation, diagram
+
+        # The tables with a DDL take its columns, the other entities are kept as generated
+        diagram = self.er_skeleton_generator.apply(diagram, tables)
+        diagram_merger = MermaidErMerger()
+        diagram_merger.add(diagram)
+        return diagram_merger.render(), diagram
+
+    def _generate_from_skeleton(
+        self,
+        procedure_analysis_result: ProcedureAnalysisResultModel,
+        tables: list[DatabaseTableModel],
+    ) -> tuple[str, MermaidErDiagramModel]:
+        """
+        Builds the entities of the diagram from the DDL and asks the LLM only for the
+        relationship lines, which are a fraction of the output tokens of a full diagram.
+        """
+        table_names = [table.name for table in tables]
+        # Oversized procedures are split and their relationship lines concatenated
+        relationships = self.chunked_prompt_executor.execute(
+            content=procedure_analysis_result.procedure_orignal_content,
+            create_prompt=lambda content: DatabaseGenerateRelationshipsPrompt(
+                procedure_content=content,
+                table_names=table_names,
+                callees_summary=procedure_analysis_result.callees_summary,
+            ),
+            create_reduce_prompt=None,
+            content_name=procedure_analysis_result.procedure_name,
+        )
+
+        return self._build_from_skeleton(procedure_analysis_result, tables, relationships)
+
+    def _build_from_skeleton(
+        self,
+        procedure_analysis_result: ProcedureAnalysisResultModel,
+        tables: list[DatabaseTableModel],
+        relationships: str,
+    ) -> tuple[str, MermaidErDiagramModel]:
+        relationships_representation = self.__as_er_diagram(relationships)
+        diagram = self.mermaid_parser.parse(relationships_representation)
+        if not diagram.is_valid:
+            _, diagram = self._fix_mermaid_representation(
+                procedure_analysis_result.procedure_name,
+                relationships_representation,
+                diagram,
+            )
+
+        # The columns always come from the DDL, whatever the LLM returned for them
+        diagram = self.er_skeleton_generator.apply(diagram, tables)
+
+        diagram_merger = MermaidErMerger()
+        diagram_merger.add(diagram)
+        return diagram_merger.render(), diagram
+
+    def __has_all_tables(self, procedure: ProcedureAnalysisResultModel) -> bool:
+        return bool(
+            self.er_skeleton_generator.find_tables(procedure.table_names)
+        ) and not self.er_skeleton_generator.find_missing_tables(procedure.table_names)
+
+    def __as_er_diagram(self, relationships: str) -> str:
+        # The relationship lines may come with or without fences and header
+        lines = [
+            line
+            for line in relationships.splitlines()
+            if not line.strip().startswith("```")
+            and line.strip().lower() != "erdiagram"
+        ]
+        return "\n".join(["erDiagram", *lines])
+
+    def _fix_mermaid_representation(
+        self,
+        procedure_name: str,
+        mermaid_representation: str,
+        diagram: MermaidErDiagramModel,
+    ) -> tuple[str, MermaidErDiagramModel]:
+        """
+        Re-requests an invalid diagram with only its syntax errors, which is much cheaper
+        than generating it again from the procedure. When the fixed diagram is still
+        invalid, the valid part of the original one is kept.
+        """
+        self.logger.warning(
+            f"⚠️ Invalid mermaid representation for procedure {procedure_name}, requesting a fix: {diagram.errors}"
+        )
+        prompt = DatabaseFixMermaidPrompt(
+            mermaid_representation=mermaid_representation,
+            syntax_errors=diagram.errors,
+        )
+        fixed_representation = self.prompter.get_content_from_invoke_llm_with_messages(
+            prompt.get_messages()
+        )
+        fixed_diagram = self.mermaid_parser.parse(fixed_representation)
+
+        if fixed_diagram.is_valid:
+            return fixed_representation, fixed_diagram
+
+        self.logger.warning(
+            f"⚠️ The mermaid representation for procedure {procedure_name} is still invalid, skipping the invalid lines: {fixed_diagram.errors}"
+        )
+        return mermaid_representation, diagram
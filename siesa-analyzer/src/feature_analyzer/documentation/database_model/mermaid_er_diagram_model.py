@@ -0,0 +1,125 @@
+class MermaidErAttributeModel:
+    """
+    Represents a column of an entity in a Mermaid ER diagram:
+    `<data_type> <name> [PK, FK, UK] ["comment"]`.
+    """
+
+    data_type: str
+    name: str
+    keys: list[str]
+    comment: str
+
+    def __init__(
+        self,
+        data_type: str,
+        name: str,
+        keys: list[str] = None,
+        comment: str = "",
+    ) -> None:
+        self.data_type = data_type
+        self.name = name
+        self.keys = keys or []
+        self.comment = comment
+
+
+class MermaidErEntityModel:
+    """
+    Represents an entity (table) of a Mermaid ER diagram with its attributes, keyed by
+    their name.
+    """
+
+    name: str
+    attributes: dict[str, MermaidErAttributeModel]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.attributes = {}
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """
+        Returns the name entities are compared by: T-SQL identifiers are case-insensitive,
+        and tables may be referenced with their schema or brackets.
+        """
+        return name.split(".")[-1].strip("[]").lower()
+
+
+class MermaidErRelationshipModel:
+    """
+    Represents a relationship statement of a Mermaid ER diagram:
+    `<first_entity> <left_cardinality><line><right_cardinality> <second_entity> : <label>`.
+    The foreign key column is not part of the syntax, it is only known for the relationships
+    built from the table definitions.
+    """
+
+    first_entity: str
+    second_entity: str
+    left_cardinality: str
+    right_cardinality: str
+    line: str
+    label: str
+    foreign_key: str
+
+    def __init__(
+        self,
+        first_entity: str,
+        second_entity: str,
+        left_cardinality: str,
+        right_cardinality: str,
+        line: str = "--",
+        label: str = "",
+        foreign_key: str = "",
+    ) -> None:
+        self.first_entity = first_entity
+        self.second_entity = second_entity
+        self.left_cardinality = left_cardinality
+        self.right_cardinality = right_cardinality
+        self.line = line
+        self.label = label
+        self.foreign_key = foreign_key
+
+    def get_notation(self) -> str:
+        """Returns the relationship notation, e.g. `||--o{` or `only one to zero or more`."""
+        if self.line in ("--", ".."):
+            return f"{self.left_cardinality}{self.line}{self.right_cardinality}"
+        # Word cardinalities are separated by spaces
+        return f"{self.left_cardinality} {self.line} {self.right_cardinality}"
+
+    @property
+    def is_first_entity_many(self) -> bool:
+        return self.__is_many(self.left_cardinality)
+
+    @property
+    def is_second_entity_many(self) -> bool:
+        return self.__is_many(self.right_cardinality)
+
+    def __is_many(self, cardinality: str) -> bool:
+        # Symbols (}o, }|, o{, |{) and aliases (zero or more, one or many, 1+, many(0)...)
+        return any(marker in cardinality.lower() for marker in ("{", "}", "more", "many", "+"))
+
+
+class MermaidErDiagramModel:
+    """
+    Represents a parsed Mermaid `erDiagram`, along with the syntax errors found while
+    parsing it (the invalid lines are left out of the model).
+    """
+
+    entities: dict[str, MermaidErEntityModel]
+    relationships: list[MermaidErRelationshipModel]
+    errors: list[str]
+
+    def __init__(self) -> None:
+        self.entities = {}
+        self.relationships = []
+        self.errors = []
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def get_or_add_entity(self, name: str) -> MermaidErEntityModel:
+        entity = self.entities.get(name)
+        if entity is None:
+            entity = MermaidErEntityModel(name)
+            self.entities[name] = entity
+        return entity
@@ -0,0 +1,300 @@
+import re
+from collections import Counter
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErAttributeModel,
+    MermaidErDiagramModel,
+    MermaidErEntityModel,
+    MermaidErRelationshipModel,
+)
+
+
+class MermaidErMerger:
+    """
+    Merges Mermaid ER diagrams into a single one, replacing the consolidation LLM call.
+
+    - Entities are the union of the entities of every diagram, temporary tables excluded.
+      Their names are compared case-insensitively, without schema or brackets.
+    - Attributes are deduplicated by case-insensitive name, keeping the most specific data type
+      (e.g. VARCHAR(100) over VARCHAR(50), DECIMAL(10-2) over DECIMAL) and every key.
+    - Relationships are unified to one per dependent entity, principal entity and foreign
+      key column, using the most frequent cardinality and, among the labels worded from the
+      chosen direction, the most frequent label. Relationships without a known foreign key
+      join the only foreign key edge of their pair.
+
+    Diagrams can be added one by one as they are produced, and the result does not depend
+    on the order they are added in, except for the casing of the names: the first one seen
+    is rendered.
+    """
+
+    _type_pattern = re.compile(r"^(?P<base>[^(]+)(?:\((?P<arguments>[^)]*)\))?")
+    _keys_order = ["PK", "FK", "UK"]
+
+    def __init__(self) -> None:
+        # Keyed by normalized name
+        self.entities: dict[str, MermaidErEntityModel] = {}
+        self.entity_names: dict[str, str] = {}
+        # Keyed by the normalized (dependent, principal, foreign key column)
+        self.relationship_forms: dict[tuple[str, str, str], Counter] = {}
+        self.relationship_labels: dict[tuple[str, str, str], Counter] = {}
+        self.foreign_key_names: dict[tuple[str, str, str], str] = {}
+
+    def add(self, diagram: MermaidErDiagramModel) -> None:
+        """Merges the entities and relationships of the diagram into the result."""
+        diagram_entities: dict[str, MermaidErEntityModel] = {}
+        for entity in diagram.entities.values():
+            if self.__is_temporary_table(entity.name):
+                continue
+
+            name = self.__add_entity_name(entity.name)
+            diagram_entities.setdefault(name, entity)
+            merged_entity = self.entities.setdefault(
+                name, MermaidErEntityModel(self.entity_names[name])
+            )
+            for attribute in entity.attributes.values():
+                self.__merge_attribute(merged_entity, attribute)
+
+        for relationship in diagram.relationships:
+            if self.__is_temporary_table(
+                relationship.first_entity
+            ) or self.__is_temporary_table(relationship.second_entity):
+                continue
+
+            first_entity = self.__add_entity_name(relationship.first_entity)
+            second_entity = self.__add_entity_name(relationship.second_entity)
+            dependent, principal = self.__get_direction(
+                relationship, first_entity, second_entity
+            )
+            foreign_key = self.__get_foreign_key(
+                relationship, diagram_entities.get(dependent)
+            )
+            edge = (dependent, principal, foreign_key.lower())
+            if foreign_key:
+                self.foreign_key_names[edge] = min(
+                    self.foreign_key_names.get(edge, foreign_key), foreign_key
+                )
+            self.relationship_forms.setdefault(edge, Counter())[
+                (
+                    first_entity,
+                    relationship.left_cardinality,
+                    relationship.line,
+                    relationship.right_cardinality,
+                    second_entity,
+                )
+            ] += 1
+            if relationship.label:
+                # Labels are worded from the perspective of the first entity
+                self.relationship_labels.setdefault(edge, Counter())[
+                    (first_entity, relationship.label)
+                ] += 1
+
+    def render(self) -> str:
+        """
+        Renders the merged diagram as a Mermaid code block.
+
+        Returns:
+            str: The consolidated `erDiagram` in a fenced `mermaid` block.
+        """
+        lines = ["```mermaid", "erDiagram"]
+
+        edges = self.__get_edges()
+        for (dependent, principal), pair_edges in sorted(edges.items()):
+            rendered_edges = []
+            for foreign_key, forms, labels in pair_edges:
+                first_entity, left, line, right, second_entity = self.__get_most_common(
+                    forms
+                )
+                perspective_labels = Counter(
+                    {
+                        label: count
+                        for (label_entity, label), count in labels.items()
+                        if label_entity == first_entity
+                    }
+                )
+                label = (
+                    self.__get_most_common(perspective_labels)
+                    if perspective_labels
+                    else foreign_key or "relates_to"
+                )
+                rendered_edges.append(
+                    [first_entity, left, line, right, second_entity, label, foreign_key]
+                )
+
+            # Edges of the same pair keep distinct labels, naming their foreign key
+            label_counts = Counter(edge[5] for edge in rendered_edges)
+            for edge in rendered_edges:
+                if label_counts[edge[5]] > 1 and edge[6]:
+                    edge[5] = edge[6]
+
+            for first_entity, left, line, right, second_entity, label, _ in sorted(
+                rendered_edges, key=lambda edge: (edge[6], edge[5])
+            ):
+                notation = MermaidErRelationshipModel(
+                    first_entity, second_entity, left, right, line
+                ).get_notation()
+                lines.append(
+                    f"    {self.__format_name(self.entity_names[first_entity])} {notation} "
+                    f"{self.__format_name(self.entity_names[second_entity])} : {self.__format_label(label)}"
+                )
+
+        for name in sorted(self.entities):
+            entity = self.entities[name]
+            if not entity.attributes:
+                lines.append(f"    {self.__format_name(entity.name)}")
+                continue
+
+            lines.append(f"    {self.__format_name(entity.name)} {{")
+            for attribute in sorted(
+                entity.attributes.values(),
+                key=lambda attribute: ("PK" not in attribute.keys, attribute.name),
+            ):
+                lines.append(f"        {self.__format_attribute(attribute)}")
+            lines.append("    }")
+
+        lines.append("```")
+        return "\n".join(lines)
+
+    def __get_edges(
+        self,
+    ) -> dict[tuple[str, str], list[tuple[str, Counter, Counter]]]:
+        """
+        Groups the edges by entity pair. The relationships of a pair without a known foreign
+        key join its only foreign key edge, and are dropped when the pair has several.
+        """
+        edges: dict[tuple[str, str], list[tuple[str, Counter, Counter]]] = {}
+        for (dependent, principal, foreign_key), forms in self.relationship_forms.items():
+            edges.setdefault((dependent, principal), []).append(
+                (
+                    self.foreign_key_names.get(
+                        (dependent, principal, foreign_key), foreign_key
+                    ),
+                    Counter(forms),
+                    Counter(
+                        self.relationship_labels.get(
+                            (dependent, principal, foreign_key), Counter()
+                        )
+                    ),
+                )
+            )
+
+        for pair, pair_edges in edges.items():
+            unknown_edges = [edge for edge in pair_edges if not edge[0]]
+            known_edges = [edge for edge in pair_edges if edge[0]]
+            if not unknown_edges or not known_edges:
+                continue
+            if len(known_edges) == 1:
+                known_edges[0][1].update(unknown_edges[0][1])
+                known_edges[0][2].update(unknown_edges[0][2])
+            edges[pair] = known_edges
+
+        return edges
+
+    def __add_entity_name(self, name: str) -> str:
+        """Returns the normalized name of an entity, recording the first casing seen for it."""
+        normalized_name = MermaidErEntityModel.normalize_name(name)
+        self.entity_names.setdefault(normalized_name, name)
+        return normalized_name
+
+    def __get_direction(
+        self,
+        relationship: MermaidErRelationshipModel,
+        first_entity: str,
+        second_entity: str,
+    ) -> tuple[str, str]:
+        """Returns the dependent (many side) and principal entities, in name order when both sides are alike."""
+        if relationship.is_first_entity_many and not relationship.is_second_entity_many:
+            return first_entity, second_entity
+        if relationship.is_second_entity_many and not relationship.is_first_entity_many:
+            return second_entity, first_entity
+        return tuple(sorted([first_entity, second_entity]))
+
+    def __get_foreign_key(
+        self,
+        relationship: MermaidErRelationshipModel,
+        dependent_entity: MermaidErEntityModel | None,
+    ) -> str:
+        """
+        Returns the foreign key column of the relationship: the one it carries, or its label
+        when it names an FK column of the dependent (as rendered for multiple foreign keys).
+        """
+        if relationship.foreign_key:
+            return relationship.foreign_key
+        if dependent_entity is None:
+            return ""
+
+        attribute = next(
+            (
+                attribute
+                for attribute in dependent_entity.attributes.values()
+                if attribute.name.lower() == relationship.label.lower()
+            ),
+            None,
+        )
+        return attribute.name if attribute and "FK" in attribute.keys else ""
+
+    def __merge_attribute(
+        self, entity: MermaidErEntityModel, attribute: MermaidErAttributeModel
+    ) -> None:
+        # Keyed by lowercase name, keeping the first casing seen
+        merged_attribute = entity.attributes.get(attribute.name.lower())
+        if merged_attribute is None:
+            entity.attributes[attribute.name.lower()] = MermaidErAttributeModel(
+                data_type=attribute.data_type,
+                name=attribute.name,
+                keys=list(attribute.keys),
+                comment=attribute.comment,
+            )
+            return
+
+        merged_attribute.data_type = max(
+            merged_attribute.data_type,
+            attribute.data_type,
+            key=self.__get_type_specificity,
+        )
+        merged_attribute.keys = [
+            key
+            for key in self._keys_order
+            if key in merged_attribute.keys or key in attribute.keys
+        ]
+        merged_attribute.comment = max(
+            merged_attribute.comment, attribute.comment, key=lambda c: (len(c), c)
+        )
+
+    def __get_type_specificity(self, data_type: str) -> tuple:
+        """
+        Ranks a data type: types with size/precision win over bare ones, then the larger
+        size wins (MAX being the largest). The type itself breaks the ties so the choice
+        does not depend on the merge order.
+        """
+        match = self._type_pattern.match(data_type)
+        arguments = match.group("arguments") if match else None
+        if arguments is None:
+            return (0, (), data_type)
+
+        sizes = tuple(
+            float("inf") if argument.strip().upper() == "MAX" else float(argument)
+            for argument in re.split(r"[-,]", arguments)
+            if argument.strip().upper() == "MAX"
+            or argument.strip().replace(".", "", 1).isdigit()
+        )
+        return (1, sizes, data_type)
+
+    def __get_most_common(self, counter: Counter):
+        # The most frequent value, the smallest one among equals
+        return min(counter.items(), key=lambda item: (-item[1], item[0]))[0]
+
+    def __format_attribute(self, attribute: MermaidErAttributeModel) -> str:
+        parts = [attribute.data_type, attribute.name]
+        if attribute.keys:
+            parts.append(", ".join(attribute.keys))
+        if attribute.comment:
+            parts.append(f'"{attribute.comment}"')
+        return " ".join(parts)
+
+    def __format_name(self, name: str) -> str:
+        return f'"{name}"' if " " in name else name
+
+    def __format_label(self, label: str) -> str:
+        return label if re.fullmatch(r"[\w\-]+", label) else f'"{label}"'
+
+    def __is_temporary_table(self, name: str) -> bool:
+        return name.startswith(("#", "@"))
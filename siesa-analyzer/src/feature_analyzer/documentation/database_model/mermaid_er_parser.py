@@ -0,0 +1,157 @@
+import re
+from feature_analyzer.documentation.database_model.mermaid_er_diagram_model import (
+    MermaidErAttributeModel,
+    MermaidErDiagramModel,
+    MermaidErRelationshipModel,
+)
+
+
+class MermaidErParser:
+    """
+    Parses the Mermaid `erDiagram` blocks returned by the LLM into a `MermaidErDiagramModel`.
+
+    The parser is lenient: surrounding text and markdown fences are ignored, and each
+    invalid line is reported in `errors` and skipped, so the valid part of a diagram can
+    still be merged while the invalid one is re-requested.
+    """
+
+    _fence_pattern = re.compile(r"```[ \t]*(?:mermaid)?[ \t]*\n(.*?)```", re.DOTALL)
+    _entity_name = r'(?:"[^"]+"|[\w\-.$#@]+)(?:\[[^\]]*\])?(?::::[\w\-]+)?'
+    _cardinality_alias = (
+        r"one or zero|zero or one|one or more|one or many|many\(1\)|1\+|"
+        r"zero or more|zero or many|many\(0\)|0\+|only one|1"
+    )
+    _relationship_pattern = re.compile(
+        rf"^(?P<first>{_entity_name})\s*"
+        rf"(?:(?P<left>[|}}o][|o{{])(?P<line>--|\.\.)(?P<right>[|o][|{{])"
+        rf"|\s(?P<left_alias>{_cardinality_alias})\s+(?P<line_alias>to|optionally to)\s+(?P<right_alias>{_cardinality_alias})\s)"
+        rf"\s*(?P<second>{_entity_name})\s*(?::\s*(?P<label>\"[^\"]*\"|.+?))?\s*$",
+        re.IGNORECASE,
+    )
+    _entity_start_pattern = re.compile(rf"^(?P<name>{_entity_name})\s*\{{\s*(?P<end>\}})?\s*$")
+    _entity_pattern = re.compile(rf"^(?P<name>{_entity_name})$")
+    _attribute_pattern = re.compile(
+        r"^(?P<type>[\w\-\[\]().,]+)\s+(?P<name>[\w\-\[\]*$#@]+)"
+        r"(?:\s+(?P<keys>(?:PK|FK|UK)(?:\s*,\s*(?:PK|FK|UK))*))?"
+        r'(?:\s+"(?P<comment>[^"]*)")?\s*$',
+        re.IGNORECASE,
+    )
+    _ignored_statement_pattern = re.compile(
+        r"^(%%|direction\s|classDef\s|class\s|style\s|title\s|accTitle\s*:|accDescr\s*[:{])",
+        re.IGNORECASE,
+    )
+
+    def parse(self, content: str) -> MermaidErDiagramModel:
+        """
+        Parses every `erDiagram` block found in the content into a single diagram.
+
+        Args:
+            content (str): The LLM response containing the Mermaid ER diagram(s).
+
+        Returns:
+            MermaidErDiagramModel: The parsed diagram, with the syntax errors found.
+        """
+        diagram = MermaidErDiagramModel()
+        blocks = self._fence_pattern.findall(content or "") or [content or ""]
+
+        found_diagram = False
+        for block in blocks:
+            lines = block.splitlines()
+            header_index = next(
+                (
+                    index
+                    for index, line in enumerate(lines)
+                    if line.strip().lower() == "erdiagram"
+                ),
+                None,
+            )
+            if header_index is None:
+                continue
+
+            found_diagram = True
+            self.__parse_statements(lines[header_index + 1 :], diagram)
+
+        if not found_diagram:
+            diagram.errors.append("No erDiagram block was found.")
+
+        return diagram
+
+    def __parse_statements(
+        self, lines: list[str], diagram: MermaidErDiagramModel
+    ) -> None:
+        current_entity = None
+
+        for line_number, raw_line in enumerate(lines, start=2):
+            line = raw_line.strip()
+            if not line or line == "----" or self._ignored_statement_pattern.match(line):
+                continue
+
+            if current_entity is not None:
+                if line == "}":
+                    current_entity = None
+                    continue
+
+                match = self._attribute_pattern.match(line)
+                if match is None:
+                    diagram.errors.append(
+                        f"Line {line_number}: invalid attribute of {current_entity.name}: '{line}'."
+                    )
+                    continue
+
+                attribute = MermaidErAttributeModel(
+                    data_type=match.group("type"),
+                    name=match.group("name"),
+                    keys=self.__parse_keys(match.group("keys")),
+                    comment=match.group("comment") or "",
+                )
+                current_entity.attributes.setdefault(attribute.name, attribute)
+                continue
+
+            match = self._entity_start_pattern.match(line)
+            if match is not None:
+                entity = diagram.get_or_add_entity(
+                    self.__normalize_entity_name(match.group("name"))
+                )
+                current_entity = None if match.group("end") else entity
+                continue
+
+            match = self._relationship_pattern.match(line)
+            if match is not None:
+                first_entity = self.__normalize_entity_name(match.group("first"))
+                second_entity = self.__normalize_entity_name(match.group("second"))
+                diagram.get_or_add_entity(first_entity)
+                diagram.get_or_add_entity(second_entity)
+                diagram.relationships.append(
+                    MermaidErRelationshipModel(
+                        first_entity=first_entity,
+                        second_entity=second_entity,
+                        left_cardinality=match.group("left") or match.group("left_alias"),
+                        right_cardinality=match.group("right") or match.group("right_alias"),
+                        line=match.group("line") or match.group("line_alias"),
+                        label=(match.group("label") or "").strip().strip('"'),
+                    )
+                )
+                continue
+
+            match = self._entity_pattern.match(line)
+            if match is not None:
+                diagram.get_or_add_entity(self.__normalize_entity_name(match.group("name")))
+                continue
+
+            diagram.errors.append(f"Line {line_number}: invalid statement: '{line}'.")
+
+        if current_entity is not None:
+            diagram.errors.append(
+                f"The attributes block of {current_entity.name} is not closed."
+            )
+
+    def __normalize_entity_name(self, name: str) -> str:
+        # Drops the style class (`NAME:::class`) and the alias (`NAME["Alias"]`)
+        name = name.split(":::", 1)[0]
+        name = name.split("[", 1)[0]
+        return name.strip('"')
+
+    def __parse_keys(self, keys: str) -> list[str]:
+        if not keys:
+            return []
+        return [key.strip().upper() for key in keys.split(",")]
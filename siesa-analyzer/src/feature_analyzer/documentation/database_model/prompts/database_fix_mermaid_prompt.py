@@ -0,0 +1,40 @@
+from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+
+
+class DatabaseFixMermaidPrompt(AnalyzerPrompt):
+    def __init__(self, mermaid_representation: str, syntax_errors: list[str]) -> None:
+        self.mermaid_representation = mermaid_representation
+        self.syntax_errors = syntax_errors
+
+    def get_system_message(self) -> str:
+        return """
+        You are a Database Architect with deep knowledge of the Mermaid ER diagram syntax. Your objective is to fix the syntax errors of a Mermaid ER diagram without changing the database structure it represents.
+
+        Mermaid syntax for ER diagrams:
+        - The diagram starts with the line ```erDiagram```.
+        - Relationships: ```<first-entity> <relationship> <second-entity> : <relationship-label>``` (e.g. ```PROPERTY ||--|{ ROOM : contains```).
+        - Entities with attributes: ```<entity> { <type> <name> [PK, FK, UK] ["comment"] }```, one attribute per line.
+        """
+
+    def get_user_message(self) -> str:
+        syntax_errors = "\n".join(f"- {error}" for error in self.syntax_errors)
+        return f"""
+        The following Mermaid ER diagram has syntax errors:
+        ```mermaid
+        {self.mermaid_representation}
+        ```
+
+        Errors found:
+        {syntax_errors}
+
+        Fix only the invalid lines, keeping every table, column, data type and relationship. Data types with precision and scale use the format TYPE(PRECISION-SCALE) (e.g., DECIMAL(10-2)).
+
+        **Conciseness:** Only include the Mermaid diagram code. Do not include any additional text, explanations, or comments.
+        """
+
+    def get_messages(self) -> list[BaseMessage]:
+        return [
+            SystemMessage(content=self.get_system_message()),
+            HumanMessage(content=self.get_user_message()),
+        ]
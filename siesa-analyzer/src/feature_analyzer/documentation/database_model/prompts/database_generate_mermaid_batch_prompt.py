@@ -0,0 +1,51 @@
+from feature_analyzer.models.procedure_analysis_result_model import (
+    ProcedureAnalysisResultModel,
+)
+from feature_analyzer.documentation.database_model.prompts.procedures_batch_content import (
+    get_procedures_batch_content,
+)
+from feature_analyzer.documentation.database_model.prompts.database_generate_mermaid_prompt import (
+    DatabaseGenerateMermaidPrompt,
+)
+
+
+class DatabaseGenerateMermaidBatchPrompt(DatabaseGenerateMermaidPrompt):
+    """Batched variant of `DatabaseGenerateMermaidPrompt`: one diagram per procedure of the batch."""
+
+    def __init__(self, procedures: list[ProcedureAnalysisResultModel]) -> None:
+        super().__init__(
+            procedure_content=get_procedures_batch_content(procedures)
+        )
+        self.procedures = procedures
+
+    def get_user_message(self) -> str:
+        procedure_names = "\n".join(
+            f"- {procedure.procedure_name}" for procedure in self.procedures
+        )
+        return f"""
+        Considering the SQL Stored Procedures code below, each one starting with a `-- PROCEDURE: <name>` line:
+        ```markdown
+        {self.procedure_content}
+        ```
+
+        Generate, for each procedure, a Mermaid ER diagram representing the database structure used by its code. The procedures are:
+        {procedure_names}
+
+        Here you have some examples on how to represent the database structure:
+        {self._get_few_shots_examples()}
+
+        Follow these guidelines:
+        **One Diagram per Procedure:** Return exactly one diagram per procedure, with its name as given above. Each diagram only represents the code of its own procedure.
+
+        **Table Inclusion:** Include all tables used in the following SQL clauses: SELECT, UPDATE, DELETE, JOIN, INSERT, and WHERE. Do not include temporary tables.
+
+        **Column Inclusion:** For each table, include only the columns that are explicitly referenced in the SQL code. This includes columns used in SELECT, WHERE, JOIN, UPDATE, and INSERT clauses. If a SELECT * is used, include all columns from that table.
+
+        **Relationship Representation:** Represent relationships between tables with a simple connection line. Do not include the specific join conditions or WHERE clause criteria in the diagram. Focus on the existence of a relationship, not its details.
+
+        **Data Type Formatting:** For column data types that include precision and scale, use the format TYPE(PRECISION-SCALE) (e.g., DECIMAL(10-2), VARCHAR(255)). Use a hyphen (-) to separate precision and scale, not a comma.
+
+        **Precision and Scale Defaults:** If the column is defined with a precision and scale, always provide the scale. If the scale is 0, write the type as DECIMAL(PRECISION-0).
+
+        **Conciseness:** Only include the Mermaid diagram code in each diagram. Do not include any additional text, explanations, or comments.
+        """
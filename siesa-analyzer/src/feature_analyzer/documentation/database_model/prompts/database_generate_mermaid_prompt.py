@@ -3,8 +3,9 @@ from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
 
 
 class DatabaseGenerateMermaidPrompt(AnalyzerPrompt):
-    def __init__(self, procedure_content: str) -> None:
+    def __init__(self, procedure_content: str, callees_summary: str = "") -> None:
         self.procedure_content = procedure_content
+        self.callees_summary = callees_summary
 
     def get_system_message(self) -> str:
         return """
@@ -47,11 +48,11 @@ class DatabaseGenerateMermaidPrompt(AnalyzerPrompt):
         ```markdown
         {self.procedure_content}
         ```
-
+        {self._get_callees_summary_section()}
         Generate a Mermaid ER diagram representing the database structure used by this code. 
 
         Here you have some examples on how to represent the database structure:
-        {self.__get_few_shots_examples()}
+        {self._get_few_shots_examples()}
 
         Follow these guidelines:
         **Table Inclusion:** Include all tables used in the following SQL clauses: SELECT, UPDATE, DELETE, JOIN, INSERT, and WHERE. Do not include temporary tables.
@@ -67,13 +68,21 @@ class DatabaseGenerateMermaidPrompt(AnalyzerPrompt):
         **Conciseness:** Only include the Mermaid diagram code. Do not include any additional text, explanations, or comments.
         """
 
+    def _get_callees_summary_section(self) -> str:
+        if not self.callees_summary:
+            return ""
+        return f"""
+        The procedures called by this code do the following (their tables are part of the database structure used by this code only when the code itself references them):
+        {self.callees_summary}
+        """
+
     def get_messages(self) -> list[BaseMessage]:
         return [
             SystemMessage(content=self.get_system_message()),
             HumanMessage(content=self.get_user_message()),
         ]
 
-    def __get_few_shots_examples(self) -> str:
+    def _get_few_shots_examples(self) -> str:
         return """
         erDiagram
             CAR ||--o{ NAMED-DRIVER : allows
@@ -0,0 +1,44 @@
+from feature_analyzer.models.procedure_analysis_result_model import (
+    ProcedureAnalysisResultModel,
+)
+from feature_analyzer.documentation.database_model.prompts.procedures_batch_content import (
+    get_procedures_batch_content,
+)
+from feature_analyzer.documentation.database_model.prompts.database_generate_relationships_prompt import (
+    DatabaseGenerateRelationshipsPrompt,
+)
+
+
+class DatabaseGenerateRelationshipsBatchPrompt(DatabaseGenerateRelationshipsPrompt):
+    """Batched variant of `DatabaseGenerateRelationshipsPrompt`: the relationships of each procedure of the batch."""
+
+    def __init__(
+        self,
+        procedures: list[ProcedureAnalysisResultModel],
+        table_names_by_procedure: dict[str, list[str]],
+    ) -> None:
+        super().__init__(
+            procedure_content=get_procedures_batch_content(procedures),
+            table_names=[],
+        )
+        self.procedures = procedures
+        self.table_names_by_procedure = table_names_by_procedure
+
+    def get_user_message(self) -> str:
+        procedures_tables = "\n".join(
+            f"- {procedure.procedure_name}: {', '.join(self.table_names_by_procedure.get(procedure.procedure_name, []))}"
+            for procedure in self.procedures
+        )
+        return f"""
+        Considering the SQL Stored Procedures code below, each one starting with a `-- PROCEDURE: <name>` line:
+        ```markdown
+        {self.procedure_content}
+        ```
+
+        The procedures use these tables:
+        {procedures_tables}
+
+        For each procedure, list the relationships between the tables, deduced from the JOIN conditions, subqueries and the columns shared in WHERE, INSERT and UPDATE clauses of its own code. Relationships may also involve other permanent tables used by the code. Do not include temporary tables or table variables.
+
+        **Output Format:** Exactly one result per procedure, with its name as given above and one relationship per line, in the Mermaid syntax. Do not include the erDiagram header, entity blocks, columns, or any additional text, explanations, or comments. If a procedure has no relationships, return an empty representation for it.
+        """
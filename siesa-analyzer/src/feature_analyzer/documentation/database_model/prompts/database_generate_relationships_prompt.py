@@ -0,0 +1,57 @@
+from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+
+
+class DatabaseGenerateRelationshipsPrompt(AnalyzerPrompt):
+    def __init__(
+        self, procedure_content: str, table_names: list[str], callees_summary: str = ""
+    ) -> None:
+        self.procedure_content = procedure_content
+        self.table_names = table_names
+        self.callees_summary = callees_summary
+
+    def get_system_message(self) -> str:
+        return """
+        You are a Database Architect specializing in reverse-engineering database schemas from SQL code. Your objective is to identify the relationships between the tables used by a SQL stored procedure. The tables and their columns are already known, you only describe how they relate.
+
+        Mermaid syntax for ER relationships:
+        ```<first-entity> <relationship> <second-entity> : <relationship-label>```
+
+        Where:
+        - first-entity and second-entity are table names.
+        - relationship describes the cardinality of both sides (e.g. ||--o{, ||--||, }o--||).
+        - relationship-label describes the relationship from the perspective of the first entity, as a single word or snake_case identifier.
+
+        For example:
+        ```w0550_contratos ||--o{ w0510_grupos_empleados : has_group```
+        """
+
+    def get_user_message(self) -> str:
+        table_names = "\n".join(f"- {table_name}" for table_name in self.table_names)
+        return f"""
+        Considering the SQL Stored Procedure code below:
+        ```markdown
+        {self.procedure_content}
+        ```
+
+        The procedure uses these tables:
+        {table_names}
+        {self._get_callees_summary_section()}
+        List the relationships between the tables, deduced from the JOIN conditions, subqueries and the columns shared in WHERE, INSERT and UPDATE clauses. Relationships may also involve other permanent tables used by the code. Do not include temporary tables or table variables.
+
+        **Output Format:** One relationship per line, in the Mermaid syntax. Do not include the erDiagram header, entity blocks, columns, or any additional text, explanations, or comments. If there are no relationships, return an empty response.
+        """
+
+    def _get_callees_summary_section(self) -> str:
+        if not self.callees_summary:
+            return ""
+        return f"""
+        The procedures called by this code do the following:
+        {self.callees_summary}
+        """
+
+    def get_messages(self) -> list[BaseMessage]:
+        return [
+            SystemMessage(content=self.get_system_message()),
+            HumanMessage(content=self.get_user_message()),
+        ]
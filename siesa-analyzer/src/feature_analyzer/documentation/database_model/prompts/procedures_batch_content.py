@@ -0,0 +1,22 @@
+from feature_analyzer.models.procedure_analysis_result_model import (
+    ProcedureAnalysisResultModel,
+)
+
+
+def get_procedures_batch_content(procedures: list[ProcedureAnalysisResultModel]) -> str:
+    """
+    Joins the code of the procedures of a batch, each one starting with a
+    `-- PROCEDURE: <name>` line and followed by the summary of its callees as comments.
+    """
+    return "\n\n".join(
+        f"-- PROCEDURE: {procedure.procedure_name}\n{procedure.procedure_orignal_content}"
+        + _get_callees_summary_comment(procedure)
+        for procedure in procedures
+    )
+
+
+def _get_callees_summary_comment(procedure: ProcedureAnalysisResultModel) -> str:
+    if not procedure.callees_summary:
+        return ""
+    summary = "\n".join(f"-- {line}" for line in procedure.callees_summary.splitlines())
+    return f"\n-- Procedures called by {procedure.procedure_name}:\n{summary}"
@@ -2,7 +2,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from generativeai.prompter_interface import PrompterInterface
 from typing import Callable, TypeVar
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_registry import prompter_registry_instance
 from common.app_config import app_config_instance
 from abc import ABC
 
@@ -11,17 +11,19 @@ T = TypeVar("T")
 
 
 class BaseUseCaseGeneratorService(ABC):
-    prompter: PrompterInterface
     logger: logging.Logger
 
     def __init__(self, max_workers: int = 10):
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the service analyzes."""
+        return prompter_registry_instance.get_prompter(
             model=app_config_instance.use_case_analysis_llm_model,
             use_agent=True,
         )
-        self.logger = logging.getLogger(__name__)
-        self.max_workers = max_workers
 
     def _process_in_parallel(
         self, items: list[T], processing_function: Callable[[T], None]
@@ -56,7 +56,7 @@ class UseCasesFromApplicationFilePrompt(AnalyzerPrompt):
         {use_case_document_template}
 
         {
-            f"You should focus only in the following methods and their respective call stacks: {', '.join(self.method_names)}" if self.method_names is not None else ""
+            f"You should focus only in the following methods and their respective call stacks: {', '.join(self.method_names)}. The file may be reduced to these methods and the fields and helper methods they use, with the code left out marked as `// ...`." if self.method_names is not None else ""
         }
 
         Important:
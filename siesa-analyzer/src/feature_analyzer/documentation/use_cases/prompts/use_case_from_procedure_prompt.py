@@ -10,9 +10,11 @@ class UseCasesFromProcedurePrompt(AnalyzerPrompt):
         self,
         procedure_name: str,
         procedure_content: str,
+        callees_summary: str = "",
     ) -> None:
         self.procedure_name = procedure_name
         self.procedure_content = procedure_content
+        self.callees_summary = callees_summary
 
     def get_system_message(self) -> str:
         return """
@@ -38,7 +40,7 @@ class UseCasesFromProcedurePrompt(AnalyzerPrompt):
         ```sql
             {self.procedure_content}
         ```
-
+        {self.__get_callees_summary_section()}
         Strictly follow the steps below (one by one) to create the Use Case document:
         1. **Identify the Use Cases:** Analyze the stored procedure to identify distinct use cases it supports.
         2. **Describe the Use Cases:** For each identified use case, fill out the Use Case following the provided template.
@@ -55,6 +57,16 @@ class UseCasesFromProcedurePrompt(AnalyzerPrompt):
         - Don't make assumptions about the business context that are not directly supported by the T-SQL code.
         """
 
+    def __get_callees_summary_section(self) -> str:
+        if not self.callees_summary:
+            return ""
+        return f"""
+        **Called Stored Procedures (summary of what they do):**
+        {self.callees_summary}
+
+        Use these summaries to describe the steps that call other procedures, without documenting their internal use cases.
+        """
+
     def get_messages(self) -> list[BaseMessage]:
         return [
             SystemMessage(content=self.get_system_message()),
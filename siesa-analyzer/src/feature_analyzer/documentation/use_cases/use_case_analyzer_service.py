@@ -27,7 +27,7 @@ from feature_analyzer.documentation.use_cases.prompts.flow_diagram_prompt import
     FlowDiagramPrompt,
 )
 from typing import Callable, TypeVar
-from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_registry import prompter_registry_instance
 from feature_analyzer.app_config import app_config_instance
 
 # Define a generic type for the items in the list
@@ -39,16 +39,17 @@ logging.basicConfig(
 
 
 class UseCaseAnalyzerService(AnalyzeServiceInterface):
-    prompter: PrompterInterface
-
     def __init__(self):
-        self.prompter = PrompterFactory.create_prompter(
-            config_auth=app_config_instance.get_config_auth(),
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = 20
+
+    @property
+    def prompter(self) -> PrompterInterface:
+        """The shared prompter, taken from the registry when the service analyzes."""
+        return prompter_registry_instance.get_prompter(
             model=app_config_instance.use_case_analysis_llm_model,
             use_agent=True,
         )
-        self.logger = logging.getLogger(__name__)
-        self.max_workers = 20
 
     def analyze(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
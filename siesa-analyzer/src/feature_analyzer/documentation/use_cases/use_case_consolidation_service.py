@@ -6,6 +6,11 @@ from feature_analyzer.documentation.use_cases.base_use_case_generator_service im
 from feature_analyzer.documentation.use_cases.prompts.consolidates_use_cases_prompt import (
     ConsolidatesUseCasesPrompt,
 )
+from feature_analyzer.common.hierarchical_reduce_engine import (
+    HierarchicalReduceEngine,
+)
+from generativeai.prompter_registry import prompter_registry_instance
+from common.app_config import app_config_instance
 
 
 class UseCaseConsolidationService(BaseUseCaseGeneratorService):
@@ -30,25 +35,37 @@ class UseCaseConsolidationService(BaseUseCaseGeneratorService):
         return data_wrapper
 
     def __consolidate_use_cases(self, data_wrapper: DataWrapperModel) -> str:
-        procedures_result = "\n\n".join(
-            [
-                procedure.llm_use_cases_documentation
-                for procedure in data_wrapper.output_procedure_analysis_result
-                if procedure.llm_use_cases_documentation
-            ]
-        )
+        use_cases = [
+            procedure.llm_use_cases_documentation
+            for procedure in data_wrapper.output_procedure_analysis_result
+            if procedure.llm_use_cases_documentation
+        ] + [
+            app_file.llm_use_cases_documentation
+            for app_file in data_wrapper.output_app_files_mapping
+            if app_file.llm_use_cases_documentation
+        ]
 
-        app_files_result = "\n\n".join(
-            [
-                app_file.llm_use_cases_documentation
-                for app_file in data_wrapper.output_app_files_mapping
-                if app_file.llm_use_cases_documentation
-            ]
+        reduce_engine = HierarchicalReduceEngine(
+            self.prompter,
+            max_fan_in=app_config_instance.consolidation_max_fan_in,
+            max_workers=app_config_instance.consolidation_max_workers,
+            separator="\n\n",
         )
-
-        result = f"{procedures_result}\n\n{app_files_result}"
-
-        prompt = ConsolidatesUseCasesPrompt(use_cases_content=result)
-        return self.prompter.get_content_from_invoke_llm_with_messages(
-            prompt.get_messages()
+        # Documents are merged in a parallel tree, only the final merge is streamed. The
+        # agent only returns its answer at the end, so it is streamed without the agent
+        stream_prompter = prompter_registry_instance.get_prompter(
+            model=app_config_instance.use_case_analysis_llm_model,
+            use_agent=False,
+        )
+        output_section = data_wrapper.stream_output_section("use_cases_documentation.md")
+        return reduce_engine.reduce(
+            use_cases,
+            create_reduce_prompt=lambda content: ConsolidatesUseCasesPrompt(
+                use_cases_content=content
+            ),
+            final_invoke=lambda prompt: stream_prompter.stream_content_from_llm_with_messages(
+                prompt.get_messages(),
+                on_chunk=output_section.append,
+                on_discard=output_section.discard,
+            ),
         )
@@ -11,9 +11,23 @@ from opentelemetry.trace import Status, StatusCode
 from feature_analyzer.documentation.use_cases.base_use_case_generator_service import (
     BaseUseCaseGeneratorService,
 )
+from feature_analyzer.documentation.use_cases.prompts.consolidates_use_cases_prompt import (
+    ConsolidatesUseCasesPrompt,
+)
+from feature_analyzer.common.chunked_prompt_executor import ChunkedPromptExecutor
 
 
 class UseCaseFromProcedureService(BaseUseCaseGeneratorService):
+    def __init__(self, max_workers: int = 10):
+        super().__init__(max_workers)
+        self._chunked_prompt_executor = None
+
+    @property
+    def chunked_prompt_executor(self) -> ChunkedPromptExecutor:
+        if self._chunked_prompt_executor is None:
+            self._chunked_prompt_executor = ChunkedPromptExecutor(self.prompter)
+        return self._chunked_prompt_executor
+
     def analyze(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
 
@@ -54,15 +68,18 @@ class UseCaseFromProcedureService(BaseUseCaseGeneratorService):
                     }
                 )
 
-                prompt = UseCasesFromProcedurePrompt(
-                    procedure_name=procedure.procedure_name,
-                    procedure_content=procedure.procedure_orignal_content,
-                )
-
-                use_cases_content = (
-                    self.prompter.get_content_from_invoke_llm_with_messages(
-                        prompt.get_messages()
-                    )
+                # Oversized procedures are split and their partial use cases consolidated
+                use_cases_content = self.chunked_prompt_executor.execute(
+                    content=procedure.procedure_orignal_content,
+                    create_prompt=lambda content: UseCasesFromProcedurePrompt(
+                        procedure_name=procedure.procedure_name,
+                        procedure_content=content,
+                        callees_summary=procedure.callees_summary,
+                    ),
+                    create_reduce_prompt=lambda content: ConsolidatesUseCasesPrompt(
+                        use_cases_content=content
+                    ),
+                    content_name=procedure.procedure_name,
                 )
 
                 procedure.llm_use_cases_documentation = use_cases_content
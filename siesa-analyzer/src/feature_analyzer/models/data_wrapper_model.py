@@ -13,6 +13,22 @@ from feature_analyzer.models.llm_entity_class_result_model import (
 from feature_analyzer.preparation.files_handler_service import FilesHandlerService
 
 
+class StreamedOutputSection:
+    """An output section written incrementally, as the chunks of a response are received."""
+
+    def __init__(self, files_handler: FilesHandlerService, file_path: str) -> None:
+        self.files_handler = files_handler
+        self.file_path = file_path
+        self.files_handler.write_output_section("", file_path)
+
+    def append(self, chunk: str) -> None:
+        self.files_handler.append_output_section(chunk, self.file_path)
+
+    def discard(self, content: str) -> None:
+        """Removes the content streamed by a failed attempt, before the response is streamed again."""
+        self.files_handler.discard_output_section_tail(content, self.file_path)
+
+
 class DataWrapperModel:
     """
     A data model that automatically writes output content to files
@@ -25,6 +41,7 @@ class DataWrapperModel:
     procedure_entry_point_name: str
     application_files_dir_path: str
     application_files_names_to_consider: list[str]
+    application_files_methods: dict[str, list[str]]  # Methods to focus on, per file name
     output_file_path: str
     output_timestamped_dir: str
 
@@ -52,11 +69,15 @@ class DataWrapperModel:
         application_files_dir_path: str,
         application_files_names_to_consider: list[str],
         output_file_path: str,
+        application_files_methods: dict[str, list[str]] = None,
     ):
         self.database_tables_file_path = database_tables_file_path
         self.procedures_dir_path = procedures_dir_path
         self.application_files_dir_path = application_files_dir_path
         self.application_files_names_to_consider = application_files_names_to_consider
+        self.application_files_methods = (
+            application_files_methods if application_files_methods is not None else {}
+        )
         self.procedure_entry_point_name = procedure_entry_point_file_name
         self.output_file_path = output_file_path
 
@@ -90,6 +111,26 @@ class DataWrapperModel:
             self.files_handler.write_output_section(content, full_path)
             print(f"Successfully wrote content to {full_path}")
 
+    def stream_output_section(self, filename: str) -> StreamedOutputSection:
+        """
+        Starts an output section that is written incrementally, as each chunk is received.
+        Assigning the final content to the output property later overwrites the streamed file.
+        """
+        return StreamedOutputSection(
+            self.files_handler, os.path.join(self.output_timestamped_dir, filename)
+        )
+
+    def write_entity_files(self, entity_files: dict[str, str]) -> None:
+        """
+        Writes each entity class to its own file, in the `entities` folder of the
+        timestamped output directory.
+        """
+        entities_dir = os.path.join(self.output_timestamped_dir, "entities")
+        os.makedirs(entities_dir, exist_ok=True)
+        for filename, content in entity_files.items():
+            full_path = os.path.join(entities_dir, os.path.basename(filename))
+            self.files_handler.write_output_section(content, full_path)
+
     # --- Output Properties with Setters for Automatic File Writing ---
     @property
     def output_database_model_full_content(self) -> str:
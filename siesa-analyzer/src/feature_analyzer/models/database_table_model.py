@@ -1,18 +1,78 @@
+class DatabaseColumnModel:
+    """Represents a column of a table, as defined in its CREATE TABLE statement."""
+
+    name: str
+    data_type: str
+    length: int | None = None  # None when not applicable, -1 for MAX
+    precision: int | None = None
+    scale: int | None = None
+    is_nullable: bool = True
+    is_primary_key: bool = False
+
+    def __init__(
+        self,
+        name: str,
+        data_type: str,
+        length: int | None = None,
+        precision: int | None = None,
+        scale: int | None = None,
+        is_nullable: bool = True,
+        is_primary_key: bool = False,
+    ):
+        self.name = name
+        self.data_type = data_type
+        self.length = length
+        self.precision = precision
+        self.scale = scale
+        self.is_nullable = is_nullable
+        self.is_primary_key = is_primary_key
+
+
+class DatabaseForeignKeyModel:
+    """Represents a FOREIGN KEY constraint of a table, as defined in its CREATE TABLE statement."""
+
+    column_names: list[str]
+    referenced_table: str
+    referenced_column_names: list[str]
+
+    def __init__(
+        self,
+        column_names: list[str],
+        referenced_table: str,
+        referenced_column_names: list[str] = None,
+    ):
+        self.column_names = column_names
+        self.referenced_table = referenced_table
+        self.referenced_column_names = (
+            referenced_column_names if referenced_column_names is not None else []
+        )
+
+
 class DatabaseTableModel:
     name: str
     content: str
     code_lines: int = 0
     tokens: int = 0
     new_name_convention: str = None
+    columns: list[DatabaseColumnModel]
+    foreign_keys: list[DatabaseForeignKeyModel]
 
     def __init__(
-        self, name: str, content: str, tokens: int, new_name_convention: str = None
+        self,
+        name: str,
+        content: str,
+        tokens: int,
+        new_name_convention: str = None,
+        columns: list[DatabaseColumnModel] = None,
+        foreign_keys: list[DatabaseForeignKeyModel] = None,
     ):
         self.name = name
         self.content = content
         self.code_lines = len(content.splitlines())
         self.tokens = tokens
         self.new_name_convention = new_name_convention
+        self.columns = columns if columns is not None else []
+        self.foreign_keys = foreign_keys if foreign_keys is not None else []
 
     def get_content(self) -> str:
         return self.content
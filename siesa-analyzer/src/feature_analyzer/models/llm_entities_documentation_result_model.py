@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+
+
+class LLMColumnDocumentationModel(BaseModel):
+    """Model representing the documentation of a column of a database table."""
+
+    column_name: str = Field(..., description="Name of the database column.")
+    summary: str = Field(
+        ..., description="One-line description of the business meaning of the column."
+    )
+
+
+class LLMEntityDocumentationModel(BaseModel):
+    """Model representing the documentation of the entity class of a database table."""
+
+    reference_table: str = Field(..., description="Name of the database table.")
+    summary: str = Field(
+        ..., description="One or two sentences describing what the table represents."
+    )
+    columns: list[LLMColumnDocumentationModel] = Field(
+        default_factory=list,
+        description="Documentation of the columns whose meaning is not obvious from their name.",
+    )
+
+
+class LLMEntitiesDocumentationResultModel(BaseModel):
+    """Model representing the documentation of a batch of entity classes."""
+
+    entities: list[LLMEntityDocumentationModel] = Field(
+        ..., description="Documentation of each table of the batch."
+    )
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+from feature_analyzer.models.llm_entity_class_result_model import (
+    LLMEntityClassResultModel,
+)
+
+
+class LLMEntityClassesResultModel(BaseModel):
+    """Model representing the entity classes extracted from a batch of database table scripts."""
+
+    entities: list[LLMEntityClassResultModel] = Field(
+        ..., description="Entity class of each table of the batch."
+    )
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class LLMProcedureDiagramModel(BaseModel):
+    """Model representing the Mermaid ER representation generated for a stored procedure."""
+
+    procedure_name: str = Field(..., description="Name of the stored procedure.")
+    mermaid_representation: str = Field(
+        ...,
+        description="Mermaid ER representation of the tables used by the procedure, in the requested format.",
+    )
+
+
+class LLMProcedureDiagramsResultModel(BaseModel):
+    """Model representing the Mermaid ER representations of a batch of stored procedures."""
+
+    diagrams: list[LLMProcedureDiagramModel] = Field(
+        ..., description="Mermaid ER representation of each procedure of the batch."
+    )
@@ -0,0 +1,15 @@
+class MinifiedSqlScriptModel:
+    """Represents a minified SQL script, with the line of the input script each of its lines comes from."""
+
+    content: str
+    line_numbers: list[int]  # 1-based line of the input script of each line of the content
+
+    def __init__(self, content: str, line_numbers: list[int] = None) -> None:
+        self.content = content
+        self.line_numbers = line_numbers if line_numbers is not None else []
+
+    def get_original_line_number(self, line_number: int) -> int | None:
+        """Returns the line of the input script of a 1-based line of the minified content."""
+        if 1 <= line_number <= len(self.line_numbers):
+            return self.line_numbers[line_number - 1]
+        return None
@@ -6,15 +6,32 @@ class ProcedureAnalysisResultModel:
 
     procedure_name: str
     procedure_orignal_content: str
+    table_names: list[str]  # Tables referenced by the procedure (extracted using regex)
+    callee_names: list[str]  # Procedures called by the procedure (extracted using regex)
     llm_mermaid_representation: str
     llm_use_cases_documentation: str = ""
+    # Syntax errors of the mermaid representation that were left after re-requesting it
+    mermaid_syntax_errors: list[str]
+    # Compact summaries of the procedure and of its callees, when the callee summaries are enabled
+    llm_summary: str = ""
+    callees_summary: str = ""
+    # Tokens of the table content added to the procedure content, when the tables are used
+    tables_context_tokens: int = 0
 
     def __init__(
         self,
         procedure_name: str,
         procedure_orignal_content: str,
         llm_mermaid_representation: str = "",
+        table_names: list[str] = None,
+        callee_names: list[str] = None,
     ) -> None:
         self.procedure_name = procedure_name
         self.procedure_orignal_content = procedure_orignal_content
+        self.table_names = table_names if table_names is not None else []
+        self.callee_names = callee_names if callee_names is not None else []
         self.llm_mermaid_representation = llm_mermaid_representation
+        self.mermaid_syntax_errors = []
+        self.llm_summary = ""
+        self.callees_summary = ""
+        self.tables_context_tokens = 0
@@ -28,6 +28,8 @@ class ProcedureModel:
         TableReferenceModel
     ]  ## List of tables used in the procedure (extracted using regex)
     table_names: list[str]
+    # 1-based line of the sanitized procedure of each line of the content, when it was minified
+    original_line_numbers: list[int]
 
     def __init__(
         self,
@@ -47,6 +49,7 @@ class ProcedureModel:
         self.tokens = tokens
         self.tables = tables if tables is not None else []
         self.table_names = self.__get_distinct_table_names()
+        self.original_line_numbers = []
 
     def to_dict(self):
         return {
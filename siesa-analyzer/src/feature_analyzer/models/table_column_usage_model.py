@@ -0,0 +1,31 @@
+class TableColumnUsageModel:
+    """Represents the columns of a table read or written by a stored procedure."""
+
+    table_name: str
+    read_columns: set[str]
+    written_columns: set[str]
+    uses_all_columns: bool = False  # e.g., SELECT * or INSERT without a column list
+
+    def __init__(
+        self,
+        table_name: str,
+        read_columns: set[str] = None,
+        written_columns: set[str] = None,
+        uses_all_columns: bool = False,
+    ) -> None:
+        self.table_name = table_name
+        self.read_columns = read_columns if read_columns is not None else set()
+        self.written_columns = written_columns if written_columns is not None else set()
+        self.uses_all_columns = uses_all_columns
+
+    @property
+    def used_columns(self) -> set[str]:
+        return self.read_columns | self.written_columns
+
+    def to_dict(self):
+        return {
+            "table_name": self.table_name,
+            "read_columns": sorted(self.read_columns),
+            "written_columns": sorted(self.written_columns),
+            "uses_all_columns": self.uses_all_columns,
+        }
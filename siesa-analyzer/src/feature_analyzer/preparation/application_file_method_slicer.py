@@ -0,0 +1,287 @@
+import bisect
+import logging
+import re
+
+
+class ApplicationFileMethodSlicer:
+    """
+    Reduces a Java or JavaScript application file to the methods to analyze: the requested
+    methods, the helper methods and fields of the file they use (transitively), the imports,
+    and the declarations of the classes or objects containing them. The code left out is
+    marked with `// ...`.
+
+    The file is split with a lightweight brace scanner (string literals and comments are
+    skipped), not a full Java or JavaScript parser. Calls are resolved by name only, so a
+    helper is kept whenever a method of the slice mentions its name. When the file cannot be
+    split or none of the methods is found, it is returned as is.
+    """
+
+    _parameters = r"\((?:[^()]|\([^()]*\))*\)"
+    _function_patterns = [
+        # function name(...), function* name(...)
+        re.compile(rf"\bfunction\s*\*?\s*(?P<name>[\w$]+)\s*{_parameters}$"),
+        # name: function(...), name = function(...)
+        re.compile(
+            rf"(?P<name>[\w$]+)\s*[:=]\s*(?:async\s+)?function\b\s*\*?\s*[\w$]*\s*{_parameters}$"
+        ),
+        # name = (...) =>, name: async x =>
+        re.compile(
+            rf"(?P<name>[\w$]+)\s*[:=]\s*(?:async\s*)?(?:{_parameters}|[\w$]+)\s*=>$"
+        ),
+        # Java methods and constructors, JavaScript class methods
+        re.compile(
+            rf"(?P<name>[\w$]+)\s*{_parameters}\s*(?:throws\s+[\w$.,\s]+)?$"
+        ),
+    ]
+    _anonymous_class_pattern = re.compile(rf"\bnew\s+[\w$.<>, ]+\s*{_parameters}$")
+    _control_keywords = {
+        "if", "for", "while", "switch", "catch", "synchronized", "try", "else", "do",
+        "finally", "return", "with", "function",
+    }
+    _field_pattern = re.compile(r"(?P<name>[\w$]+)\s*(?:\[\s*\]\s*)*=$")
+    _header_statement_pattern = re.compile(r"^(?:package|import)\b")
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(__name__)
+
+    def slice(self, file_name: str, content: str, method_names: list[str]) -> str:
+        """
+        Slices the file to the given methods and the code they depend on.
+
+        Args:
+            file_name (str): The name of the file, for logging.
+            content (str): The content of the file.
+            method_names (list[str]): The methods to keep.
+
+        Returns:
+            str: The sliced content, or the original content if it could not be sliced.
+        """
+        if not content or not method_names:
+            return content
+
+        masked_content = self.mask(content)
+        blocks = self.__find_blocks(masked_content)
+        if blocks is None:
+            self.logger.warning(
+                f"⚠️ Unbalanced braces in {file_name}, sending the whole file."
+            )
+            return content
+
+        functions: dict[int, str] = {}  # open brace -> name
+        for open_index in blocks:
+            name = self.__get_function_name(
+                self.__get_header(masked_content, open_index)
+            )
+            if name:
+                functions[open_index] = name
+        fields, nested_functions = self.__scan_members(masked_content, functions)
+        # Nested functions, such as callbacks, are kept along with their parent function
+        for index in nested_functions:
+            del functions[index]
+
+        pending = [index for index, name in functions.items() if name in method_names]
+        missing_methods = set(method_names) - {functions[index] for index in pending}
+        if missing_methods:
+            self.logger.warning(
+                f"⚠️ Methods not found in {file_name}: {sorted(missing_methods)}"
+            )
+        if not pending:
+            return content
+
+        # Transitive closure of the helper methods and fields used by the kept methods
+        kept_functions: set[int] = set()
+        kept_fields: set[tuple[int, int]] = set()
+        while pending:
+            open_index = pending.pop()
+            if open_index in kept_functions:
+                continue
+            kept_functions.add(open_index)
+
+            identifiers = set(
+                re.findall(r"[\w$]+", masked_content[open_index : blocks[open_index]])
+            )
+            pending.extend(
+                index
+                for index, name in functions.items()
+                if name in identifiers and index not in kept_functions
+            )
+            kept_fields.update(
+                span for span, name in fields.items() if name in identifiers
+            )
+
+        spans = [
+            (self.__get_header_start(masked_content, index), blocks[index] + 1)
+            for index in kept_functions
+        ]
+        spans.extend(kept_fields)
+        spans.extend(
+            span
+            for span, name in fields.items()
+            if self._header_statement_pattern.match(name)
+        )
+        # Declarations and closing braces of the classes or objects containing the kept code
+        for open_index, close_index in blocks.items():
+            if open_index in kept_functions:
+                continue
+            if any(
+                open_index < index and blocks[index] < close_index
+                for index in kept_functions
+            ):
+                spans.append(
+                    (self.__get_header_start(masked_content, open_index), open_index + 1)
+                )
+                spans.append((close_index, close_index + 1))
+
+        return self.__render(content, spans)
+
+    def mask(self, content: str) -> str:
+        """Replaces the comments and string literals with spaces, keeping the positions and line breaks."""
+        characters = list(content)
+        index = 0
+        length = len(content)
+        while index < length:
+            char = content[index]
+            next_char = content[index + 1 : index + 2]
+            if char == "/" and next_char == "/":
+                end = content.find("\n", index)
+                end = length if end == -1 else end
+            elif char == "/" and next_char == "*":
+                end = content.find("*/", index + 2)
+                end = length if end == -1 else end + 2
+            elif char in "\"'`":
+                end = self.__find_literal_end(content, index)
+            else:
+                index += 1
+                continue
+
+            for position in range(index, end):
+                if characters[position] != "\n":
+                    characters[position] = " "
+            index = end
+        return "".join(characters)
+
+    def __find_blocks(self, masked_content: str) -> dict[int, int] | None:
+        """Returns the position of the closing brace of each opening brace, or None when unbalanced."""
+        blocks: dict[int, int] = {}
+        stack: list[int] = []
+        for index, char in enumerate(masked_content):
+            if char == "{":
+                stack.append(index)
+            elif char == "}":
+                if not stack:
+                    return None
+                blocks[stack.pop()] = index
+        return blocks if not stack else None
+
+    def __scan_members(
+        self, masked_content: str, functions: dict[int, str]
+    ) -> tuple[dict[tuple[int, int], str], set[int]]:
+        """
+        Finds the statements outside the functions (fields, variables, imports) and the
+        functions nested in other functions.
+
+        Returns:
+            tuple[dict[tuple[int, int], str], set[int]]: The statements keyed by their span, with the
+                name they declare (the statement itself for imports), and the opening braces of the
+                nested functions.
+        """
+        fields: dict[tuple[int, int], str] = {}
+        nested_functions: set[int] = set()
+        scopes: list[bool] = []  # Whether each open block is a function
+        function_scopes = 0
+        start = 0
+        for index, char in enumerate(masked_content):
+            if char == "{":
+                is_function = index in functions
+                if is_function and function_scopes > 0:
+                    nested_functions.add(index)
+                scopes.append(is_function)
+                function_scopes += is_function
+                start = index + 1
+            elif char == "}":
+                function_scopes -= scopes.pop() if scopes else False
+                start = index + 1
+            elif char == ";":
+                segment = masked_content[start:index]
+                statement = " ".join(segment.split())
+                if function_scopes == 0 and statement:
+                    span = (start + len(segment) - len(segment.lstrip()), index + 1)
+                    if self._header_statement_pattern.match(statement):
+                        fields[span] = statement
+                    else:
+                        match = self._field_pattern.search(statement.split("=")[0] + "=")
+                        if match:
+                            fields[span] = match.group("name")
+                start = index + 1
+        return fields, nested_functions
+
+    def __get_function_name(self, header: str) -> str | None:
+        if self._anonymous_class_pattern.search(header):
+            return None
+        for pattern in self._function_patterns:
+            match = pattern.search(header)
+            if match and match.group("name") not in self._control_keywords:
+                return match.group("name")
+        return None
+
+    def __get_header(self, masked_content: str, open_index: int) -> str:
+        start = self.__get_header_start(masked_content, open_index)
+        return " ".join(masked_content[start:open_index].split())
+
+    def __get_header_start(self, masked_content: str, open_index: int) -> int:
+        """Returns the start of the declaration before an opening brace, after the previous statement or block."""
+        start = (
+            max(masked_content.rfind(delimiter, 0, open_index) for delimiter in ";{}")
+            + 1
+        )
+        # Object literal properties are separated by commas
+        comma = masked_content.rfind(",", start, open_index)
+        if comma != -1 and masked_content.count(
+            "(", comma, open_index
+        ) == masked_content.count(")", comma, open_index):
+            start = comma + 1
+        while start < open_index and masked_content[start].isspace():
+            start += 1
+        return start
+
+    def __render(self, content: str, spans: list[tuple[int, int]]) -> str:
+        line_starts = [0] + [index + 1 for index, char in enumerate(content) if char == "\n"]
+        lines = content.split("\n")
+
+        kept_lines: set[int] = set()
+        for start, end in spans:
+            first_line = bisect.bisect_right(line_starts, start) - 1
+            last_line = bisect.bisect_right(line_starts, max(start, end - 1)) - 1
+            kept_lines.update(range(first_line, last_line + 1))
+
+        sliced_lines: list[str] = []
+        previous_line = -1
+        for line_number in sorted(kept_lines):
+            line = lines[line_number]
+            skipped_lines = lines[previous_line + 1 : line_number]
+            # Only blank lines left out don't need a marker
+            if any(skipped_line.strip() for skipped_line in skipped_lines):
+                indentation = line[: len(line) - len(line.lstrip())]
+                sliced_lines.append(f"{indentation}// ...")
+            sliced_lines.append(line)
+            previous_line = line_number
+        if any(line.strip() for line in lines[previous_line + 1 :]):
+            sliced_lines.append("// ...")
+        return "\n".join(sliced_lines)
+
+    def __find_literal_end(self, content: str, start: int) -> int:
+        """Returns the index after the string literal starting at `start`."""
+        quote = content[start]
+        index = start + 1
+        while index < len(content):
+            char = content[index]
+            if char == "\\":
+                index += 2
+                continue
+            if char == quote:
+                return index + 1
+            # Only template literals span several lines
+            if char == "\n" and quote != "`":
+                return index
+            index += 1
+        return index
@@ -40,6 +40,7 @@ class FilesHandlerService:
         self,
         application_files_dir_path: str,
         application_files_names_to_consider: list[str],
+        application_files_methods: dict[str, list[str]] = None,
     ) -> list[ApplicationFileModel]:
         """
         Creates a mapping of application files to their content.
@@ -47,11 +48,13 @@ class FilesHandlerService:
         Args:
             application_file_dir (str): The directory containing the application files.
             application_files_to_consider (list[str]): The list of application file names to consider.
+            application_files_methods (dict[str, list[str]], optional): The methods to focus on, per file name.
 
         Returns:
             list[ApplicationFileModel]: A list of ApplicationFileModel instances.
         """
         application_files_mapping = []
+        application_files_methods = application_files_methods or {}
         all_files_path = self.__get_all_files_from_path(
             application_files_dir_path, recursive=True
         )
@@ -65,7 +68,8 @@ class FilesHandlerService:
                         ApplicationFileModel(
                             file_name=file_name,
                             file_content=content,
-                            method_names=self.__get_method_list(file_name),
+                            method_names=application_files_methods.get(file_name)
+                            or None,
                         )
                     )
 
@@ -125,19 +129,35 @@ class FilesHandlerService:
         except Exception as e:
             print(f"Error writing to {file_path}: {e}")
 
-    def __get_method_list(self, file_name: str) -> list[str]:
-        switcher = {
-            "ControladorNomLiqProTiemposBasicos.java": ["handle"],
-            "nomNomLiqProTiemposBasicos.js": None,
-            "AdministradoresNomina3Mngr.java": [
-                "procesarNomLiqProTiemposBasicos",
-                "consultarNomLiqProLiquidaciones",
-                "consultaTotalLiq",
-            ],
-            "ConsultantesNomina3_2Mngr.java": ["consultarW0050ParametrosNomina"],
-        }
-
-        return switcher.get(file_name, [])
+    def append_output_section(self, content: str, file_path: str) -> None:
+        """
+        Appends the given content to the specified file, used when the content is streamed.
+
+        Args:
+            content (str): The content to append.
+            file_path (str): The full path to the output file.
+        """
+        try:
+            with open(file_path, "a", encoding="utf-8") as f:
+                f.write(content)
+        except Exception as e:
+            print(f"Error appending to {file_path}: {e}")
+
+    def discard_output_section_tail(self, content: str, file_path: str) -> None:
+        """
+        Removes the given content from the end of the specified file, used when a streamed
+        content is streamed again.
+
+        Args:
+            content (str): The content last appended to the file.
+            file_path (str): The full path to the output file.
+        """
+        try:
+            with open(file_path, "r+b") as f:
+                f.seek(0, os.SEEK_END)
+                f.truncate(max(0, f.tell() - len(content.encode("utf-8"))))
+        except Exception as e:
+            print(f"Error discarding content from {file_path}: {e}")
 
     def __read_content_from_file(self, content_path: str) -> str:
         """
@@ -4,12 +4,16 @@ import chardet
 from feature_analyzer.models.data_wrapper_model import DataWrapperModel
 from feature_analyzer.common.step_execution_interface import StepExecutionInterface
 from feature_analyzer.models.application_files_model import ApplicationFileModel
+from feature_analyzer.preparation.application_file_method_slicer import (
+    ApplicationFileMethodSlicer,
+)
 
 
 class MapFilesStepService(StepExecutionInterface):
 
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.method_slicer = ApplicationFileMethodSlicer()
 
     def execute(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
         try:
@@ -25,6 +29,7 @@ class MapFilesStepService(StepExecutionInterface):
             data_wrapper.output_app_files_mapping = self.__create_application_files_mapping(
                 application_files_dir_path=data_wrapper.application_files_dir_path,
                 application_files_names_to_consider=data_wrapper.application_files_names_to_consider,
+                application_files_methods=data_wrapper.application_files_methods,
             )
 
         except Exception as error:
@@ -63,13 +68,16 @@ class MapFilesStepService(StepExecutionInterface):
         self,
         application_files_dir_path: str,
         application_files_names_to_consider: list[str],
+        application_files_methods: dict[str, list[str]],
     ) -> list[ApplicationFileModel]:
         """
-        Creates a mapping of application files to their content.
+        Creates a mapping of application files to their content. The files with methods to focus
+        on are reduced to these methods and the fields and helper methods they use.
 
         Args:
             application_file_dir (str): The directory containing the application files.
             application_files_to_consider (list[str]): The list of application file names to consider.
+            application_files_methods (dict[str, list[str]]): The methods to focus on, per file name.
 
         Returns:
             list[ApplicationFileModel]: A list of ApplicationFileModel instances.
@@ -84,29 +92,34 @@ class MapFilesStepService(StepExecutionInterface):
             if file_name in application_files_names_to_consider:
                 content = self.__read_content_from_file(file_path)
                 if content:
+                    method_names = application_files_methods.get(file_name) or None
                     application_files_mapping.append(
                         ApplicationFileModel(
                             file_name=file_name,
-                            file_content=content,
-                            method_names=self.__get_method_list(file_name),
+                            file_content=self.__slice_content(
+                                file_name, content, method_names
+                            ),
+                            method_names=method_names,
                         )
                     )
 
         return application_files_mapping
 
-    def __get_method_list(self, file_name: str) -> list[str]:
-        switcher = {
-            "ControladorNomLiqProTiemposBasicos.java": ["handle"],
-            "nomNomLiqProTiemposBasicos.js": None,
-            "AdministradoresNomina3Mngr.java": [
-                "procesarNomLiqProTiemposBasicos",
-                "consultarNomLiqProLiquidaciones",
-                "consultaTotalLiq",
-            ],
-            "ConsultantesNomina3_2Mngr.java": ["consultarW0050ParametrosNomina"],
-        }
-
-        return switcher.get(file_name, [])
+    def __slice_content(
+        self, file_name: str, content: str, method_names: list[str] | None
+    ) -> str:
+        """Reduces the file to the methods to focus on, the whole file is kept when there are none."""
+        if not method_names:
+            return content
+
+        sliced_content = self.method_slicer.slice(file_name, content, method_names)
+        if sliced_content is not content:
+            self.logger.info(
+                f"Application file {file_name} sliced to {len(sliced_content.splitlines())} of "
+                f"{len(content.splitlines())} lines ({len(sliced_content)} of {len(content)} characters) "
+                f"for methods {method_names}."
+            )
+        return sliced_content
 
     def __read_content_from_file(self, content_path: str) -> str:
         """
@@ -1,7 +1,10 @@
 import logging
+from typing import Optional
+import tiktoken
 from feature_analyzer.models.procedure_model import ProcedureModel
 from feature_analyzer.models.data_wrapper_model import DataWrapperModel
 from feature_analyzer.preparation.sql_script_sanitizer import SqlScriptSanitizer
+from feature_analyzer.preparation.sql_script_minifier import SqlScriptMinifier
 from feature_analyzer.preparation.procedure_content_analyzer import (
     ProcedureContentAnalyzer,
 )
@@ -12,6 +15,10 @@ from feature_analyzer.models.procedure_analysis_result_model import (
 from feature_analyzer.preparation.procedures_execution_graph_generator import (
     ProceduresExecutionGraphGenerator,
 )
+from feature_analyzer.preparation.procedure_callee_summarizer import (
+    ProcedureCalleeSummarizer,
+)
+from generativeai.prompter_registry import prompter_registry_instance
 from feature_analyzer.common.step_execution_interface import StepExecutionInterface
 
 
@@ -25,10 +32,18 @@ class MapProceduresContentStepService(StepExecutionInterface):
         Initializes the PrepareProceduresContentService with the specified tiktoken model.
         """
         self.sql_sanitizer = SqlScriptSanitizer()
+        self.sql_minifier = None
+        if app_config_instance.procedure_minification_enabled:
+            self.sql_minifier = SqlScriptMinifier()
+            self.tokenizer = tiktoken.encoding_for_model(
+                app_config_instance.prepare_procedures_tiktoken_model
+            )
         self.procedure_analyzer = ProcedureContentAnalyzer(
             app_config_instance.prepare_procedures_tiktoken_model
         )
         self.execution_graph_generator = ProceduresExecutionGraphGenerator()
+        # Created when the step executes, so its prompter is only built when used
+        self.callee_summarizer: Optional[ProcedureCalleeSummarizer] = None
         self.logger = logging.getLogger(__name__)
 
     def execute(self, data_wrapper: DataWrapperModel) -> DataWrapperModel:
@@ -49,11 +64,27 @@ class MapProceduresContentStepService(StepExecutionInterface):
                     continue
 
                 sanitized_content = self.sql_sanitizer.sanitize_sql_script(content)
+                minified_script = None
+                if self.sql_minifier is not None:
+                    minified_script = self.sql_minifier.minify(sanitized_content)
+
                 procedure_model: ProcedureModel = (
                     self.procedure_analyzer.analyze_content(
-                        file_path, sanitized_content
+                        file_path,
+                        (
+                            minified_script.content
+                            if minified_script is not None
+                            else sanitized_content
+                        ),
                     )
                 )
+                if minified_script is not None:
+                    procedure_model.original_line_numbers = minified_script.line_numbers
+                    self.__log_tokens_saved(
+                        procedure_model.procedure_name,
+                        len(self.tokenizer.encode(sanitized_content)),
+                        procedure_model.tokens,
+                    )
                 result.append(procedure_model)
 
             data_wrapper.output_procedures_mapping = result
@@ -66,7 +97,30 @@ class MapProceduresContentStepService(StepExecutionInterface):
 
             data_wrapper.output_procedure_analysis_result = procedure_content_mapping
 
+            if app_config_instance.procedure_callee_summaries_enabled:
+                if self.callee_summarizer is None:
+                    self.callee_summarizer = ProcedureCalleeSummarizer(
+                        prompter_registry_instance.get_prompter(
+                            model=app_config_instance.procedure_summaries_llm_model,
+                            use_agent=False,
+                        ),
+                        max_fan_in=app_config_instance.consolidation_max_fan_in,
+                    )
+                self.callee_summarizer.summarize(procedure_content_mapping)
+
         except Exception as error:
             self.logger.error(f"❌ Error on preparing the procedures content: {error}.")
 
         return data_wrapper
+
+    def __log_tokens_saved(
+        self, procedure_name: str, sanitized_tokens: int, minified_tokens: int
+    ) -> None:
+        if sanitized_tokens == 0:
+            return
+
+        saved_tokens = sanitized_tokens - minified_tokens
+        self.logger.info(
+            f"Minification reduced procedure {procedure_name} from {sanitized_tokens} to {minified_tokens} tokens "
+            f"({saved_tokens} tokens saved, {saved_tokens / sanitized_tokens:.0%})."
+        )
@@ -79,6 +79,10 @@ class MapTablesContentStepService(StepExecutionInterface):
                         content=table_content,
                         tokens=tokens,
                         new_name_convention=new_name_convention_mapping.get(table_name),
+                        columns=self.table_content_parser.extract_columns(statement),
+                        foreign_keys=self.table_content_parser.extract_foreign_keys(
+                            statement
+                        ),
                     )
 
                     tables.append(table)
@@ -1,4 +1,7 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from common.app_config import app_config_instance
+from generativeai.http_transport import http_transport_pool_instance
 from feature_analyzer.models.data_wrapper_model import DataWrapperModel
 from feature_analyzer.common.step_execution_interface import (
     StepExecutionInterface,
@@ -25,9 +28,21 @@ class PreparationPhaseService(PhaseExecutionInterface):
             MapProceduresContentStepService(),
         ]
 
-        for step in preparation_steps:
-            self.logger.info(f"Using preparation step: {step.__class__.__name__}")
-            data_wrapper = step.execute(data_wrapper)
+        # Warm up the LLM connections while the files are being prepared
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            warm_up_future = executor.submit(
+                http_transport_pool_instance.warm_up,
+                app_config_instance.get_llm_endpoints(),
+            )
+
+            for step in preparation_steps:
+                self.logger.info(f"Using preparation step: {step.__class__.__name__}")
+                data_wrapper = step.execute(data_wrapper)
+
+            try:
+                warm_up_future.result()
+            except Exception as error:
+                self.logger.warning(f"⚠️ Error warming up LLM connections: {error}")
 
         self.logger.info("Preparation process completed.")
 
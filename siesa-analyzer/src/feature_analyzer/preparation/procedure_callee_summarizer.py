@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from feature_analyzer.common.chunked_prompt_executor import ChunkedPromptExecutor
+from feature_analyzer.models.procedure_analysis_result_model import (
+    ProcedureAnalysisResultModel,
+)
+from feature_analyzer.preparation.prompts.procedure_summary_prompt import (
+    ProcedureSummaryPrompt,
+)
+from generativeai.prompter_interface import PrompterInterface
+
+
+class ProcedureCalleeSummarizer:
+    """
+    Summarizes the procedures bottom-up along the call graph: the callees are summarized
+    first (reverse topological order), and the prompt of each procedure carries the compact
+    summaries of its callees instead of their code. The procedures of a level, which don't
+    depend on each other, are summarized in parallel.
+
+    The summaries are cached by the hash of the procedure content and its callees summaries,
+    so a procedure is summarized only once across the analyses of this process.
+    """
+
+    def __init__(
+        self, prompter: PrompterInterface, max_workers: int = 10, max_fan_in: int = 8
+    ) -> None:
+        """
+        Initializes the summarizer.
+
+        Args:
+            prompter (PrompterInterface): The prompter generating the summaries.
+            max_workers (int): The number of procedures of a level summarized in parallel.
+            max_fan_in (int): The number of partial summaries merged at once for oversized procedures.
+        """
+        self.prompter = prompter
+        self.chunked_prompt_executor = ChunkedPromptExecutor(
+            prompter, max_fan_in=max_fan_in
+        )
+        self.max_workers = max_workers
+        self.summaries_cache: dict[str, str] = {}
+        self.cache_lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def summarize(self, procedures: list[ProcedureAnalysisResultModel]) -> None:
+        """
+        Sets the `llm_summary` and the `callees_summary` of each procedure.
+
+        Args:
+            procedures (list[ProcedureAnalysisResultModel]): The procedures of the call graph.
+        """
+        procedures_by_name: dict[str, ProcedureAnalysisResultModel] = {}
+        for procedure in procedures:
+            procedures_by_name.setdefault(procedure.procedure_name, procedure)
+
+        callees_by_procedure = {
+            name: [
+                callee
+                for callee in dict.fromkeys(procedure.callee_names)
+                if callee in procedures_by_name and callee != name
+            ]
+            for name, procedure in procedures_by_name.items()
+        }
+        levels = self.get_levels(callees_by_procedure)
+        self.logger.info(
+            f"Summarizing {len(procedures_by_name)} procedures in {len(levels)} levels of the call graph..."
+        )
+
+        for level in levels:
+            for name in level:
+                procedures_by_name[name].callees_summary = "\n".join(
+                    f"- {callee}: {procedures_by_name[callee].llm_summary}"
+                    for callee in callees_by_procedure[name]
+                    if procedures_by_name[callee].llm_summary
+                )
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self._summarize_procedure, procedures_by_name[name]
+                    ): name
+                    for name in level
+                }
+
+                for future in as_completed(futures):
+                    try:
+                        procedures_by_name[futures[future]].llm_summary = future.result()
+                    except Exception as e:
+                        # The callers of the procedure are summarized without it
+                        self.logger.error(
+                            f"❌ Error summarizing procedure {futures[future]}: {e}"
+                        )
+
+    def get_levels(self, callees_by_procedure: dict[str, list[str]]) -> list[list[str]]:
+        """
+        Groups the procedures in reverse topological order: each level only calls procedures
+        of the previous levels. The procedures in a call cycle are grouped in a last level.
+
+        Args:
+            callees_by_procedure (dict[str, list[str]]): The callees of each procedure.
+
+        Returns:
+            list[list[str]]: The procedure names of each level, sorted.
+        """
+        pending = {
+            name: set(callees) for name, callees in callees_by_procedure.items()
+        }
+        levels = []
+        while pending:
+            level = sorted(name for name, callees in pending.items() if not callees)
+            if not level:
+                self.logger.warning(
+                    f"⚠️ Call cycle between procedures, summarizing them together: {sorted(pending)}"
+                )
+                levels.append(sorted(pending))
+                break
+
+            levels.append(level)
+            for name in level:
+                del pending[name]
+            for callees in pending.values():
+                callees.difference_update(level)
+        return levels
+
+    def _summarize_procedure(self, procedure: ProcedureAnalysisResultModel) -> str:
+        cache_key = hashlib.sha256(
+            "\n".join(
+                [procedure.procedure_orignal_content, procedure.callees_summary]
+            ).encode("utf-8")
+        ).hexdigest()
+        with self.cache_lock:
+            cached_summary = self.summaries_cache.get(cache_key)
+        if cached_summary is not None:
+            self.logger.info(f"Reusing the summary of procedure: {procedure.procedure_name}")
+            return cached_summary
+
+        # Oversized procedures are split and their partial summaries concatenated
+        summary = self.chunked_prompt_executor.execute(
+            content=procedure.procedure_orignal_content,
+            create_prompt=lambda content: ProcedureSummaryPrompt(
+                procedure_name=procedure.procedure_name,
+                procedure_content=content,
+                callees_summary=procedure.callees_summary,
+            ),
+            create_reduce_prompt=None,
+            content_name=procedure.procedure_name,
+        ).strip()
+
+        with self.cache_lock:
+            self.summaries_cache[cache_key] = summary
+        return summary
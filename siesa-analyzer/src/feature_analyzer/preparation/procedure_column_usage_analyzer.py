@@ -0,0 +1,342 @@
+import re
+from typing import Optional
+from feature_analyzer.models.database_table_model import (
+    DatabaseTableModel,
+    DatabaseColumnModel,
+)
+from feature_analyzer.models.table_column_usage_model import TableColumnUsageModel
+
+
+class ProcedureColumnUsageAnalyzer:
+    """
+    Finds the columns of each table a stored procedure reads or writes, so the tables can be
+    sent to the LLM with only those columns (plus their keys) instead of their full
+    CREATE TABLE statement.
+
+    The procedure is split into statements, the table aliases of each statement are resolved
+    and its identifiers are matched against the columns of its tables: `alias.column` goes
+    to the table of the alias, a bare column to every table of the statement defining it.
+    The columns of the INSERT column lists and of the UPDATE SET clauses are written, the
+    others are read. This is a lightweight tokenizer, not a full T-SQL parser: when in doubt
+    a column is kept, and `SELECT *` or an INSERT without column list keeps the whole table.
+    """
+
+    _token_pattern = re.compile(
+        r"[\w@#$]+(?:\s*\.\s*(?:[\w@#$]+|\*))*|\(|\)|;|,|=|\*"
+    )
+    # Keywords starting a new statement when found outside parentheses
+    _statement_keywords = {
+        "SELECT", "INSERT", "UPDATE", "DELETE", "MERGE", "WITH", "IF", "ELSE", "WHILE",
+        "DECLARE", "SET", "BEGIN", "END", "RETURN", "EXEC", "EXECUTE", "PRINT", "GO",
+        "TRUNCATE", "OPEN", "FETCH", "CLOSE", "DEALLOCATE", "RAISERROR", "THROW",
+    }
+    # Keywords a statement absorbs instead of being split, e.g. INSERT ... SELECT
+    _absorbed_keywords = {
+        "INSERT": {"SELECT", "EXEC", "EXECUTE"},
+        "UPDATE": {"SET"},
+        "WITH": {"SELECT", "INSERT", "UPDATE", "DELETE", "MERGE"},
+    }
+    _set_operators = {"UNION", "ALL", "EXCEPT", "INTERSECT"}
+    _table_keywords = {"FROM", "JOIN", "UPDATE", "INTO", "MERGE", "USING", "APPLY"}
+    _clause_keywords = {
+        "SELECT", "FROM", "WHERE", "SET", "VALUES", "OUTPUT", "GROUP", "ORDER", "HAVING",
+        "ON", "WHEN", "THEN", "INTO", "USING",
+    }
+    _reserved_words = (
+        _statement_keywords
+        | _set_operators
+        | _table_keywords
+        | _clause_keywords
+        | {
+            "AS", "INNER", "LEFT", "RIGHT", "FULL", "CROSS", "OUTER", "AND", "OR", "NOT",
+            "NULL", "IS", "IN", "EXISTS", "BETWEEN", "LIKE", "CASE", "ELSE", "TOP",
+            "DISTINCT", "BY", "OPTION", "PIVOT", "UNPIVOT", "MATCHED", "TARGET", "SOURCE",
+        }
+    )
+    _foreign_key_pattern = re.compile(
+        r"FOREIGN\s+KEY\s*\(([^)]*)\)", re.IGNORECASE
+    )
+    _precision_scale_types = {"DECIMAL", "NUMERIC"}
+
+    def analyze(
+        self, procedure_content: str, tables: list[DatabaseTableModel]
+    ) -> dict[str, TableColumnUsageModel]:
+        """
+        Finds the columns of the tables read or written by the procedure.
+
+        Args:
+            procedure_content (str): The content of the stored procedure.
+            tables (list[DatabaseTableModel]): The tables referenced by the procedure.
+
+        Returns:
+            dict[str, TableColumnUsageModel]: The usage of each table, keyed by table name.
+        """
+        tables_by_name: dict[str, DatabaseTableModel] = {}
+        for table in tables:
+            tables_by_name.setdefault(self.__normalize_name(table.name), table)
+        usages = {
+            table.name: TableColumnUsageModel(table_name=table.name)
+            for table in tables_by_name.values()
+        }
+
+        for statement in self.split_statements(procedure_content):
+            self.__analyze_statement(statement, tables_by_name, usages)
+
+        return usages
+
+    def split_statements(self, procedure_content: str) -> list[list[str]]:
+        """
+        Splits the procedure into the tokens of its statements, without comments and string literals.
+
+        Args:
+            procedure_content (str): The content of the stored procedure.
+
+        Returns:
+            list[list[str]]: The tokens of each statement.
+        """
+        content = re.sub(r"/\*.*?\*/", " ", procedure_content, flags=re.DOTALL)
+        content = re.sub(r"--[^\n]*", " ", content)
+        content = re.sub(r"N?'(?:[^']|'')*'", " '' ", content)
+        content = re.sub(r"\[([^\]\n]*)\]", r"\1", content)
+        tokens = [
+            re.sub(r"\s+", "", token) for token in self._token_pattern.findall(content)
+        ]
+
+        statements: list[list[str]] = []
+        current: list[str] = []
+        absorbed: set[str] = set()
+        depth = 0
+        # The ELSE and END of CASE expressions don't end the statement
+        case_depth = 0
+        for index, token in enumerate(tokens):
+            keyword = token.upper()
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth = max(0, depth - 1)
+            elif keyword == "CASE":
+                case_depth += 1
+            elif keyword == "END" and case_depth > 0:
+                case_depth -= 1
+            elif token == ";" and not self.__is_merge(current):
+                # MERGE statements hold several DML keywords and always end with ;
+                statements.append(current)
+                current, absorbed, depth, case_depth = [], set(), 0, 0
+                continue
+            elif (
+                depth == 0
+                and case_depth == 0
+                and keyword in self._statement_keywords
+                and not self.__is_merge(current)
+                and not (keyword == "WITH" and tokens[index + 1 : index + 2] == ["("])
+            ):
+                previous = current[-1].upper() if current else ""
+                if keyword in absorbed:
+                    absorbed = self._absorbed_keywords.get(keyword, set())
+                elif not (keyword == "SELECT" and previous in self._set_operators):
+                    statements.append(current)
+                    current = []
+                    absorbed = self._absorbed_keywords.get(keyword, set())
+            current.append(token)
+
+        statements.append(current)
+        return [statement for statement in statements if statement]
+
+    def get_pruned_table_content(
+        self, table: DatabaseTableModel, usage: Optional[TableColumnUsageModel]
+    ) -> str:
+        """
+        Builds the CREATE TABLE statement of the table with only the columns used by the
+        procedure and the key columns.
+
+        Args:
+            table (DatabaseTableModel): The table, with its parsed columns.
+            usage (Optional[TableColumnUsageModel]): The columns of the table used by the procedure.
+
+        Returns:
+            str: The pruned CREATE TABLE statement, or the original content when the columns of the
+                table are unknown or all of them are used.
+        """
+        if not table.columns or usage is None or usage.uses_all_columns:
+            return table.content
+
+        key_names = {
+            name.strip().strip("[]").lower()
+            for columns in self._foreign_key_pattern.findall(table.content)
+            for name in columns.split(",")
+        }
+        used_names = {name.lower() for name in usage.used_columns}
+        kept_columns = [
+            column
+            for column in table.columns
+            if column.is_primary_key
+            or column.name.lower() in key_names
+            or column.name.lower() in used_names
+        ]
+        if len(kept_columns) == len(table.columns):
+            return table.content
+
+        definitions = [self.__format_column(column) for column in kept_columns]
+        primary_key_names = [
+            f"[{column.name}]" for column in table.columns if column.is_primary_key
+        ]
+        if primary_key_names:
+            definitions.append(f"PRIMARY KEY ({', '.join(primary_key_names)})")
+
+        omitted_count = len(table.columns) - len(kept_columns)
+        omitted_label = "column" if omitted_count == 1 else "columns"
+        return (
+            f"CREATE TABLE [{table.name}] (\n    "
+            + ",\n    ".join(definitions)
+            + f"\n    -- {omitted_count} more {omitted_label} not used by the procedure\n);"
+        )
+
+    def __analyze_statement(
+        self,
+        tokens: list[str],
+        tables_by_name: dict[str, DatabaseTableModel],
+        usages: dict[str, TableColumnUsageModel],
+    ) -> None:
+        aliases = self.__resolve_aliases(tokens, tables_by_name)
+        statement_tables = list(dict.fromkeys(aliases.values()))
+        if not statement_tables:
+            return
+
+        columns_by_table = {
+            table.name: {column.name.lower(): column.name for column in table.columns}
+            for table in statement_tables
+        }
+        insert_columns = self.__get_insert_column_indexes(tokens, aliases, usages)
+        clause = tokens[0].upper()
+        # The clause around each subquery is restored when it ends
+        clauses: list[str] = []
+
+        for index, token in enumerate(tokens):
+            keyword = token.upper()
+            if token == "(":
+                clauses.append(clause)
+                continue
+            if token == ")":
+                clause = clauses.pop() if clauses else clause
+                continue
+            if keyword in self._clause_keywords:
+                clause = keyword
+                continue
+
+            if token == "*" or token.endswith(".*"):
+                previous = tokens[index - 1].upper() if index > 0 else ""
+                if token == "*" and previous not in {"SELECT", ",", "DISTINCT"}:
+                    # Multiplications and COUNT(*)
+                    continue
+                qualifier = token[:-2].lower() if token.endswith(".*") else None
+                for table in statement_tables:
+                    if qualifier is None or aliases.get(qualifier) is table:
+                        usages[table.name].uses_all_columns = True
+                continue
+
+            if not re.match(r"[A-Za-z_]", token) or keyword in self._reserved_words:
+                continue
+
+            is_written = index in insert_columns or (
+                clause == "SET"
+                and index > 0
+                and tokens[index - 1].upper() in {"SET", ","}
+                and tokens[index + 1 : index + 2] == ["="]
+            )
+            qualifier, _, column_name = token.rpartition(".")
+            if qualifier:
+                table = aliases.get(qualifier.lower().split(".")[-1])
+                candidates = [table] if table is not None else []
+            else:
+                candidates = statement_tables
+
+            for table in candidates:
+                column = columns_by_table[table.name].get(column_name.lower())
+                if column is None:
+                    continue
+                if is_written:
+                    usages[table.name].written_columns.add(column)
+                else:
+                    usages[table.name].read_columns.add(column)
+
+    def __resolve_aliases(
+        self, tokens: list[str], tables_by_name: dict[str, DatabaseTableModel]
+    ) -> dict[str, DatabaseTableModel]:
+        """Maps the names and aliases of the known tables of the statement to the tables."""
+        aliases: dict[str, DatabaseTableModel] = {}
+        index = 0
+        while index < len(tokens):
+            keyword = tokens[index].upper()
+            is_table_reference = keyword in self._table_keywords or (
+                keyword == "DELETE" and tokens[index + 1 : index + 2] != ["FROM"]
+            )
+            index += 1
+            while is_table_reference and index < len(tokens):
+                table = tables_by_name.get(self.__normalize_name(tokens[index]))
+                if table is None:
+                    break
+
+                aliases[self.__normalize_name(tokens[index])] = table
+                index += 1
+                if index < len(tokens) and tokens[index].upper() == "AS":
+                    index += 1
+                if (
+                    index < len(tokens)
+                    and re.match(r"[A-Za-z_]\w*$", tokens[index])
+                    and tokens[index].upper() not in self._reserved_words
+                ):
+                    aliases[tokens[index].lower()] = table
+                    index += 1
+
+                # Comma-separated FROM lists, e.g. FROM t1 a, t2 b
+                is_table_reference = index < len(tokens) and tokens[index] == ","
+                if is_table_reference:
+                    index += 1
+        return aliases
+
+    def __get_insert_column_indexes(
+        self,
+        tokens: list[str],
+        aliases: dict[str, DatabaseTableModel],
+        usages: dict[str, TableColumnUsageModel],
+    ) -> set[int]:
+        """Returns the token indexes of the INSERT column list, marking as fully written the tables without one."""
+        indexes: set[int] = set()
+        for index in range(len(tokens) - 1):
+            if tokens[index].upper() != "INTO" or index == 0:
+                continue
+            if tokens[index - 1].upper() != "INSERT":
+                continue
+            table = aliases.get(self.__normalize_name(tokens[index + 1]))
+            if table is None:
+                continue
+
+            if tokens[index + 2 : index + 3] != ["("]:
+                # INSERT INTO t VALUES/SELECT writes every column
+                usages[table.name].uses_all_columns = True
+                continue
+
+            position = index + 3
+            while position < len(tokens) and tokens[position] != ")":
+                indexes.add(position)
+                position += 1
+        return indexes
+
+    def __is_merge(self, tokens: list[str]) -> bool:
+        return bool(tokens) and tokens[0].upper() == "MERGE"
+
+    def __normalize_name(self, name: str) -> str:
+        # Schema and database are left out: dbo.t120_mc_items -> t120_mc_items
+        return name.strip().strip("[]").split(".")[-1].strip("[]").lower()
+
+    def __format_column(self, column: DatabaseColumnModel) -> str:
+        data_type = column.data_type
+        if column.data_type in self._precision_scale_types and column.precision is not None:
+            data_type = f"{column.data_type}({column.precision},{column.scale or 0})"
+        elif column.precision is not None:
+            data_type = f"{column.data_type}({column.precision})"
+        elif column.length is not None:
+            data_type = f"{column.data_type}({'MAX' if column.length == -1 else column.length})"
+
+        nullability = "NULL" if column.is_nullable else "NOT NULL"
+        return f"[{column.name}] {data_type} {nullability}"
@@ -0,0 +1,167 @@
+import re
+from typing import Callable
+
+
+class ProcedureContentChunker:
+    """
+    Splits oversized procedure contents into chunks that fit in a token budget.
+
+    Chunks are cut at statement boundaries, preferring the shallowest BEGIN/END (and
+    CASE/END) nesting level, so each chunk keeps whole blocks whenever possible. A single
+    statement larger than the budget is split by lines as a last resort, and a single line
+    larger than the budget at whitespace, or by characters when a word doesn't fit either.
+    """
+
+    _block_start_pattern = re.compile(
+        r"\b(BEGIN(?!\s+(TRAN|TRANSACTION|DISTRIBUTED)\b)|CASE)\b", re.IGNORECASE
+    )
+    _block_end_pattern = re.compile(r"\bEND\b", re.IGNORECASE)
+    _statement_start_pattern = re.compile(
+        r"^\s*((IF|ELSE|WHILE|BEGIN|SELECT|INSERT|UPDATE|DELETE|MERGE|DECLARE|SET|EXEC|EXECUTE|RETURN|WITH|CREATE|ALTER|DROP|TRUNCATE|OPEN|FETCH|CLOSE|DEALLOCATE|GO)\b|--)",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, count_tokens: Callable[[str], int]) -> None:
+        """
+        Initializes the chunker.
+
+        Args:
+            count_tokens (Callable[[str], int]): Function counting the tokens of a text for the target model.
+        """
+        self.count_tokens = count_tokens
+
+    def split_content(self, content: str, max_tokens: int) -> list[str]:
+        """
+        Splits the content into chunks of at most `max_tokens` tokens.
+
+        Args:
+            content (str): The procedure content (optionally followed by its tables DDL).
+            max_tokens (int): The token budget of each chunk.
+
+        Returns:
+            list[str]: The chunks, in their original order.
+        """
+        if self.count_tokens(content) <= max_tokens:
+            return [content]
+
+        content_lines = content.splitlines(keepends=True)
+        lines: list[str] = []
+        line_tokens: list[int] = []
+        boundary_depths: list[int] = []
+        for line, depth in zip(
+            content_lines, self.__get_boundary_depths(content_lines)
+        ):
+            tokens = self.count_tokens(line)
+            pieces = (
+                [line] if tokens <= max_tokens else self.__split_line(line, max_tokens)
+            )
+            lines.extend(pieces)
+            line_tokens.extend(
+                [tokens] if len(pieces) == 1 else map(self.count_tokens, pieces)
+            )
+            # Only the end of the whole line may end a statement
+            boundary_depths.extend([-1] * (len(pieces) - 1) + [depth])
+
+        chunks = []
+        start = 0
+        while start < len(lines):
+            end = self.__find_chunk_end(start, line_tokens, boundary_depths, max_tokens)
+            chunks.append("".join(lines[start:end]))
+            start = end
+
+        return chunks
+
+    def __find_chunk_end(
+        self,
+        start: int,
+        line_tokens: list[int],
+        boundary_depths: list[int],
+        max_tokens: int,
+    ) -> int:
+        """Returns the exclusive end line of the chunk starting at `start`."""
+        total_tokens = 0
+        boundaries = []
+        end = start
+
+        while end < len(line_tokens) and total_tokens + line_tokens[end] <= max_tokens:
+            total_tokens += line_tokens[end]
+            end += 1
+            if boundary_depths[end - 1] >= 0:
+                boundaries.append((end, boundary_depths[end - 1], total_tokens))
+
+        if end == len(line_tokens):
+            return end
+
+        if end == start:
+            # Only when a single character is larger than the budget
+            return start + 1
+
+        if not boundaries:
+            return end
+
+        # Only boundaries past half of the budget are considered, so chunks don't get too
+        # small; among them the shallowest wins, and the latest one among equals
+        candidates = [
+            boundary for boundary in boundaries if boundary[2] >= max_tokens // 2
+        ] or boundaries
+        best_depth = min(depth for _, depth, _ in candidates)
+        return max(end for end, depth, _ in candidates if depth == best_depth)
+
+    def __split_line(self, line: str, max_tokens: int) -> list[str]:
+        """Splits a line larger than the budget into pieces that fit, at whitespace when possible."""
+        pieces = []
+        piece = ""
+        piece_tokens = 0
+        for word in re.findall(r"\s*\S+\s*", line) or [line]:
+            word_tokens = self.count_tokens(word)
+            if piece and piece_tokens + word_tokens > max_tokens:
+                pieces.append(piece)
+                piece = ""
+                piece_tokens = 0
+            if word_tokens > max_tokens:
+                pieces.extend(self.__split_characters(word, max_tokens))
+                continue
+            piece += word
+            piece_tokens += word_tokens
+
+        if piece:
+            pieces.append(piece)
+        return pieces
+
+    def __split_characters(self, text: str, max_tokens: int) -> list[str]:
+        """Splits the text into the longest windows of characters that fit in the budget."""
+        windows = []
+        while text:
+            low = 1
+            high = len(text)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self.count_tokens(text[:middle]) <= max_tokens:
+                    low = middle
+                else:
+                    high = middle - 1
+            windows.append(text[:low])
+            text = text[low:]
+        return windows
+
+    def __get_boundary_depths(self, lines: list[str]) -> list[int]:
+        """
+        Returns, for each line, the block nesting depth after it when the line ends a
+        statement, or -1 when cutting after the line would split a statement.
+        """
+        depths = []
+        depth = 0
+        for index, line in enumerate(lines):
+            code = line.split("--", 1)[0]
+            depth += len(self._block_start_pattern.findall(code))
+            depth = max(0, depth - len(self._block_end_pattern.findall(code)))
+
+            next_line = lines[index + 1] if index + 1 < len(lines) else ""
+            ends_statement = (
+                code.rstrip().endswith(";")
+                or not next_line.strip()
+                or self._statement_start_pattern.match(next_line) is not None
+            )
+            depths.append(depth if ends_statement else -1)
+
+        return depths
@@ -0,0 +1,146 @@
+import logging
+from typing import Callable, Optional
+from feature_analyzer.models.database_table_model import DatabaseTableModel
+from feature_analyzer.models.procedure_model import ProcedureModel
+from feature_analyzer.models.table_column_usage_model import TableColumnUsageModel
+from feature_analyzer.preparation.procedure_column_usage_analyzer import (
+    ProcedureColumnUsageAnalyzer,
+)
+
+
+class ProcedureTablesContextBuilder:
+    """
+    Builds the table context of the procedure prompts: the CREATE TABLE statements of the
+    tables used by each procedure. The block of a table is rendered, and its tokens counted,
+    only once; the context of a set of tables is assembled once and shared by all the
+    procedures using the same set.
+
+    The tables of a context are sorted by name, so the procedures using the same tables
+    send the exact same table context.
+
+    With column pruning, a table keeps the columns used by any procedure of the analysis,
+    plus its keys, so its block is the same in every context it is part of.
+    """
+
+    def __init__(
+        self,
+        tables: list[DatabaseTableModel],
+        count_tokens: Callable[[str], int],
+        column_usage_analyzer: Optional[ProcedureColumnUsageAnalyzer] = None,
+    ) -> None:
+        """
+        Initializes the builder.
+
+        Args:
+            tables (list[DatabaseTableModel]): The tables of the database.
+            count_tokens (Callable[[str], int]): Counts the tokens of a content.
+            column_usage_analyzer (Optional[ProcedureColumnUsageAnalyzer]): Prunes the columns not used
+                by the procedures, None to send the tables as they are.
+        """
+        self.tables_by_name: dict[str, DatabaseTableModel] = {}
+        for table in tables:
+            self.tables_by_name.setdefault(table.name, table)
+        self.count_tokens = count_tokens
+        self.column_usage_analyzer = column_usage_analyzer
+        self.column_usages: dict[str, TableColumnUsageModel] = {}
+        self.table_blocks: dict[str, tuple[str, int]] = {}
+        self.contexts: dict[tuple[str, ...], tuple[str, int]] = {}
+        self.missing_tables: set[str] = set()
+        self.logger = logging.getLogger(__name__)
+
+    def prepare(self, procedures: list[ProcedureModel]) -> None:
+        """
+        Finds the columns used by the procedures, to prune the tables of all the contexts alike.
+
+        Args:
+            procedures (list[ProcedureModel]): The procedures of the analysis.
+        """
+        if self.column_usage_analyzer is None:
+            return
+
+        for procedure in procedures:
+            tables = [
+                self.tables_by_name[table_name]
+                for table_name in procedure.table_names
+                if table_name in self.tables_by_name
+            ]
+            usages = self.column_usage_analyzer.analyze(procedure.content, tables)
+            for table_name, usage in usages.items():
+                merged_usage = self.column_usages.setdefault(
+                    table_name, TableColumnUsageModel(table_name=table_name)
+                )
+                merged_usage.read_columns |= usage.read_columns
+                merged_usage.written_columns |= usage.written_columns
+                merged_usage.uses_all_columns |= usage.uses_all_columns
+
+    def get_context(self, table_names: list[str]) -> tuple[str, int]:
+        """
+        Returns the shared context of the tables.
+
+        Args:
+            table_names (list[str]): The names of the tables used by a procedure.
+
+        Returns:
+            tuple[str, int]: The context and its number of tokens.
+        """
+        key = tuple(sorted(set(table_names)))
+        context = self.contexts.get(key)
+        if context is None:
+            blocks = [self.__get_table_block(table_name) for table_name in key]
+            context = (
+                "".join(block for block, _ in blocks),
+                sum(tokens for _, tokens in blocks),
+            )
+            self.contexts[key] = context
+        return context
+
+    def get_full_tokens(self, table_names: list[str]) -> int:
+        """Returns the tokens of the tables without pruning, from their precomputed counts."""
+        return sum(
+            self.count_tokens(self.__get_header(table_name))
+            + self.__get_table_tokens(self.tables_by_name[table_name])
+            for table_name in set(table_names)
+            if table_name in self.tables_by_name
+        )
+
+    def __get_table_block(self, table_name: str) -> tuple[str, int]:
+        block = self.table_blocks.get(table_name)
+        if block is not None:
+            return block
+
+        table = self.tables_by_name.get(table_name)
+        if table is None:
+            if table_name not in self.missing_tables:
+                self.missing_tables.add(table_name)
+                self.logger.warning(f"⚠️ Table not found: {table_name}")
+            block = ("", 0)
+        else:
+            header = self.__get_header(table_name)
+            table_content = table.content
+            table_tokens = self.__get_table_tokens(table)
+            if self.column_usage_analyzer is not None:
+                pruned_content = self.column_usage_analyzer.get_pruned_table_content(
+                    table, self.column_usages.get(table_name)
+                )
+                pruned_tokens = (
+                    self.count_tokens(pruned_content)
+                    if pruned_content is not table.content
+                    else table_tokens
+                )
+                # Small tables may take more tokens once rewritten, they are sent as is
+                if pruned_tokens < table_tokens:
+                    table_content, table_tokens = pruned_content, pruned_tokens
+
+            block = (
+                "".join([header, table_content, "\n"]),
+                self.count_tokens(header) + table_tokens,
+            )
+
+        self.table_blocks[table_name] = block
+        return block
+
+    def __get_header(self, table_name: str) -> str:
+        return f"\n-- Content of table {table_name} --\n"
+
+    def __get_table_tokens(self, table: DatabaseTableModel) -> int:
+        return table.tokens or self.count_tokens(table.content)
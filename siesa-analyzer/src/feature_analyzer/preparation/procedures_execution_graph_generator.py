@@ -1,10 +1,16 @@
 import logging
+import tiktoken
 from feature_analyzer.models.procedure_model import ProcedureModel
 from feature_analyzer.models.data_wrapper_model import DataWrapperModel
 from feature_analyzer.models.procedure_analysis_result_model import (
     ProcedureAnalysisResultModel,
 )
-from feature_analyzer.models.database_table_model import DatabaseTableModel
+from feature_analyzer.preparation.procedure_column_usage_analyzer import (
+    ProcedureColumnUsageAnalyzer,
+)
+from feature_analyzer.preparation.procedure_tables_context_builder import (
+    ProcedureTablesContextBuilder,
+)
 from typing import Set, Optional
 from common.app_config import app_config_instance
 
@@ -16,6 +22,13 @@ class ProceduresExecutionGraphGenerator:
         self.max_dependency_depth = (
             app_config_instance.max_procedure_analysis_dependency_depth
         )
+        self.column_pruning_enabled = (
+            app_config_instance.procedure_tables_column_pruning_enabled
+        )
+        self.column_usage_analyzer = ProcedureColumnUsageAnalyzer()
+        self.tokenizer = tiktoken.encoding_for_model(
+            app_config_instance.prepare_procedures_tiktoken_model
+        )
 
     def get_procedure_content_mapping(
         self, data_wrapper: DataWrapperModel
@@ -35,17 +48,40 @@ class ProceduresExecutionGraphGenerator:
             List[ProcedureAnalysisResultModel]: A list of ProcedureAnalysisResultModel objects.
         """
         processed_procedures: Set[str] = set()
-        procedure_content_mapping: list[ProcedureAnalysisResultModel] = []
+        procedures: list[ProcedureModel] = []
 
         self._get_procedure_and_dependency_content(
             data_wrapper.procedure_entry_point_name,
             data_wrapper,
             processed_procedures,
-            procedure_content_mapping,
-            data_wrapper.use_tables_in_procedure_analysis,
+            procedures,
             current_depth=1,
         )
 
+        tables_context_builder = None
+        if data_wrapper.use_tables_in_procedure_analysis:
+            # The table context is built once per set of tables, for all the procedures
+            tables_context_builder = ProcedureTablesContextBuilder(
+                data_wrapper.output_tables_mapping,
+                self.__count_tokens,
+                self.column_usage_analyzer if self.column_pruning_enabled else None,
+            )
+            tables_context_builder.prepare(procedures)
+
+        procedure_content_mapping: list[ProcedureAnalysisResultModel] = []
+        for procedure in procedures:
+            procedure_full_content, tables_context_tokens = self._get_procedure_content(
+                procedure, tables_context_builder
+            )
+            procedure_analysis_result = ProcedureAnalysisResultModel(
+                procedure_name=procedure.procedure_name,
+                procedure_orignal_content=procedure_full_content,
+                table_names=procedure.table_names,
+                callee_names=procedure.calls,
+            )
+            procedure_analysis_result.tables_context_tokens = tables_context_tokens
+            procedure_content_mapping.append(procedure_analysis_result)
+
         return procedure_content_mapping
 
     def _get_procedure_and_dependency_content(
@@ -53,22 +89,20 @@ class ProceduresExecutionGraphGenerator:
         procedure_name: str,
         data_wrapper: DataWrapperModel,
         processed_procedures: Set[str],
-        procedure_content_mapping: list[ProcedureAnalysisResultModel],
-        use_tables: bool,
+        procedures: list[ProcedureModel],
         current_depth: int,
     ) -> None:
         """
-        Recursively retrieves procedure content and dependencies.
+        Recursively retrieves the procedure and its dependencies.
 
-        This method fetches the content of the specified procedure and recursively calls itself to fetch
-        the content of its dependencies, up to a maximum depth.
+        This method fetches the specified procedure and recursively calls itself to fetch
+        its dependencies, up to a maximum depth.
 
         Args:
             procedure_name (str): The name of the procedure to retrieve.
             data_wrapper (DataWrapperModel): The data wrapper containing database information.
             processed_procedures (Set[str]): A set of procedure names that have already been processed.
-            procedure_content_mapping (List[ProcedureAnalysisResultModel]): The list to store procedure content.
-            use_tables (bool): Whether to include table content in the analysis.
+            procedures (List[ProcedureModel]): The list to store the procedures, in the order they are found.
             current_depth (int): The current recursion depth.
         """
         if (
@@ -93,16 +127,7 @@ class ProceduresExecutionGraphGenerator:
             return
 
         processed_procedures.add(procedure_name)
-        procedure_full_content = self._get_procedure_content(
-            procedure_name, procedure, data_wrapper, use_tables
-        )
-
-        procedure_analysis_result = ProcedureAnalysisResultModel(
-            procedure_name=procedure_name,
-            procedure_orignal_content=procedure_full_content,
-        )
-
-        procedure_content_mapping.append(procedure_analysis_result)
+        procedures.append(procedure)
 
         # Recursively process called procedures
         for called_procedure in procedure.calls:
@@ -110,8 +135,7 @@ class ProceduresExecutionGraphGenerator:
                 called_procedure,
                 data_wrapper,
                 processed_procedures,
-                procedure_content_mapping,
-                use_tables,
+                procedures,
                 current_depth=current_depth + 1,
             )
 
@@ -132,51 +156,51 @@ class ProceduresExecutionGraphGenerator:
 
     def _get_procedure_content(
         self,
-        procedure_name: str,
         procedure: ProcedureModel,
-        data_wrapper: DataWrapperModel,
-        use_tables: bool,
-    ) -> str:
+        tables_context_builder: Optional[ProcedureTablesContextBuilder],
+    ) -> tuple[str, int]:
         """
         Retrieves the content of a procedure, including table content if specified.
 
+        The procedure code goes first and the table content last, as the content chunker expects.
+
         Args:
-            procedure_name (str): The name of the procedure.
             procedure (ProcedureModel): The ProcedureModel object.
-            data_wrapper (DataWrapperModel): The data wrapper containing database information.
-            use_tables (bool): Whether to include table content in the analysis.
+            tables_context_builder (Optional[ProcedureTablesContextBuilder]): Builds the table content,
+                None to leave the tables out.
 
         Returns:
-            str: The content of the procedure, including table content if specified.
+            tuple[str, int]: The content of the procedure, including table content if specified, and
+                the number of tokens of the table content.
         """
-        procedure_content = procedure.content
-        content = f"\n-- Content of procedure {procedure_name} --\n" + procedure_content
+        procedure_header = f"\n-- Content of procedure {procedure.procedure_name} --\n"
+        if tables_context_builder is None:
+            return procedure_header + procedure.content, 0
 
-        if use_tables:
-            for table_name in procedure.table_names:
-                content += self._get_table_content(
-                    table_name, data_wrapper.output_tables_mapping
-                )
+        tables_context, tables_context_tokens = tables_context_builder.get_context(
+            procedure.table_names
+        )
+        if self.column_pruning_enabled:
+            self.__log_tokens_saved(
+                procedure.procedure_name,
+                tables_context_builder.get_full_tokens(procedure.table_names),
+                tables_context_tokens,
+            )
 
-        return content
+        content = "".join([procedure_header, procedure.content, tables_context])
+        return content, tables_context_tokens
 
-    def _get_table_content(
-        self, table_name: str, database_tables: list[DatabaseTableModel]
-    ) -> str:
-        """
-        Retrieves the content of a table.
+    def __count_tokens(self, content: str) -> int:
+        return len(self.tokenizer.encode(content))
 
-        Args:
-            table_name (str): The name of the table.
-            database_tables (List[DatabaseTableModel]): A list of DatabaseTableModel objects to search.
+    def __log_tokens_saved(
+        self, procedure_name: str, full_tokens: int, pruned_tokens: int
+    ) -> None:
+        if full_tokens == 0:
+            return
 
-        Returns:
-            str: The content of the table, or an empty string if not found.
-        """
-        table = next((t for t in database_tables if t.name == table_name), None)
-        if table:
-            content = f"\n-- Content of table {table_name} --\n" + table.content + "\n"
-            return content
-        else:
-            self.logger.warning(f"⚠️ Table not found: {table_name}")
-            return ""
+        saved_tokens = full_tokens - pruned_tokens
+        self.logger.info(
+            f"Column pruning sent {pruned_tokens} instead of {full_tokens} table tokens "
+            f"for procedure {procedure_name} ({saved_tokens} tokens saved, {saved_tokens / full_tokens:.0%})."
+        )
@@ -0,0 +1,47 @@
+from feature_analyzer.prompts.analyzer_prompt_interface import AnalyzerPrompt
+from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
+
+
+class ProcedureSummaryPrompt(AnalyzerPrompt):
+    def __init__(
+        self,
+        procedure_name: str,
+        procedure_content: str,
+        callees_summary: str = "",
+    ) -> None:
+        self.procedure_name = procedure_name
+        self.procedure_content = procedure_content
+        self.callees_summary = callees_summary
+
+    def get_system_message(self) -> str:
+        return """
+        You are a Database Developer specializing in T-SQL stored procedures of ERP systems. Your objective is to describe what a stored procedure does, so other analysts can understand its callers without reading its code.
+
+        Important:
+        - Be concise and precise, don't make assumptions that are not supported by the code.
+        - Write in English, as plain text without markdown.
+        """
+
+    def get_user_message(self) -> str:
+        callees_summary = (
+            f"""
+        The procedure calls these procedures, already summarized:
+        {self.callees_summary}
+        """
+            if self.callees_summary
+            else ""
+        )
+        return f"""
+        Summarize the T-SQL stored procedure `{self.procedure_name}` below:
+        ```sql
+        {self.procedure_content}
+        ```
+        {callees_summary}
+        The summary must have at most 5 sentences covering: its business purpose, its parameters, the tables it reads and writes, its side effects (including the calls to other procedures) and its result. Only provide the summary, without any additional text.
+        """
+
+    def get_messages(self) -> list[BaseMessage]:
+        return [
+            SystemMessage(content=self.get_system_message()),
+            HumanMessage(content=self.get_user_message()),
+        ]
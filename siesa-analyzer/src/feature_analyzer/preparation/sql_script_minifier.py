@@ -0,0 +1,127 @@
+import re
+from feature_analyzer.models.minified_sql_script_model import MinifiedSqlScriptModel
+
+
+class SqlScriptMinifier:
+    """
+    Reduces the tokens of a sanitized SQL script before it is sent to the LLM: removes the
+    line and block comments, collapses the whitespace and drops the GO batch separators.
+
+    Statements such as PRINT or SET NOCOUNT are kept: an IF, WHILE or ELSE without BEGIN
+    applies to the next statement, wherever its condition ends, so removing one could make
+    the following statement conditional.
+
+    Block comments may be nested, as in T-SQL. String literals, quoted and bracketed
+    identifiers are kept untouched, even across lines.
+    Each line of the minified script keeps the number of the input line it comes from.
+    """
+
+    _code_end_pattern = re.compile(r"--|/\*|['\"\[]")
+    _closing_quotes = {"'": "'", '"': '"', "[": "]"}
+    _comment_delimiter_pattern = re.compile(r"/\*|\*/")
+    _batch_separator_pattern = re.compile(r"^GO(?:\s+\d+)?\s*;?$", re.IGNORECASE)
+
+    def minify(self, sql_script: str) -> MinifiedSqlScriptModel:
+        """
+        Minifies the given SQL script.
+
+        Args:
+            sql_script (str): The sanitized SQL script.
+
+        Returns:
+            MinifiedSqlScriptModel: The minified script and the input line of each of its lines.
+        """
+        lines: list[str] = []
+        line_numbers: list[int] = []
+        closing = None  # Closing delimiter of the literal or comment left open by the previous line
+        comment_depth = 0  # Nesting level of the block comment left open by the previous line
+
+        for line_number, line in enumerate(sql_script.splitlines(), start=1):
+            starts_in_literal = closing in self._closing_quotes.values()
+            segments, closing, comment_depth = self.__split_segments(
+                line, closing, comment_depth
+            )
+            ends_in_literal = closing in self._closing_quotes.values()
+
+            minified_line = "".join(
+                self.__minify_code(text) if is_code else text
+                for is_code, text in segments
+            )
+            if not starts_in_literal:
+                minified_line = minified_line.lstrip()
+            if not ends_in_literal:
+                minified_line = minified_line.rstrip()
+
+            if not starts_in_literal and not ends_in_literal:
+                code = "".join(text for is_code, text in segments if is_code).strip()
+                if not minified_line or self._batch_separator_pattern.match(code):
+                    continue
+
+            lines.append(minified_line)
+            line_numbers.append(line_number)
+
+        return MinifiedSqlScriptModel(content="\n".join(lines), line_numbers=line_numbers)
+
+    def __split_segments(
+        self, line: str, closing: str | None, comment_depth: int
+    ) -> tuple[list[tuple[bool, str]], str | None, int]:
+        """
+        Splits a line into code and literal segments, leaving the comments out.
+
+        Returns:
+            tuple[list[tuple[bool, str]], str | None, int]: The segments (is_code, text), the closing
+                delimiter of the literal or comment still open at the end of the line and the
+                nesting level of that comment.
+        """
+        segments: list[tuple[bool, str]] = []
+        index = 0
+        literal_start = 0
+
+        while index < len(line):
+            if closing is None:
+                match = self._code_end_pattern.search(line, index)
+                end = match.start() if match else len(line)
+                self.__append_code(segments, line[index:end])
+                if match is None or match.group() == "--":
+                    break
+                if match.group() == "/*":
+                    closing = "*/"
+                    comment_depth = 1
+                    index = end + 2
+                    continue
+                closing = self._closing_quotes[match.group()]
+                literal_start = end
+                index = end + 1
+            elif closing == "*/":
+                match = self._comment_delimiter_pattern.search(line, index)
+                if match is None:
+                    break
+                comment_depth += 1 if match.group() == "/*" else -1
+                index = match.end()
+                if comment_depth == 0:
+                    # The comment still separates the code around it
+                    self.__append_code(segments, " ")
+                    closing = None
+            else:
+                end = line.find(closing, index)
+                if end == -1:
+                    segments.append((False, line[literal_start:]))
+                    break
+                if line[end + 1 : end + 2] == closing:
+                    # Escaped delimiter, e.g. 'It''s' or [a]]b]
+                    index = end + 2
+                    continue
+                segments.append((False, line[literal_start : end + 1]))
+                closing = None
+                index = end + 1
+
+        return segments, closing, comment_depth
+
+    def __append_code(self, segments: list[tuple[bool, str]], text: str) -> None:
+        if segments and segments[-1][0]:
+            segments[-1] = (True, segments[-1][1] + text)
+        else:
+            segments.append((True, text))
+
+    def __minify_code(self, code: str) -> str:
+        return re.sub(r"\s+", " ", code)
@@ -1,4 +1,8 @@
 import re
+from feature_analyzer.models.database_table_model import (
+    DatabaseColumnModel,
+    DatabaseForeignKeyModel,
+)
 
 
 class TableContentParser:
@@ -6,6 +10,28 @@ class TableContentParser:
     Responsible for parsing SQL content and extracting individual CREATE TABLE statements.
     """
 
+    _precision_scale_types = {"DECIMAL", "NUMERIC"}
+    _precision_types = {"DATETIME2", "DATETIMEOFFSET", "TIME", "FLOAT"}
+    _table_constraint_pattern = re.compile(
+        r"^(CONSTRAINT|PRIMARY\s+KEY|UNIQUE|INDEX|FOREIGN\s+KEY|CHECK|PERIOD)\b",
+        re.IGNORECASE,
+    )
+    _column_pattern = re.compile(
+        r"^(?:\[(?P<bracket_name>[^\]]+)\]|(?P<name>[\w@#$]+))\s+"
+        r"(?:\[(?P<bracket_type>[^\]]+)\]|(?P<type>\w+))"
+        r"(?:\s*\((?P<arguments>[^)]*)\))?(?P<rest>.*)$",
+        re.DOTALL,
+    )
+    _identifier = r"(?:\[[^\]]+\]|[\w@#$]+)"
+    _references_pattern = re.compile(
+        rf"\bREFERENCES\s+(?P<table>{_identifier}(?:\s*\.\s*{_identifier})*)"
+        r"\s*(?:\((?P<columns>[^)]*)\))?",
+        re.IGNORECASE,
+    )
+    _foreign_key_pattern = re.compile(
+        r"\bFOREIGN\s+KEY\s*\((?P<columns>[^)]*)\)", re.IGNORECASE
+    )
+
     def __init__(self):
         self.table_creation_pattern = re.compile(
             r";\s*(?=(CREATE TABLE))", re.IGNORECASE | re.DOTALL
@@ -36,3 +62,162 @@ class TableContentParser:
         """
         match = self.table_name_pattern.search(statement)
         return match.group(1) if match else None
+
+    def extract_columns(self, statement: str) -> list[DatabaseColumnModel]:
+        """
+        Extracts the column definitions from a CREATE TABLE statement.
+
+        Args:
+            statement (str): The CREATE TABLE statement.
+
+        Returns:
+            list[DatabaseColumnModel]: The columns, in their definition order.
+        """
+        statement = re.sub(r"--[^\n]*", "", statement)
+        body_start = statement.find("(")
+        if body_start == -1:
+            return []
+
+        columns: list[DatabaseColumnModel] = []
+        primary_key_names: set[str] = set()
+
+        for definition in self.__split_top_level(statement, body_start):
+            if self._table_constraint_pattern.match(definition):
+                primary_key = re.search(
+                    r"PRIMARY\s+KEY[^(]*\(([^)]*)\)", definition, re.IGNORECASE
+                )
+                if primary_key:
+                    primary_key_names.update(
+                        re.sub(r"\s+(ASC|DESC)\b", "", name, flags=re.IGNORECASE)
+                        .strip()
+                        .strip("[]")
+                        for name in primary_key.group(1).split(",")
+                    )
+                continue
+
+            column = self.__parse_column(definition)
+            if column:
+                columns.append(column)
+
+        for column in columns:
+            column.is_primary_key = column.is_primary_key or column.name in primary_key_names
+            if column.is_primary_key:
+                column.is_nullable = False
+
+        return columns
+
+    def extract_foreign_keys(self, statement: str) -> list[DatabaseForeignKeyModel]:
+        """
+        Extracts the FOREIGN KEY constraints from a CREATE TABLE statement, both the table
+        constraints and the REFERENCES clauses of the columns.
+
+        Args:
+            statement (str): The CREATE TABLE statement.
+
+        Returns:
+            list[DatabaseForeignKeyModel]: The foreign keys, in their definition order.
+        """
+        statement = re.sub(r"--[^\n]*", "", statement)
+        body_start = statement.find("(")
+        if body_start == -1:
+            return []
+
+        foreign_keys: list[DatabaseForeignKeyModel] = []
+        for definition in self.__split_top_level(statement, body_start):
+            references = self._references_pattern.search(definition)
+            if not references:
+                continue
+
+            if self._table_constraint_pattern.match(definition):
+                foreign_key = self._foreign_key_pattern.search(definition)
+                if not foreign_key:
+                    continue
+                column_names = self.__split_names(foreign_key.group("columns"))
+            else:
+                column = self.__parse_column(definition)
+                if not column:
+                    continue
+                column_names = [column.name]
+
+            # [dbo].[table] -> table
+            referenced_table = re.split(r"\s*\.\s*", references.group("table"))[-1]
+            foreign_keys.append(
+                DatabaseForeignKeyModel(
+                    column_names=column_names,
+                    referenced_table=referenced_table.strip("[]"),
+                    referenced_column_names=self.__split_names(
+                        references.group("columns") or ""
+                    ),
+                )
+            )
+
+        return foreign_keys
+
+    def __split_names(self, names: str) -> list[str]:
+        return [name.strip().strip("[]") for name in names.split(",") if name.strip()]
+
+    def __split_top_level(self, statement: str, body_start: int) -> list[str]:
+        """Splits the body of the CREATE TABLE statement at the commas outside parentheses."""
+        definitions = []
+        depth = 0
+        current_start = body_start + 1
+
+        for index in range(body_start, len(statement)):
+            character = statement[index]
+            if character == "(":
+                depth += 1
+            elif character == ")":
+                depth -= 1
+                if depth == 0:
+                    definitions.append(statement[current_start:index])
+                    break
+            elif character == "," and depth == 1:
+                definitions.append(statement[current_start:index])
+                current_start = index + 1
+
+        return [definition.strip() for definition in definitions if definition.strip()]
+
+    def __parse_column(self, definition: str) -> DatabaseColumnModel | None:
+        match = self._column_pattern.match(definition)
+        if not match:
+            return None
+
+        data_type = (match.group("bracket_type") or match.group("type")).upper()
+        if data_type == "AS":
+            # Computed columns have no data type of their own
+            return None
+
+        column = DatabaseColumnModel(
+            name=match.group("bracket_name") or match.group("name"),
+            data_type=data_type,
+            is_nullable=re.search(r"\bNOT\s+NULL\b", match.group("rest"), re.IGNORECASE)
+            is None,
+            is_primary_key=re.search(
+                r"\bPRIMARY\s+KEY\b", match.group("rest"), re.IGNORECASE
+            )
+            is not None,
+        )
+
+        arguments = [
+            argument.strip()
+            for argument in (match.group("arguments") or "").split(",")
+            if argument.strip()
+        ]
+        if not arguments or not (
+            arguments[0].isdigit() or arguments[0].upper() == "MAX"
+        ):
+            return column
+
+        if data_type in self._precision_scale_types:
+            column.precision = int(arguments[0])
+            column.scale = (
+                int(arguments[1]) if len(arguments) > 1 and arguments[1].isdigit() else 0
+            )
+        elif data_type in self._precision_types:
+            column.precision = int(arguments[0])
+        elif arguments[0].upper() == "MAX":
+            column.length = -1
+        else:
+            column.length = int(arguments[0])
+
+        return column
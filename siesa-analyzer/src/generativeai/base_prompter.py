@@ -1,5 +1,12 @@
-from retry import retry
-from langchain_core.messages import HumanMessage, SystemMessage, BaseMessage, AnyMessage
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+    BaseMessage,
+    AnyMessage,
+)
+import copy
+import threading
 from langchain.chat_models.base import BaseChatModel
 from pydantic import BaseModel
 from generativeai.prompter_interface import PrompterInterface
@@ -9,74 +16,85 @@ from generativeai.prompter_agent_tools import (
     log_step,
     write_class_content_to_file,
 )
-from typing import Any, Callable, Union, Dict
+from typing import Any, Awaitable, Callable, Optional, Union, Dict
 from collections.abc import Sequence
 from langchain_core.tools import BaseTool
+from langchain_core.runnables import Runnable
+from langgraph.graph.state import CompiledStateGraph
 from prompter.base import ConfigAuthentication
+from generativeai.llm_response_cache import (
+    LLMResponseCache,
+    llm_response_cache_instance,
+)
+from generativeai.llm_concurrency_governor import llm_concurrency_governor_instance
+from generativeai.llm_retry_policy import llm_retry_executor_instance
+from generativeai.llm_token_budget import llm_token_budget_instance
 
 
 class BasePrompter(PrompterInterface):
     model_instance: BaseChatModel
+    model_runnable: Runnable
     use_agent: bool
     config_auth: ConfigAuthentication
+    model_name: str
+    temperature: float
+    endpoint: str
+    structured_output_class: BaseModel
 
     def __init__(self, config_auth: ConfigAuthentication, use_agent: bool) -> None:
         self.config_auth = config_auth
         self.use_agent = use_agent
+        self.model_name = getattr(self.model_instance, "model_name", None)
+        self.temperature = getattr(self.model_instance, "temperature", None)
+        self.endpoint = (
+            getattr(self.model_instance, "api_url", None)
+            or getattr(self.model_instance, "openai_api_base", None)
+            or self.model_name
+        )
+        self.structured_output_class = None
+        self.model_runnable = self.model_instance
+        self.has_bound_tools = False
+        self._agent = None
+        self._agent_lock = threading.Lock()
 
-        if self.use_agent:
-            self.agent = create_react_agent(
-                model=self.model_instance,
-                tools=[write_partial_result, log_step, write_class_content_to_file],
-                debug=False,
-            )
+    @property
+    def agent(self) -> CompiledStateGraph:
+        """The ReAct agent graph, compiled on first use."""
+        with self._agent_lock:
+            if self._agent is None:
+                self._agent = create_react_agent(
+                    model=self.model_instance,
+                    tools=[write_partial_result, log_step, write_class_content_to_file],
+                    debug=False,
+                    response_format=self.structured_output_class,
+                )
+
+            return self._agent
 
     def get_config_auth(self) -> ConfigAuthentication:
         """Returns the configuration authentication object."""
         return self.config_auth
 
-    @retry(tries=1, delay=10)
     def invoke_llm(
         self, system_message: str, prompt: str, recursion_limit: int = 100
     ) -> AnyMessage:
         """Invokes the language model with a system message and a prompt."""
+        messages = [
+            SystemMessage(content=system_message),
+            HumanMessage(content=prompt),
+        ]
 
-        if self.use_agent:
-            response = self.agent.invoke(
-                {
-                    "messages": [
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": prompt},
-                    ]
-                },
-                {"recursion_limit": recursion_limit},
-            )
-            return response["messages"][-1].content
-
-        response = self.model_instance.invoke(
-            [
-                SystemMessage(content=system_message),
-                HumanMessage(content=prompt),
-            ]
+        return self._invoke_with_cache(
+            messages, lambda: self.__invoke_messages(messages, recursion_limit)
         )
 
-        return response
-
-    @retry(tries=1, delay=10)
     def invoke_llm_with_messages(
         self, messages: list[BaseMessage], recursion_limit: int = 200
     ) -> AnyMessage:
         """Invokes the language model with a list of messages."""
-        if self.use_agent:
-            response = self.agent.invoke(
-                {"messages": messages},
-                {"recursion_limit": recursion_limit},
-            )
-            # Return the last message in the response
-            return response["messages"][-1].content
-
-        response = self.model_instance.invoke(messages)
-        return response
+        return self._invoke_with_cache(
+            messages, lambda: self.__invoke_messages(messages, recursion_limit)
+        )
 
     def get_content_from_invoke_llm_with_messages(
         self, messages: list[BaseMessage], recursion_limit: int = 200
@@ -88,36 +106,286 @@ class BasePrompter(PrompterInterface):
 
         return result_message.content
 
-    @retry(tries=1, delay=10)
+    def stream_content_from_llm_with_messages(
+        self,
+        messages: list[BaseMessage],
+        on_chunk: Callable[[str], None],
+        recursion_limit: int = 200,
+        on_discard: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Streams the response content of the language model, calling `on_chunk` for every
+        received chunk. Agents and cached responses are delivered as a single chunk.
+
+        When an attempt fails, `on_discard` is called with the content it streamed before the
+        response is streamed again. Without `on_discard`, the chunks of each attempt are only
+        delivered once it succeeds.
+        """
+        if self.use_agent:
+            content = self.get_content_from_invoke_llm_with_messages(
+                messages, recursion_limit
+            )
+            on_chunk(content)
+            return content
+
+        streamed_chunks = []
+
+        def stream_message() -> AIMessage:
+            # A retried attempt streams the response again from the start
+            if streamed_chunks and on_discard is not None:
+                on_discard("".join(streamed_chunks))
+            streamed_chunks.clear()
+            for chunk in self.model_instance.stream(messages):
+                if chunk.content:
+                    if on_discard is not None:
+                        on_chunk(chunk.content)
+                    streamed_chunks.append(chunk.content)
+
+            return AIMessage(content="".join(streamed_chunks))
+
+        message = self._invoke_with_cache(messages, stream_message)
+        # Cache hits were not streamed, and without `on_discard` the chunks were held back
+        if not streamed_chunks or on_discard is None:
+            on_chunk(message.content)
+
+        return message.content
+
     def get_structured_output_from_llm(
         self, messages: list[BaseMessage], recursion_limit: int = 200
     ) -> BaseModel:
         """Retrieves a structured output from the language model based on a list of messages."""
+
+        def invoke_structured() -> BaseModel:
+            if self.use_agent:
+                response = self.agent.invoke(
+                    {"messages": messages},
+                    {"recursion_limit": recursion_limit},
+                )
+                return response["structured_response"]
+
+            return self.model_runnable.invoke(messages)
+
+        return self._invoke_with_cache(messages, invoke_structured)
+
+    async def ainvoke_llm(
+        self, system_message: str, prompt: str, recursion_limit: int = 100
+    ) -> AnyMessage:
+        """Asynchronously invokes the language model with a system message and a prompt."""
+        messages = [
+            SystemMessage(content=system_message),
+            HumanMessage(content=prompt),
+        ]
+
+        return await self._ainvoke_with_cache(
+            messages, lambda: self.__ainvoke_messages(messages, recursion_limit)
+        )
+
+    async def ainvoke_llm_with_messages(
+        self, messages: list[BaseMessage], recursion_limit: int = 200
+    ) -> AnyMessage:
+        """Asynchronously invokes the language model with a list of messages."""
+        return await self._ainvoke_with_cache(
+            messages, lambda: self.__ainvoke_messages(messages, recursion_limit)
+        )
+
+    async def aget_structured_output_from_llm(
+        self, messages: list[BaseMessage], recursion_limit: int = 200
+    ) -> BaseModel:
+        """Asynchronously retrieves a structured output from the language model based on a list of messages."""
+
+        async def ainvoke_structured() -> BaseModel:
+            if self.use_agent:
+                response = await self.agent.ainvoke(
+                    {"messages": messages},
+                    {"recursion_limit": recursion_limit},
+                )
+                return response["structured_response"]
+
+            return await self.model_runnable.ainvoke(messages)
+
+        return await self._ainvoke_with_cache(messages, ainvoke_structured)
+
+    def _invoke_with_cache(
+        self, messages: list[BaseMessage], invoke: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns the cached response for the messages when available, otherwise invokes
+        the model and stores its response according to the configured cache mode.
+
+        Agent and tool calls are never cached: their tools have side effects, such as
+        writing the generated class files, that a cached response would skip.
+        """
+        cache = llm_response_cache_instance
+        if not self.__is_cacheable(cache):
+            return self._invoke_governed(messages, invoke)
+
+        cache_key = cache.build_key(
+            model_name=self.model_name,
+            temperature=self.temperature,
+            messages=messages,
+            structured_output_class=self.structured_output_class,
+            use_agent=self.use_agent,
+        )
+
+        cached_response = cache.get(cache_key, self.structured_output_class)
+        if cached_response is not None:
+            return cached_response
+
+        response = self._invoke_governed(messages, invoke)
+        cache.put(cache_key, self.model_name, response)
+
+        return response
+
+    def _invoke_governed(
+        self, messages: list[BaseMessage], invoke: Callable[[], Any]
+    ) -> Any:
+        """
+        Invokes the model once the concurrency governor grants a slot for it, retrying
+        failed attempts according to the retry policy (each attempt takes a new slot).
+        """
+        governor = llm_concurrency_governor_instance
+        prompt_tokens = self.__check_token_budget(messages)
+
+        def invoke_attempt() -> Any:
+            with governor.acquire(
+                self.model_name, messages, prompt_tokens
+            ) as estimated_tokens:
+                response = invoke()
+
+            governor.record_usage(self.model_name, response, estimated_tokens)
+            return response
+
+        return llm_retry_executor_instance.execute(self.endpoint, invoke_attempt)
+
+    async def _ainvoke_with_cache(
+        self, messages: list[BaseMessage], ainvoke: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Async counterpart of `_invoke_with_cache`."""
+        cache = llm_response_cache_instance
+        if not self.__is_cacheable(cache):
+            return await self._ainvoke_governed(messages, ainvoke)
+
+        cache_key = cache.build_key(
+            model_name=self.model_name,
+            temperature=self.temperature,
+            messages=messages,
+            structured_output_class=self.structured_output_class,
+            use_agent=self.use_agent,
+        )
+
+        cached_response = cache.get(cache_key, self.structured_output_class)
+        if cached_response is not None:
+            return cached_response
+
+        response = await self._ainvoke_governed(messages, ainvoke)
+        cache.put(cache_key, self.model_name, response)
+
+        return response
+
+    def __is_cacheable(self, cache: LLMResponseCache) -> bool:
+        if self.use_agent or self.has_bound_tools:
+            return False
+
+        return cache.is_readable() or cache.is_writable()
+
+    async def _ainvoke_governed(
+        self, messages: list[BaseMessage], ainvoke: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Async counterpart of `_invoke_governed`."""
+        governor = llm_concurrency_governor_instance
+        prompt_tokens = self.__check_token_budget(messages)
+
+        async def ainvoke_attempt() -> Any:
+            async with governor.aacquire(
+                self.model_name, messages, prompt_tokens
+            ) as estimated_tokens:
+                response = await ainvoke()
+
+            governor.record_usage(self.model_name, response, estimated_tokens)
+            return response
+
+        return await llm_retry_executor_instance.aexecute(self.endpoint, ainvoke_attempt)
+
+    def estimate_tokens(self, messages: list[BaseMessage]) -> int:
+        """Estimates the prompt tokens of the messages for the model of this prompter."""
+        return llm_concurrency_governor_instance.estimate_tokens(
+            self.model_name, messages
+        )
+
+    def count_tokens(self, text: str) -> int:
+        """Counts the tokens of a text for the model of this prompter."""
+        return llm_concurrency_governor_instance.count_text_tokens(
+            self.model_name, text
+        )
+
+    def get_prompt_token_budget(self) -> int:
+        """Returns the maximum number of prompt tokens the model of this prompter can take."""
+        return llm_token_budget_instance.get_prompt_budget(
+            self.model_name, getattr(self.model_instance, "max_tokens", None)
+        )
+
+    def __check_token_budget(self, messages: list[BaseMessage]) -> int:
+        """Fails before sending a prompt that cannot fit in the context window, returning its estimated tokens."""
+        prompt_tokens = self.estimate_tokens(messages)
+        llm_token_budget_instance.check(
+            self.model_name,
+            prompt_tokens,
+            getattr(self.model_instance, "max_tokens", None),
+        )
+        return prompt_tokens
+
+    def __invoke_messages(
+        self, messages: list[BaseMessage], recursion_limit: int
+    ) -> AnyMessage:
         if self.use_agent:
             response = self.agent.invoke(
                 {"messages": messages},
                 {"recursion_limit": recursion_limit},
             )
-            return response["structured_response"]
+            # Return the last message in the response
+            return response["messages"][-1].content
 
-        return self.model_instance.invoke(messages)
+        return self.model_runnable.invoke(messages)
+
+    async def __ainvoke_messages(
+        self, messages: list[BaseMessage], recursion_limit: int
+    ) -> AnyMessage:
+        if self.use_agent:
+            response = await self.agent.ainvoke(
+                {"messages": messages},
+                {"recursion_limit": recursion_limit},
+            )
+            return response["messages"][-1].content
+
+        return await self.model_runnable.ainvoke(messages)
 
     def bind_model(self, structured_output_class: BaseModel) -> None:
         """Binds a new model to the Prompter instance."""
-        if self.use_agent:
-            self.agent = create_react_agent(
-                model=self.model_instance,
-                tools=[write_partial_result, log_step, write_class_content_to_file],
-                debug=False,
-                response_format=structured_output_class,
+        self.structured_output_class = structured_output_class
+        self._agent = None
+
+        if not self.use_agent:
+            self.model_runnable = self.model_instance.with_structured_output(
+                structured_output_class
             )
-            return
 
-        self.model_instance = self.model_instance.with_structured_output(
-            structured_output_class
-        )
+    def with_structured_output(
+        self, structured_output_class: BaseModel
+    ) -> PrompterInterface:
+        """
+        Returns a derived prompter bound to the structured output class. The chat model
+        is shared with this prompter, which is left unchanged.
+        """
+        derived_prompter = copy.copy(self)
+        derived_prompter._agent_lock = threading.Lock()
+        derived_prompter.bind_model(structured_output_class)
+
+        return derived_prompter
 
     def bind_tools(
         self, tools: Sequence[Union[Dict[str, Any], type, Callable, BaseTool]]
     ) -> None:
         self.model_instance = self.model_instance.bind_tools(tools)
+        self.model_runnable = self.model_instance
+        self.has_bound_tools = True
+        self._agent = None
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import json
-import requests
 from typing import (
     Any,
     Dict,
@@ -14,11 +13,12 @@ from typing import (
     Callable,
 )
 from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
     CallbackManagerForLLMRun,
 )
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
-from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
 from pydantic import BaseModel, Field, SecretStr
 from typing import (
     Any,
@@ -57,13 +57,18 @@ from langchain_google_genai._function_utils import (
     is_basemodel_subclass_safe,
     tool_to_dict,
 )
+from generativeai.http_transport import http_transport_pool_instance
+
+FLOW_GEMINI_API_URL = (
+    "https://flow.ciandt.com/ai-orchestration-api/v1/google/generateContent"
+)
 
 
 class FlowGeminiChatModel(BaseChatModel):
     """Custom LLM wrapper for the specific Gemini API endpoint."""
 
     api_url: str = Field(
-        "https://flow.ciandt.com/ai-orchestration-api/v1/google/generateContent",
+        FLOW_GEMINI_API_URL,
         description="The API endpoint URL.",
     )
     api_token: Optional[SecretStr] = Field(None, description="The FLOW token.")
@@ -75,8 +80,14 @@ class FlowGeminiChatModel(BaseChatModel):
     )
     max_tokens: int = Field(default=65000, description="Maximum tokens to generate.")
     temperature: float = Field(default=0.0, description="Sampling temperature.")
-    top_p: float = Field(default=0.9, description="Top P sampling.")
-    top_k: int = Field(default=250, description="Top K sampling.")
+    top_p: Optional[float] = Field(default=None, description="Top P sampling.")
+    top_k: Optional[int] = Field(default=None, description="Top K sampling.")
+    stop_sequences: Optional[List[str]] = Field(
+        default=None, description="Sequences that stop the generation."
+    )
+    thinking_budget: Optional[int] = Field(
+        default=None, description="Token budget for the model thinking."
+    )
 
     @property
     def _llm_type(self) -> str:
@@ -126,32 +137,80 @@ class FlowGeminiChatModel(BaseChatModel):
     ) -> Dict[str, Any]:
         """
         Creates the payload for the Gemini API request.
+
+        System messages are sent as `systemInstruction` and consecutive messages of the
+        same role are merged into a single turn, as expected by the Gemini API.
         """
+        system_parts = []
         contents = []
         for message in messages:
-            contents.append({"role": "user", "parts": [{"text": message.content}]})
-            if isinstance(message, HumanMessage) or isinstance(message, SystemMessage):
-                contents.append({"role": "user", "parts": [{"text": message.content}]})
+            part = {"text": self._get_message_text(message)}
+
+            if isinstance(message, SystemMessage):
+                system_parts.append(part)
+                continue
+
+            if isinstance(message, HumanMessage):
+                role = "user"
             elif isinstance(message, AIMessage):
-                contents.append(
-                    {"role": "model", "parts": [{"text": message.content}]}
-                )  # Assuming 'model' role for AI messages
-            # elif isinstance(message, SystemMessage):
-            #     contents.append({"role": "system", "parts": [{"text": message.content}]})
+                role = "model"
             else:
                 raise ValueError(f"Unsupported message type: {type(message)}")
 
+            if contents and contents[-1]["role"] == role:
+                contents[-1]["parts"].append(part)
+            else:
+                contents.append({"role": role, "parts": [part]})
+
+        # Gemini requires at least one turn, so a lone system prompt is sent as the user turn
+        if not contents and system_parts:
+            contents.append({"role": "user", "parts": system_parts})
+            system_parts = []
+
         payload = {
             "contents": contents,
             "allowedModels": [self.model_name],
             "model": self.model_name,
-            "generationConfig": {  # Add generation config
-                "maxOutputTokens": self.max_tokens,
-                "temperature": self.temperature,
-            },
+            "generationConfig": self._create_generation_config(stop_sequences),
         }
+        if system_parts:
+            payload["systemInstruction"] = {"parts": system_parts}
+
         return payload
 
+    def _create_generation_config(
+        self, stop_sequences: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Creates the generation config, leaving out the parameters that are not set."""
+        generation_config = {
+            "maxOutputTokens": self.max_tokens,
+            "temperature": self.temperature,
+        }
+
+        stop_sequences = stop_sequences or self.stop_sequences
+        if stop_sequences:
+            generation_config["stopSequences"] = stop_sequences
+        if self.top_p is not None:
+            generation_config["topP"] = self.top_p
+        if self.top_k is not None:
+            generation_config["topK"] = self.top_k
+        if self.thinking_budget is not None:
+            generation_config["thinkingConfig"] = {
+                "thinkingBudget": self.thinking_budget
+            }
+
+        return generation_config
+
+    def _get_message_text(self, message: BaseMessage) -> str:
+        """Returns the text of the message, joining the text blocks of multi-part contents."""
+        if isinstance(message.content, str):
+            return message.content
+
+        return "".join(
+            block if isinstance(block, str) else block.get("text", "")
+            for block in message.content
+        )
+
     def _create_headers(self) -> Dict[str, str]:
         """Creates the headers for the API request."""
         if not self.api_token:  # Add check in case validation somehow failed
@@ -176,13 +235,110 @@ class FlowGeminiChatModel(BaseChatModel):
         payload = self._create_payload(messages, stop)
         headers = self._create_headers()
 
-        response = requests.post(
-            self.api_url, headers=headers, json=payload, timeout=1200
-        )
+        # The pooled client keeps the connections alive across requests and threads
+        client = http_transport_pool_instance.get_client(self.api_url)
+        response = client.post(self.api_url, headers=headers, json=payload)
         response.raise_for_status()
 
-        result = response.json()
+        return self._create_chat_result(response.json())
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Override the _agenerate method to send the request without blocking a thread."""
+
+        payload = self._create_payload(messages, stop)
+        headers = self._create_headers()
+
+        client = http_transport_pool_instance.get_async_client(self.api_url)
+        response = await client.post(self.api_url, headers=headers, json=payload)
+        response.raise_for_status()
+
+        return self._create_chat_result(response.json())
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """Streams the response chunks using the streamGenerateContent endpoint (server-sent events)."""
+
+        payload = self._create_payload(messages, stop)
+        headers = self._create_headers()
+        stream_url = self._get_stream_api_url()
+
+        client = http_transport_pool_instance.get_client(stream_url)
+        with client.stream(
+            "POST", stream_url, headers=headers, json=payload, params={"alt": "sse"}
+        ) as response:
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+
+                result = json.loads(line[len("data:") :].strip())
+                chunk = self._create_generation_chunk(result)
+                if chunk is None:
+                    continue
+
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+
+    def _get_stream_api_url(self) -> str:
+        """Returns the streaming counterpart of the configured generateContent endpoint."""
+        base_url, separator, method = self.api_url.rpartition("generateContent")
+        if not separator:
+            raise ValueError(f"Cannot derive the streaming endpoint from {self.api_url}.")
+
+        return f"{base_url}streamGenerateContent{method}"
+
+    def _create_generation_chunk(
+        self, result: Dict[str, Any]
+    ) -> Optional[ChatGenerationChunk]:
+        """Converts a streamed API response event into a generation chunk."""
+        candidates = result.get("candidates", [])
+        usage_metadata = result.get("usageMetadata")
+        if not candidates and not usage_metadata:
+            return None
+
+        candidate = candidates[0] if candidates else {}
+        parts = candidate.get("content", {}).get("parts", [])
+        content = "".join(part.get("text", "") for part in parts)
+
+        message = AIMessageChunk(
+            content=content,
+            response_metadata=(
+                {
+                    "model": result.get("modelVersion"),
+                    "finish_reason": candidate.get("finishReason"),
+                    "responseId": result.get("responseId"),
+                }
+                if candidate.get("finishReason")
+                else {}
+            ),
+            usage_metadata=(
+                {
+                    "input_tokens": usage_metadata.get("promptTokenCount", 0),
+                    "output_tokens": usage_metadata.get("candidatesTokenCount", 0),
+                    "total_tokens": usage_metadata.get("totalTokenCount", 0),
+                }
+                if usage_metadata and candidate.get("finishReason")
+                else None
+            ),
+        )
+
+        return ChatGenerationChunk(message=message)
 
+    def _create_chat_result(self, result: Dict[str, Any]) -> ChatResult:
+        """Converts the API response into a ChatResult."""
         # Adapting to the new response format
         # Assuming the response contains 'candidates' which contain 'content'
         candidates = result.get("candidates", [])
@@ -240,4 +396,5 @@ class FlowGeminiChatModel(BaseChatModel):
             "temperature": self.temperature,
             "top_p": self.top_p,
             "top_k": self.top_k,
+            "thinking_budget": self.thinking_budget,
         }
@@ -0,0 +1,187 @@
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urlsplit
+import httpx
+
+
+class HttpTransportPool:
+    """
+    Shared, thread-safe pool of HTTP clients used by the prompters.
+
+    One `httpx.Client` is kept per endpoint origin (scheme + host + port), so every worker
+    thread talking to the same LLM endpoint reuses the same keep-alive connections instead
+    of paying a new TCP + TLS handshake per request. HTTP/2 is used when the `h2` package
+    is installed.
+
+    Async clients are bound to the event loop that uses them, so they are kept per event
+    loop and origin.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HttpTransportPool, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._clients = {}
+            cls._instance._async_clients = weakref.WeakKeyDictionary()
+            # Sized from the concurrency governor once the analysis is configured
+            cls._instance.max_connections = 20
+            cls._instance.max_async_connections = 100
+            cls._instance.keepalive_expiry_seconds = 120.0
+            cls._instance.request_timeout_seconds = 1200.0
+            cls._instance.connect_timeout_seconds = 30.0
+            cls._instance.http2_enabled = True
+            cls._instance.logger = logging.getLogger(__name__)
+        return cls._instance
+
+    def configure(
+        self,
+        max_connections: int,
+        max_async_connections: int = 100,
+        keepalive_expiry_seconds: float = 120.0,
+        http2_enabled: bool = True,
+    ) -> None:
+        """
+        Applies the pool settings. Clients created before this call are closed, so the
+        next request of each endpoint opens a pool with the new limits.
+
+        Args:
+            max_connections (int): Maximum connections per endpoint, usually the maximum concurrency of the LLM calls.
+            max_async_connections (int): Maximum connections per endpoint of each event loop.
+            keepalive_expiry_seconds (float): Time an idle connection is kept open.
+            http2_enabled (bool): Whether HTTP/2 should be negotiated when available.
+        """
+        with self._lock:
+            self.max_connections = max_connections
+            self.max_async_connections = max_async_connections
+            self.keepalive_expiry_seconds = keepalive_expiry_seconds
+            self.http2_enabled = http2_enabled
+            self.__close_clients()
+
+    def get_client(self, endpoint: Optional[str]) -> httpx.Client:
+        """
+        Returns the shared client for the origin of the endpoint, creating it on first use.
+
+        Args:
+            endpoint (str): Any URL of the endpoint. None maps to a client without a fixed origin.
+
+        Returns:
+            httpx.Client: The pooled client.
+        """
+        origin = self.__get_origin(endpoint)
+
+        with self._lock:
+            client = self._clients.get(origin)
+            if client is None or client.is_closed:
+                client = self.__create_client()
+                self._clients[origin] = client
+
+            return client
+
+    def get_async_client(self, endpoint: Optional[str]) -> httpx.AsyncClient:
+        """
+        Returns the shared async client for the origin of the endpoint in the running event loop.
+
+        Args:
+            endpoint (str): Any URL of the endpoint. None maps to a client without a fixed origin.
+
+        Returns:
+            httpx.AsyncClient: The pooled async client.
+        """
+        origin = self.__get_origin(endpoint)
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            loop_clients = self._async_clients.setdefault(loop, {})
+            client = loop_clients.get(origin)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    **self.__get_client_settings(self.max_async_connections)
+                )
+                loop_clients[origin] = client
+
+            return client
+
+    def warm_up(self, endpoints: list[str], connections_per_endpoint: int = 4) -> None:
+        """
+        Opens connections to the endpoints ahead of the first LLM calls. Each connection is
+        opened by a GET on the root of the endpoint origin, which carries no credentials and
+        never reaches the LLM API; its response is ignored. Failures are only logged, since
+        the real requests open their own connections anyway.
+
+        Args:
+            endpoints (list[str]): URLs of the endpoints to warm up.
+            connections_per_endpoint (int): Number of concurrent connections opened per endpoint.
+        """
+        endpoints = list(dict.fromkeys(endpoint for endpoint in endpoints if endpoint))
+        if not endpoints:
+            return
+
+        connections_per_endpoint = max(
+            1, min(connections_per_endpoint, self.max_connections)
+        )
+        requests_to_send = [
+            endpoint
+            for endpoint in endpoints
+            for _ in range(connections_per_endpoint)
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(requests_to_send)) as executor:
+            list(executor.map(self.__open_connection, requests_to_send))
+
+        self.logger.info(f"Warmed up HTTP connections for {len(endpoints)} LLM endpoints.")
+
+    def close(self) -> None:
+        """Closes every pooled client."""
+        with self._lock:
+            self.__close_clients()
+
+    def __open_connection(self, endpoint: str) -> None:
+        try:
+            self.get_client(endpoint).get(
+                f"{self.__get_origin(endpoint)}/", timeout=self.connect_timeout_seconds
+            )
+        except httpx.HTTPError as error:
+            self.logger.warning(f"⚠️ Could not warm up connection to {endpoint}: {error}")
+
+    def __create_client(self) -> httpx.Client:
+        return httpx.Client(**self.__get_client_settings(self.max_connections))
+
+    def __get_client_settings(self, max_connections: int) -> dict:
+        return dict(
+            http2=self.http2_enabled and self.__is_http2_available(),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=self.keepalive_expiry_seconds,
+            ),
+            timeout=httpx.Timeout(
+                self.request_timeout_seconds, connect=self.connect_timeout_seconds
+            ),
+        )
+
+    def __close_clients(self) -> None:
+        for client in self._clients.values():
+            client.close()
+        self._clients = {}
+        # Async clients can only be closed from their own loop, new ones are created on next use
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def __get_origin(self, endpoint: Optional[str]) -> str:
+        if not endpoint:
+            return ""
+        url = urlsplit(endpoint)
+        return f"{url.scheme}://{url.netloc}"
+
+    def __is_http2_available(self) -> bool:
+        return importlib.util.find_spec("h2") is not None
+
+
+# Singleton instance
+http_transport_pool_instance = HttpTransportPool()
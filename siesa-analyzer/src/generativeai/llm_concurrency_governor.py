@@ -0,0 +1,429 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Optional
+import httpx
+import openai
+import tiktoken
+from langchain_core.messages import BaseMessage
+
+
+def get_error_status_code(error: BaseException) -> Optional[int]:
+    """
+    Returns the HTTP status code carried by an error raised by the LLM clients
+    (httpx, openai), or None when the error is not an HTTP error.
+    """
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code
+
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code
+
+    return None
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """Returns whether the error is a timeout or a connection failure of the LLM clients."""
+    # Timeout errors of httpx and openai are subclasses of their transport/connection errors
+    return isinstance(
+        error,
+        (httpx.TransportError, openai.APIConnectionError, TimeoutError, ConnectionError),
+    )
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously up to its per-minute capacity."""
+
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = float(capacity_per_minute)
+        self.refill_per_second = capacity_per_minute / 60.0
+        self.available = float(capacity_per_minute)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_consume(self, amount: float) -> float:
+        """
+        Consumes the amount if available.
+
+        Returns:
+            float: 0 when consumed, otherwise the seconds to wait before trying again.
+        """
+        # A request bigger than the bucket could never be served, so it only waits for a full bucket
+        amount = min(amount, self.capacity)
+
+        with self._lock:
+            self.__refill()
+            if self.available >= amount:
+                self.available -= amount
+                return 0.0
+
+            return (amount - self.available) / self.refill_per_second
+
+    def force_consume(self, amount: float) -> None:
+        """Consumes the amount even if the bucket goes negative, used to settle actual usage."""
+        with self._lock:
+            self.__refill()
+            self.available -= amount
+
+    def get_available(self) -> float:
+        with self._lock:
+            self.__refill()
+            return self.available
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(
+            self.capacity,
+            self.available + (now - self.updated_at) * self.refill_per_second,
+        )
+        self.updated_at = now
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    AIMD concurrency limit: the limit grows additively while requests succeed and shrinks
+    multiplicatively on throttling, server errors, timeouts, connection failures or latency
+    spikes. Other failures leave it unchanged.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        backoff_factor: float = 0.5,
+        latency_backoff_factor: float = 0.9,
+        latency_spike_ratio: float = 3.0,
+        backoff_cooldown_seconds: float = 5.0,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_factor = backoff_factor
+        self.latency_backoff_factor = latency_backoff_factor
+        self.latency_spike_ratio = latency_spike_ratio
+        self.backoff_cooldown_seconds = backoff_cooldown_seconds
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self.last_backoff_at = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency_seconds: float, error: Optional[BaseException]) -> None:
+        """
+        Releases a slot and adapts the limit to the outcome of the request.
+
+        Args:
+            latency_seconds (float): Duration of the request.
+            error (BaseException, optional): The error the request failed with, None when it succeeded.
+        """
+        status_code = get_error_status_code(error) if error is not None else None
+        with self._condition:
+            self.in_flight -= 1
+
+            if (
+                status_code == 429
+                or (status_code is not None and status_code >= 500)
+                or (status_code is None and error is not None and is_transport_error(error))
+            ):
+                self.__backoff(self.backoff_factor)
+            elif error is None:
+                if self.__is_latency_spike(latency_seconds):
+                    self.__backoff(self.latency_backoff_factor)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.__update_baseline_latency(latency_seconds)
+
+            self._condition.notify_all()
+
+    def __backoff(self, factor: float) -> None:
+        now = time.monotonic()
+        # A burst of failures from the same congestion only counts once
+        if now - self.last_backoff_at < self.backoff_cooldown_seconds:
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.last_backoff_at = now
+
+    def __is_latency_spike(self, latency_seconds: float) -> bool:
+        return (
+            self.baseline_latency is not None
+            and latency_seconds > self.baseline_latency * self.latency_spike_ratio
+        )
+
+    def __update_baseline_latency(self, latency_seconds: float) -> None:
+        if self.baseline_latency is None:
+            self.baseline_latency = latency_seconds
+        else:
+            self.baseline_latency = 0.9 * self.baseline_latency + 0.1 * latency_seconds
+
+
+class ModelGovernor:
+    """Rate limits and adaptive concurrency of a single model."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+    ):
+        self.requests_bucket = TokenBucket(requests_per_minute)
+        self.tokens_bucket = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimit(
+            initial_limit=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+        )
+
+
+class LLMConcurrencyGovernor:
+    """
+    Process-wide governor every prompter call passes through.
+
+    Each model has token buckets for requests per minute and tokens per minute (with the
+    prompt size estimated with tiktoken before sending) and an AIMD concurrency limit, so
+    all steps share the provider quota no matter how many worker threads they start.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LLMConcurrencyGovernor, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._model_governors = {}
+            cls._instance._model_settings = {}
+            cls._instance._encodings = {}
+            cls._instance.enabled = True
+            cls._instance.default_settings = {
+                "requests_per_minute": 300,
+                "tokens_per_minute": 1_000_000,
+                "initial_concurrency": 10,
+                "min_concurrency": 1,
+                "max_concurrency": 40,
+            }
+            cls._instance.logger = logging.getLogger(__name__)
+        return cls._instance
+
+    def configure(
+        self,
+        model_settings: dict[str, dict[str, int]],
+        default_settings: Optional[dict[str, int]] = None,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Sets the limits of each model. Governors already created are replaced.
+
+        Args:
+            model_settings (dict): Settings per model name, with the keys `requests_per_minute`,
+                `tokens_per_minute`, `initial_concurrency`, `min_concurrency` and `max_concurrency`.
+            default_settings (dict, optional): Settings for models without their own entry.
+            enabled (bool): When False, calls are never throttled.
+        """
+        with self._lock:
+            self.enabled = enabled
+            self._model_settings = dict(model_settings)
+            if default_settings:
+                self.default_settings = {**self.default_settings, **default_settings}
+            self._model_governors = {}
+
+    def get_max_concurrency(self) -> int:
+        """Returns the highest concurrency limit any model can reach."""
+        with self._lock:
+            return max(
+                [
+                    {**self.default_settings, **settings}["max_concurrency"]
+                    for settings in self._model_settings.values()
+                ]
+                + [self.default_settings["max_concurrency"]]
+            )
+
+    def estimate_tokens(self, model_name: Optional[str], messages: list[BaseMessage]) -> int:
+        """Estimates the prompt tokens of the messages with the tiktoken encoding of the model."""
+        return sum(
+            self.count_text_tokens(model_name, self.__get_message_text(message))
+            for message in messages
+        )
+
+    def count_text_tokens(self, model_name: Optional[str], text: str) -> int:
+        """Counts the tokens of a text with the tiktoken encoding of the model."""
+        encoding = self.__get_encoding(model_name)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    @contextmanager
+    def acquire(
+        self,
+        model_name: Optional[str],
+        messages: list[BaseMessage],
+        estimated_tokens: Optional[int] = None,
+    ):
+        """
+        Waits until the model has quota and a free concurrency slot, then holds the slot
+        while the request runs. The outcome of the request adapts the concurrency limit.
+
+        Yields:
+            int: The estimated prompt tokens, to be settled later with `record_usage`.
+        """
+        if not self.enabled:
+            yield 0
+            return
+
+        governor = self.__get_model_governor(model_name)
+        if estimated_tokens is None:
+            estimated_tokens = self.estimate_tokens(model_name, messages)
+
+        self.__wait_for_quota(governor, estimated_tokens)
+        governor.concurrency.acquire()
+
+        started_at = time.monotonic()
+        failure = None
+        try:
+            yield estimated_tokens
+        except BaseException as error:
+            failure = error
+            raise
+        finally:
+            governor.concurrency.release(time.monotonic() - started_at, failure)
+
+    @asynccontextmanager
+    async def aacquire(
+        self,
+        model_name: Optional[str],
+        messages: list[BaseMessage],
+        estimated_tokens: Optional[int] = None,
+    ):
+        """Async counterpart of `acquire`, waiting without blocking the event loop."""
+        if not self.enabled:
+            yield 0
+            return
+
+        governor = self.__get_model_governor(model_name)
+        if estimated_tokens is None:
+            estimated_tokens = self.estimate_tokens(model_name, messages)
+
+        await self.__await_quota(governor, estimated_tokens)
+        while not governor.concurrency.try_acquire():
+            await asyncio.sleep(0.05)
+
+        started_at = time.monotonic()
+        failure = None
+        try:
+            yield estimated_tokens
+        except BaseException as error:
+            failure = error
+            raise
+        finally:
+            governor.concurrency.release(time.monotonic() - started_at, failure)
+
+    def record_usage(self, model_name: Optional[str], response: Any, estimated_tokens: int) -> None:
+        """Settles the tokens bucket with the output tokens reported by the response, when available."""
+        usage_metadata = getattr(response, "usage_metadata", None)
+        if not self.enabled or not usage_metadata:
+            return
+
+        total_tokens = usage_metadata.get("total_tokens") or 0
+        if total_tokens > estimated_tokens:
+            governor = self.__get_model_governor(model_name)
+            governor.tokens_bucket.force_consume(total_tokens - estimated_tokens)
+
+    def get_current_limits(self) -> dict[str, dict[str, float]]:
+        """Returns the current limits and usage of every model, useful to tune the settings."""
+        with self._lock:
+            governors = dict(self._model_governors)
+
+        return {
+            model_name: {
+                "concurrency_limit": round(governor.concurrency.limit, 2),
+                "in_flight": governor.concurrency.in_flight,
+                "baseline_latency_seconds": governor.concurrency.baseline_latency,
+                "requests_per_minute": governor.requests_bucket.capacity,
+                "available_requests": round(governor.requests_bucket.get_available(), 2),
+                "tokens_per_minute": governor.tokens_bucket.capacity,
+                "available_tokens": round(governor.tokens_bucket.get_available(), 2),
+            }
+            for model_name, governor in governors.items()
+        }
+
+    def __wait_for_quota(self, governor: ModelGovernor, estimated_tokens: int) -> None:
+        while True:
+            wait_seconds = self.__try_consume_quota(governor, estimated_tokens)
+            if wait_seconds == 0:
+                return
+            time.sleep(wait_seconds)
+
+    async def __await_quota(self, governor: ModelGovernor, estimated_tokens: int) -> None:
+        while True:
+            wait_seconds = self.__try_consume_quota(governor, estimated_tokens)
+            if wait_seconds == 0:
+                return
+            await asyncio.sleep(wait_seconds)
+
+    def __try_consume_quota(self, governor: ModelGovernor, estimated_tokens: int) -> float:
+        wait_seconds = governor.requests_bucket.try_consume(1)
+        if wait_seconds:
+            return wait_seconds
+
+        wait_seconds = governor.tokens_bucket.try_consume(estimated_tokens)
+        if wait_seconds:
+            # Give the request back, it is taken again on the next attempt
+            governor.requests_bucket.force_consume(-1)
+
+        return wait_seconds
+
+    def __get_model_governor(self, model_name: Optional[str]) -> ModelGovernor:
+        model_key = model_name or "default"
+        with self._lock:
+            governor = self._model_governors.get(model_key)
+            if governor is None:
+                settings = {
+                    **self.default_settings,
+                    **self._model_settings.get(model_key, {}),
+                }
+                governor = ModelGovernor(**settings)
+                self._model_governors[model_key] = governor
+
+            return governor
+
+    def __get_encoding(self, model_name: Optional[str]) -> tiktoken.Encoding:
+        with self._lock:
+            encoding = self._encodings.get(model_name)
+            if encoding is None:
+                try:
+                    encoding = tiktoken.encoding_for_model(model_name)
+                except (KeyError, TypeError):
+                    # Non-OpenAI models (Gemini) are estimated with a generic encoding
+                    encoding = tiktoken.get_encoding("cl100k_base")
+                self._encodings[model_name] = encoding
+
+            return encoding
+
+    def __get_message_text(self, message: BaseMessage) -> str:
+        if isinstance(message.content, str):
+            return message.content
+
+        return "".join(
+            block if isinstance(block, str) else str(block.get("text", ""))
+            for block in message.content
+        )
+
+
+# Singleton instance
+llm_concurrency_governor_instance = LLMConcurrencyGovernor()
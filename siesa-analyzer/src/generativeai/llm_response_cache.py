@@ -0,0 +1,373 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from enum import Enum
+from typing import Any, Optional, Type
+from langchain_core.messages import (
+    BaseMessage,
+    messages_from_dict,
+    messages_to_dict,
+)
+from pydantic import BaseModel
+
+
+class LLMCacheMode(Enum):
+    READ_WRITE = "read-write"
+    READ_ONLY = "read-only"
+    REFRESH = "refresh"
+    DISABLED = "disabled"
+
+
+class LLMResponseCache:
+    """
+    Persistent, content-addressed cache for LLM responses backed by SQLite.
+
+    Responses are keyed by the model name, temperature, agent mode, bound structured
+    output schema and the serialized message list, so identical prompts sent in later
+    runs are answered locally instead of hitting the model again.
+    """
+
+    _instance = None
+    _create_table_statement = """
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            cache_key TEXT PRIMARY KEY,
+            model_name TEXT,
+            response_kind TEXT NOT NULL,
+            response_payload TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed_at REAL NOT NULL
+        )
+    """
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LLMResponseCache, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._connection = None
+            cls._instance._writes_since_eviction = 0
+            cls._instance.cache_path = None
+            cls._instance.mode = LLMCacheMode.DISABLED
+            cls._instance.max_size_bytes = None
+            cls._instance.max_age_seconds = None
+            cls._instance.eviction_interval = 50
+            cls._instance.logger = logging.getLogger(__name__)
+        return cls._instance
+
+    def configure(
+        self,
+        cache_path: str,
+        mode: LLMCacheMode = LLMCacheMode.READ_WRITE,
+        max_size_mb: Optional[int] = None,
+        max_age_days: Optional[int] = None,
+    ) -> None:
+        """
+        Opens (or creates) the cache database and applies the eviction settings.
+
+        Args:
+            cache_path (str): Path to the SQLite database file.
+            mode (LLMCacheMode): How the cache should be used by the prompters.
+            max_size_mb (int, optional): Maximum size of the stored responses. Least recently used entries are evicted first.
+            max_age_days (int, optional): Entries older than this are evicted.
+        """
+        with self._lock:
+            self.__close_connection()
+            self.mode = mode
+            self.cache_path = cache_path
+            self.max_size_bytes = max_size_mb * 1024 * 1024 if max_size_mb else None
+            self.max_age_seconds = max_age_days * 24 * 3600 if max_age_days else None
+
+            if self.mode == LLMCacheMode.DISABLED:
+                return
+
+            cache_dir = os.path.dirname(os.path.abspath(cache_path))
+            os.makedirs(cache_dir, exist_ok=True)
+
+            self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(self._create_table_statement)
+            self._connection.commit()
+
+        self.evict()
+        self.logger.info(f"LLM response cache enabled ({mode.value}) at {cache_path}.")
+
+    def is_readable(self) -> bool:
+        return self._connection is not None and self.mode in (
+            LLMCacheMode.READ_WRITE,
+            LLMCacheMode.READ_ONLY,
+        )
+
+    def is_writable(self) -> bool:
+        return self._connection is not None and self.mode in (
+            LLMCacheMode.READ_WRITE,
+            LLMCacheMode.REFRESH,
+        )
+
+    def build_key(
+        self,
+        model_name: str,
+        temperature: Optional[float],
+        messages: list[BaseMessage],
+        structured_output_class: Optional[Type[BaseModel]] = None,
+        use_agent: bool = False,
+    ) -> str:
+        """
+        Builds the content-addressed key for a request.
+
+        Args:
+            model_name (str): Name of the model that answers the request.
+            temperature (float, optional): Sampling temperature of the model.
+            messages (list[BaseMessage]): The messages sent to the model.
+            structured_output_class (Type[BaseModel], optional): Schema bound to the model, if any.
+            use_agent (bool): Whether the request is executed through the ReAct agent.
+
+        Returns:
+            str: The SHA-256 hex digest identifying the request.
+        """
+        schema = (
+            structured_output_class.model_json_schema()
+            if structured_output_class is not None
+            else None
+        )
+        key_content = json.dumps(
+            {
+                "model_name": model_name,
+                "temperature": temperature,
+                "use_agent": use_agent,
+                "schema": schema,
+                "messages": messages_to_dict(messages),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(key_content.encode("utf-8")).hexdigest()
+
+    def get(
+        self, cache_key: str, structured_output_class: Optional[Type[BaseModel]] = None
+    ) -> Optional[Any]:
+        """Returns the cached response for the key, or None on a miss."""
+        if not self.is_readable():
+            return None
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response_kind, response_payload FROM llm_responses WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE llm_responses SET last_accessed_at = ? WHERE cache_key = ?",
+                (time.time(), cache_key),
+            )
+            self._connection.commit()
+
+        try:
+            return self.__deserialize_response(row[0], row[1], structured_output_class)
+        except Exception as error:
+            self.logger.warning(f"⚠️ Ignoring unreadable cache entry {cache_key}: {error}")
+            return None
+
+    def put(self, cache_key: str, model_name: str, response: Any) -> None:
+        """Stores the response for the key, replacing any previous entry."""
+        if not self.is_writable():
+            return
+
+        try:
+            response_kind, response_payload = self.__serialize_response(response)
+        except ValueError as error:
+            self.logger.warning(f"⚠️ Response not cached: {error}")
+            return
+
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO llm_responses
+                    (cache_key, model_name, response_kind, response_payload, size_bytes, created_at, last_accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    cache_key,
+                    model_name,
+                    response_kind,
+                    response_payload,
+                    len(response_payload.encode("utf-8")),
+                    now,
+                    now,
+                ),
+            )
+            self._connection.commit()
+            self._writes_since_eviction += 1
+            should_evict = self._writes_since_eviction >= self.eviction_interval
+
+        if should_evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Removes entries older than the maximum age, then the least recently used
+        entries until the cache fits in the maximum size.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        if self._connection is None:
+            return 0
+
+        removed = 0
+        with self._lock:
+            self._writes_since_eviction = 0
+
+            if self.max_age_seconds:
+                cursor = self._connection.execute(
+                    "DELETE FROM llm_responses WHERE created_at < ?",
+                    (time.time() - self.max_age_seconds,),
+                )
+                removed += cursor.rowcount
+
+            if self.max_size_bytes:
+                total_size = self._connection.execute(
+                    "SELECT COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+                ).fetchone()[0]
+
+                if total_size > self.max_size_bytes:
+                    rows = self._connection.execute(
+                        "SELECT cache_key, size_bytes FROM llm_responses ORDER BY last_accessed_at ASC"
+                    ).fetchall()
+                    keys_to_remove = []
+                    for cache_key, size_bytes in rows:
+                        if total_size <= self.max_size_bytes:
+                            break
+                        keys_to_remove.append((cache_key,))
+                        total_size -= size_bytes
+
+                    self._connection.executemany(
+                        "DELETE FROM llm_responses WHERE cache_key = ?", keys_to_remove
+                    )
+                    removed += len(keys_to_remove)
+
+            self._connection.commit()
+
+        if removed:
+            self.logger.info(f"Evicted {removed} entries from the LLM response cache.")
+
+        return removed
+
+    def export_to_file(self, export_file_path: str) -> int:
+        """
+        Exports every cache entry as JSON lines, so a warmed cache can be shipped to another machine.
+
+        Returns:
+            int: The number of exported entries.
+        """
+        if self._connection is None:
+            raise ValueError("The LLM response cache is not configured.")
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT cache_key, model_name, response_kind, response_payload, created_at FROM llm_responses"
+            ).fetchall()
+
+        with open(export_file_path, "w", encoding="utf-8") as file:
+            for cache_key, model_name, response_kind, response_payload, created_at in rows:
+                entry = {
+                    "cache_key": cache_key,
+                    "model_name": model_name,
+                    "response_kind": response_kind,
+                    "response_payload": response_payload,
+                    "created_at": created_at,
+                }
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        self.logger.info(f"Exported {len(rows)} LLM cache entries to {export_file_path}.")
+        return len(rows)
+
+    def import_from_file(self, import_file_path: str) -> int:
+        """
+        Imports entries previously written by `export_to_file`. Existing keys are overwritten.
+
+        Returns:
+            int: The number of imported entries.
+        """
+        if self._connection is None:
+            raise ValueError("The LLM response cache is not configured.")
+
+        entries = []
+        now = time.time()
+        with open(import_file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response_payload = entry["response_payload"]
+                entries.append(
+                    (
+                        entry["cache_key"],
+                        entry.get("model_name"),
+                        entry["response_kind"],
+                        response_payload,
+                        len(response_payload.encode("utf-8")),
+                        entry.get("created_at", now),
+                        now,
+                    )
+                )
+
+        with self._lock:
+            self._connection.executemany(
+                """
+                INSERT OR REPLACE INTO llm_responses
+                    (cache_key, model_name, response_kind, response_payload, size_bytes, created_at, last_accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                entries,
+            )
+            self._connection.commit()
+
+        self.logger.info(f"Imported {len(entries)} LLM cache entries from {import_file_path}.")
+        return len(entries)
+
+    def __serialize_response(self, response: Any) -> tuple[str, str]:
+        if isinstance(response, BaseMessage):
+            return "message", json.dumps(messages_to_dict([response]), ensure_ascii=False)
+
+        if isinstance(response, BaseModel):
+            return "structured", response.model_dump_json()
+
+        if isinstance(response, str):
+            return "text", response
+
+        raise ValueError(f"Unsupported response type for caching: {type(response)}")
+
+    def __deserialize_response(
+        self,
+        response_kind: str,
+        response_payload: str,
+        structured_output_class: Optional[Type[BaseModel]],
+    ) -> Any:
+        if response_kind == "message":
+            return messages_from_dict(json.loads(response_payload))[0]
+
+        if response_kind == "structured":
+            if structured_output_class is None:
+                raise ValueError("A structured entry requires the bound output class.")
+            return structured_output_class.model_validate_json(response_payload)
+
+        return response_payload
+
+    def __close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+# Singleton instance
+llm_response_cache_instance = LLMResponseCache()
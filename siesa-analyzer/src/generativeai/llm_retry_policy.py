@@ -0,0 +1,363 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+import httpx
+import openai
+from opentelemetry import trace
+from generativeai.llm_concurrency_governor import get_error_status_code
+
+
+class LLMErrorClass(Enum):
+    RATE_LIMIT = "rate_limit"
+    SERVER_ERROR = "server_error"
+    TIMEOUT = "timeout"
+    CONNECTION = "connection"
+    NON_RETRYABLE = "non_retryable"
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit of a failing endpoint would stay open past the call deadline."""
+
+
+class RetryPolicy:
+    """Backoff settings applied to one class of errors."""
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay_seconds: float = 2.0,
+        max_delay_seconds: float = 60.0,
+        multiplier: float = 2.0,
+        jitter_ratio: float = 0.5,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.multiplier = multiplier
+        self.jitter_ratio = jitter_ratio
+
+    def get_delay(self, attempt: int) -> float:
+        """Returns the exponential backoff with jitter for the given attempt (starting at 1)."""
+        delay = min(
+            self.max_delay_seconds,
+            self.base_delay_seconds * self.multiplier ** (attempt - 1),
+        )
+        return delay * (1 - self.jitter_ratio * random.random())
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker. After `failure_threshold` consecutive server, timeout or
+    connection failures the circuit opens and calls wait for `reset_timeout_seconds`, then a
+    single trial call is let through (half-open) to decide whether to close it again. Rate
+    limits are not failures: the concurrency governor and the backoff absorb them.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_progress = False
+        self._lock = threading.Lock()
+
+    _trial_poll_seconds = 1.0
+
+    def before_call(self) -> Optional[float]:
+        """
+        Returns None when the call can be made, or the seconds to wait before asking again
+        while the circuit is open or its trial call is in progress.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return None
+
+            remaining_seconds = self.reset_timeout_seconds - (
+                time.monotonic() - self.opened_at
+            )
+            if remaining_seconds > 0:
+                return remaining_seconds
+            if self.trial_in_progress:
+                return self._trial_poll_seconds
+
+            self.trial_in_progress = True
+            return None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.trial_in_progress or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_progress = False
+
+    def release_trial(self) -> None:
+        """Lets another trial call through when the trial call ended without telling the endpoint health."""
+        with self._lock:
+            self.trial_in_progress = False
+
+
+class LLMRetryExecutor:
+    """
+    Retry layer shared by the prompters: each error class has its own policy, waits use
+    exponential backoff with jitter or the `Retry-After` sent by the provider, every
+    endpoint has a circuit breaker and each call has a total deadline.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LLMRetryExecutor, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._circuit_breakers = {}
+            cls._instance.policies = {
+                LLMErrorClass.RATE_LIMIT: RetryPolicy(max_attempts=6, base_delay_seconds=5.0),
+                LLMErrorClass.SERVER_ERROR: RetryPolicy(max_attempts=4),
+                LLMErrorClass.TIMEOUT: RetryPolicy(max_attempts=2),
+                LLMErrorClass.CONNECTION: RetryPolicy(max_attempts=4),
+                LLMErrorClass.NON_RETRYABLE: RetryPolicy(max_attempts=1),
+            }
+            cls._instance.deadline_seconds = 3600.0
+            cls._instance.failure_threshold = 5
+            cls._instance.reset_timeout_seconds = 60.0
+            cls._instance.logger = logging.getLogger(__name__)
+        return cls._instance
+
+    def configure(
+        self,
+        policies: dict[str, dict[str, float]],
+        deadline_seconds: float,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+    ) -> None:
+        """
+        Applies the retry settings.
+
+        Args:
+            policies (dict): `RetryPolicy` arguments per error class value (e.g. "rate_limit").
+            deadline_seconds (float): Maximum total time of a call, including retries and waits.
+            failure_threshold (int): Consecutive failures that open the circuit of an endpoint.
+            reset_timeout_seconds (float): Time an open circuit rejects calls before a trial call.
+        """
+        with self._lock:
+            for error_class_value, policy_settings in policies.items():
+                self.policies[LLMErrorClass(error_class_value)] = RetryPolicy(
+                    **policy_settings
+                )
+            self.deadline_seconds = deadline_seconds
+            self.failure_threshold = failure_threshold
+            self.reset_timeout_seconds = reset_timeout_seconds
+            self._circuit_breakers = {}
+
+    def execute(self, endpoint: str, call: Callable[[], Any]) -> Any:
+        """Runs the call, retrying it according to the policy of each error."""
+        circuit_breaker = self.__get_circuit_breaker(endpoint)
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        total_wait_seconds = 0.0
+
+        while True:
+            attempt += 1
+            while (
+                circuit_wait_seconds := self.__get_circuit_wait(
+                    endpoint, circuit_breaker, deadline
+                )
+            ) is not None:
+                total_wait_seconds += circuit_wait_seconds
+                time.sleep(circuit_wait_seconds)
+            try:
+                result = call()
+                circuit_breaker.record_success()
+                self.__record_on_span(attempt, total_wait_seconds)
+                return result
+            except Exception as error:
+                wait_seconds = self.__handle_failure(
+                    endpoint, error, attempt, deadline, circuit_breaker
+                )
+                if wait_seconds is None:
+                    self.__record_on_span(attempt, total_wait_seconds, error)
+                    raise
+
+            total_wait_seconds += wait_seconds
+            time.sleep(wait_seconds)
+
+    async def aexecute(self, endpoint: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of `execute`."""
+        circuit_breaker = self.__get_circuit_breaker(endpoint)
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        total_wait_seconds = 0.0
+
+        while True:
+            attempt += 1
+            while (
+                circuit_wait_seconds := self.__get_circuit_wait(
+                    endpoint, circuit_breaker, deadline
+                )
+            ) is not None:
+                total_wait_seconds += circuit_wait_seconds
+                await asyncio.sleep(circuit_wait_seconds)
+            try:
+                result = await call()
+                circuit_breaker.record_success()
+                self.__record_on_span(attempt, total_wait_seconds)
+                return result
+            except Exception as error:
+                wait_seconds = self.__handle_failure(
+                    endpoint, error, attempt, deadline, circuit_breaker
+                )
+                if wait_seconds is None:
+                    self.__record_on_span(attempt, total_wait_seconds, error)
+                    raise
+
+            total_wait_seconds += wait_seconds
+            await asyncio.sleep(wait_seconds)
+
+    def classify_error(self, error: BaseException) -> LLMErrorClass:
+        """Maps an error raised by the LLM clients to its retry class."""
+        status_code = get_error_status_code(error)
+        if status_code == 429:
+            return LLMErrorClass.RATE_LIMIT
+        if status_code is not None and status_code >= 500:
+            return LLMErrorClass.SERVER_ERROR
+        if status_code is not None:
+            return LLMErrorClass.NON_RETRYABLE
+
+        if isinstance(error, (httpx.TimeoutException, openai.APITimeoutError, TimeoutError)):
+            return LLMErrorClass.TIMEOUT
+        if isinstance(
+            error, (httpx.TransportError, openai.APIConnectionError, ConnectionError)
+        ):
+            return LLMErrorClass.CONNECTION
+
+        return LLMErrorClass.NON_RETRYABLE
+
+    def __handle_failure(
+        self,
+        endpoint: str,
+        error: Exception,
+        attempt: int,
+        deadline: float,
+        circuit_breaker: CircuitBreaker,
+    ) -> Optional[float]:
+        """Returns the seconds to wait before the next attempt, or None when the error must be raised."""
+        error_class = self.classify_error(error)
+        policy = self.policies[error_class]
+
+        if error_class == LLMErrorClass.NON_RETRYABLE:
+            # The endpoint answered, so the failure says nothing about its health
+            circuit_breaker.record_success()
+        elif error_class == LLMErrorClass.RATE_LIMIT:
+            # The endpoint is healthy but busy, the governor and the backoff slow the calls down
+            circuit_breaker.release_trial()
+        else:
+            circuit_breaker.record_failure()
+
+        if attempt >= policy.max_attempts:
+            return None
+
+        wait_seconds = self.__get_retry_after(error)
+        if wait_seconds is None:
+            wait_seconds = policy.get_delay(attempt)
+
+        if time.monotonic() + wait_seconds >= deadline:
+            self.logger.warning(
+                f"⚠️ Giving up on {endpoint}: the call deadline would be exceeded."
+            )
+            return None
+
+        self.logger.warning(
+            f"⚠️ {error_class.value} error on {endpoint} (attempt {attempt}/{policy.max_attempts}), "
+            f"retrying in {wait_seconds:.1f}s: {error}"
+        )
+        return wait_seconds
+
+    def __get_circuit_wait(
+        self, endpoint: str, circuit_breaker: CircuitBreaker, deadline: float
+    ) -> Optional[float]:
+        """Returns the seconds to wait for the circuit of the endpoint, or None when the call can be made."""
+        wait_seconds = circuit_breaker.before_call()
+        if wait_seconds is None:
+            return None
+
+        if time.monotonic() + wait_seconds >= deadline:
+            raise CircuitOpenError(
+                f"Circuit open for {endpoint} after {circuit_breaker.consecutive_failures} consecutive failures, "
+                "the call deadline would be exceeded."
+            )
+
+        self.logger.warning(
+            f"⚠️ Circuit open for {endpoint}, waiting {wait_seconds:.1f}s before calling it."
+        )
+        return wait_seconds
+
+    def __get_retry_after(self, error: BaseException) -> Optional[float]:
+        """Reads the wait time sent by the provider in the `Retry-After` (or `retry-after-ms`) header."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def __record_on_span(
+        self,
+        attempt: int,
+        total_wait_seconds: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        span = trace.get_current_span()
+        if not span.is_recording():
+            return
+
+        span.set_attribute("llm.retry.count", attempt - 1)
+        span.set_attribute("llm.retry.wait_seconds", round(total_wait_seconds, 3))
+        if error is not None:
+            span.set_attribute("llm.retry.error_class", self.classify_error(error).value)
+
+    def __get_circuit_breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            circuit_breaker = self._circuit_breakers.get(endpoint)
+            if circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout_seconds=self.reset_timeout_seconds,
+                )
+                self._circuit_breakers[endpoint] = circuit_breaker
+
+            return circuit_breaker
+
+
+# Singleton instance
+llm_retry_executor_instance = LLMRetryExecutor()
@@ -0,0 +1,84 @@
+import threading
+from typing import Optional
+
+
+class TokenBudgetExceededError(ValueError):
+    """Raised before sending a prompt that cannot fit in the context window of the model."""
+
+
+class LLMTokenBudget:
+    """
+    Context window limits of the models, used as a pre-flight check in front of every
+    prompt and to size the chunks of oversized contents.
+
+    The prompt budget is the context window scaled by a safety ratio (the token estimate
+    of non-OpenAI models is approximate) minus the tokens reserved for the response.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LLMTokenBudget, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance.context_windows = {
+                "gpt-4.1": 1_047_576,
+                "gpt-5": 272_000,
+                "gpt-5-mini": 272_000,
+                "gpt-4o": 128_000,
+                "gemini-2.0-flash": 1_048_576,
+                "gemini-2.5-pro": 1_048_576,
+            }
+            cls._instance.default_context_window = 128_000
+            cls._instance.output_token_reserve = 32_768
+            cls._instance.safety_ratio = 0.9
+        return cls._instance
+
+    def configure(
+        self,
+        context_windows: dict[str, int],
+        default_context_window: int,
+        output_token_reserve: int,
+        safety_ratio: float,
+    ) -> None:
+        """
+        Applies the budget settings.
+
+        Args:
+            context_windows (dict[str, int]): Context window size per model name.
+            default_context_window (int): Context window of models without their own entry.
+            output_token_reserve (int): Tokens reserved for the response when the model does not set `max_tokens`.
+            safety_ratio (float): Fraction of the context window that prompts may use.
+        """
+        with self._lock:
+            self.context_windows = {**self.context_windows, **context_windows}
+            self.default_context_window = default_context_window
+            self.output_token_reserve = output_token_reserve
+            self.safety_ratio = safety_ratio
+
+    def get_prompt_budget(
+        self, model_name: Optional[str], max_output_tokens: Optional[int] = None
+    ) -> int:
+        """Returns the maximum number of prompt tokens the model can take."""
+        context_window = self.context_windows.get(model_name, self.default_context_window)
+        output_reserve = min(
+            max_output_tokens or self.output_token_reserve, context_window // 2
+        )
+        return int(context_window * self.safety_ratio) - output_reserve
+
+    def check(
+        self,
+        model_name: Optional[str],
+        prompt_tokens: int,
+        max_output_tokens: Optional[int] = None,
+    ) -> None:
+        """Raises `TokenBudgetExceededError` when the prompt does not fit in the model budget."""
+        prompt_budget = self.get_prompt_budget(model_name, max_output_tokens)
+        if prompt_tokens > prompt_budget:
+            raise TokenBudgetExceededError(
+                f"Prompt of {prompt_tokens} tokens exceeds the budget of {prompt_budget} tokens for {model_name}."
+            )
+
+
+# Singleton instance
+llm_token_budget_instance = LLMTokenBudget()
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from langchain_core.messages import BaseMessage, AnyMessage
 from langchain.chat_models.base import BaseChatModel
 from pydantic import BaseModel
-from typing import Any, Callable, Union, Dict
+from typing import Any, Callable, Optional, Union, Dict
 from collections.abc import Sequence
 from langchain_core.tools import BaseTool
 from prompter.base import ConfigAuthentication
@@ -39,6 +39,20 @@ class PrompterInterface(ABC):
         """Invokes the language model with a list of messages."""
         pass
 
+    @abstractmethod
+    def stream_content_from_llm_with_messages(
+        self,
+        messages: list[BaseMessage],
+        on_chunk: Callable[[str], None],
+        recursion_limit: int,
+        on_discard: Optional[Callable[[str], None]],
+    ) -> str:
+        """
+        Streams the response content of the language model, calling `on_chunk` for every received
+        chunk and `on_discard` with the content streamed by a failed attempt before it is retried.
+        """
+        pass
+
     @abstractmethod
     def get_structured_output_from_llm(
         self, messages: list[BaseMessage], recursion_limit: int
@@ -46,11 +60,54 @@ class PrompterInterface(ABC):
         """Retrieves a structured output from the language model based on a list of messages."""
         pass
 
+    @abstractmethod
+    async def ainvoke_llm(
+        self, system_message: str, prompt: str, recursion_limit: int
+    ) -> AnyMessage:
+        """Asynchronously invokes the language model with a system message and a prompt."""
+        pass
+
+    @abstractmethod
+    async def ainvoke_llm_with_messages(
+        self, messages: list[BaseMessage], recursion_limit: int
+    ) -> AnyMessage:
+        """Asynchronously invokes the language model with a list of messages."""
+        pass
+
+    @abstractmethod
+    async def aget_structured_output_from_llm(
+        self, messages: list[BaseMessage], recursion_limit: int
+    ) -> BaseModel:
+        """Asynchronously retrieves a structured output from the language model based on a list of messages."""
+        pass
+
+    @abstractmethod
+    def estimate_tokens(self, messages: list[BaseMessage]) -> int:
+        """Estimates the prompt tokens of the messages for the model of this prompter."""
+        pass
+
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """Counts the tokens of a text for the model of this prompter."""
+        pass
+
+    @abstractmethod
+    def get_prompt_token_budget(self) -> int:
+        """Returns the maximum number of prompt tokens the model of this prompter can take."""
+        pass
+
     @abstractmethod
     def bind_model(self, structured_output_class: BaseModel) -> None:
         """Binds a new model to the Prompter instance."""
         pass
 
+    @abstractmethod
+    def with_structured_output(
+        self, structured_output_class: BaseModel
+    ) -> "PrompterInterface":
+        """Returns a derived prompter bound to the structured output class, leaving this one unchanged."""
+        pass
+
     @abstractmethod
     def bind_tools(
         self, tools: Sequence[Union[Dict[str, Any], type, Callable, BaseTool]]
@@ -1,6 +1,7 @@
 from prompter.base import ConfigAuthentication
 from langchain_openai import ChatOpenAI
 from generativeai.base_prompter import BasePrompter
+from generativeai.http_transport import http_transport_pool_instance
 
 
 class PrompterOpenAI(BasePrompter):
@@ -14,6 +15,10 @@ class PrompterOpenAI(BasePrompter):
             base_url=config_auth.openai_base_url,
             default_headers=config_auth.openai_headers,
             temperature=0.0,
+            max_retries=0,  # Retries are handled by the prompter retry policy
+            http_client=http_transport_pool_instance.get_client(
+                config_auth.openai_base_url
+            ),
         )
 
         super().__init__(config_auth=config_auth, use_agent=use_agent)
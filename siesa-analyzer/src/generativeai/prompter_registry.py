@@ -0,0 +1,74 @@
+import threading
+from typing import Optional, Type
+from pydantic import BaseModel
+from prompter.base import ConfigAuthentication
+from generativeai.prompter_factory import PrompterFactory
+from generativeai.prompter_interface import PrompterInterface
+
+
+class PrompterRegistry:
+    """
+    Process-wide pool of prompters keyed by model, agent mode and bound structured output
+    schema. Prompters are created on first use and reused by every step, so the chat model
+    clients and the agent graphs (compiled lazily by the prompter) are built only once.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PrompterRegistry, cls).__new__(cls)
+            cls._instance._lock = threading.RLock()
+            cls._instance._prompters = {}
+            cls._instance._config_auth = None
+        return cls._instance
+
+    def set_config_auth(self, config_auth: ConfigAuthentication) -> None:
+        """Sets the authentication used to create the prompters. Changing it clears the registry."""
+        with self._lock:
+            if config_auth is not self._config_auth:
+                self._prompters = {}
+            self._config_auth = config_auth
+
+    def get_prompter(
+        self,
+        model: str,
+        use_agent: bool = False,
+        structured_output_class: Optional[Type[BaseModel]] = None,
+    ) -> PrompterInterface:
+        """
+        Returns the shared prompter for the key, creating it on first use.
+
+        Args:
+            model (str): The name of the language model to use.
+            use_agent (bool): Whether the prompter runs through the ReAct agent.
+            structured_output_class (Type[BaseModel], optional): Schema the responses are bound to.
+
+        Returns:
+            PrompterInterface: The shared prompter.
+        """
+        key = (model, use_agent, structured_output_class)
+
+        with self._lock:
+            prompter = self._prompters.get(key)
+            if prompter is not None:
+                return prompter
+
+            if structured_output_class is None:
+                if self._config_auth is None:
+                    raise ValueError("The prompter registry has no authentication configured.")
+
+                prompter = PrompterFactory.create_prompter(
+                    config_auth=self._config_auth, model=model, use_agent=use_agent
+                )
+            else:
+                prompter = self.get_prompter(model, use_agent).with_structured_output(
+                    structured_output_class
+                )
+
+            self._prompters[key] = prompter
+            return prompter
+
+
+# Singleton instance
+prompter_registry_instance = PrompterRegistry()
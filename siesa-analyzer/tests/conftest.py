@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The packages live under src/, as configured in setup.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
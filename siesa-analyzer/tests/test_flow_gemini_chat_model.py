@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("langchain_google_genai")
+pytest.importorskip("tiktoken")
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from generativeai.flow_gemini_chat_model import FlowGeminiChatModel
+from generativeai.llm_concurrency_governor import llm_concurrency_governor_instance
+
+
+def get_payload_texts(payload: dict) -> list[str]:
+    texts = [part["text"] for part in payload.get("systemInstruction", {}).get("parts", [])]
+    texts.extend(
+        part["text"] for content in payload["contents"] for part in content["parts"]
+    )
+    return texts
+
+
+def test_payload_sends_each_message_once():
+    model = FlowGeminiChatModel(api_token="token", flow_tenant="tenant", flow_agent="agent")
+    messages = [
+        SystemMessage(content="You are a senior SQL Server analyst."),
+        HumanMessage(content="Document the procedure usp_close_period."),
+    ]
+
+    payload = model._create_payload(messages)
+
+    assert payload["systemInstruction"] == {
+        "parts": [{"text": "You are a senior SQL Server analyst."}]
+    }
+    assert payload["contents"] == [
+        {"role": "user", "parts": [{"text": "Document the procedure usp_close_period."}]}
+    ]
+    payload_texts = get_payload_texts(payload)
+    for message in messages:
+        assert payload_texts.count(message.content) == 1
+
+    # The payload carries exactly the prompt tokens estimated for the messages
+    payload_tokens = sum(
+        llm_concurrency_governor_instance.count_text_tokens(model.model_name, text)
+        for text in payload_texts
+    )
+    prompt_tokens = llm_concurrency_governor_instance.estimate_tokens(
+        model.model_name, messages
+    )
+    assert payload_tokens == prompt_tokens